@@ -0,0 +1,80 @@
+"""
+Bitboard occupancy for move validation.
+Each board is an int with bit ``row * width + col`` set for an occupied cell,
+so path and capture checks become a couple of bitwise ANDs.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Tuple
+
+Cell = Tuple[int, int]
+
+
+def state_kind(piece) -> str:
+    """Classify a piece's current state for the moving/resting boards."""
+    name = piece.state.name or ""
+    if name in ("move", "jump"):
+        return "moving"
+    if name.endswith("rest"):
+        return "resting"
+    return "idle"
+
+
+class Bitboards:
+    """Per-colour, moving and resting occupancy of a board as integers."""
+
+    def __init__(self, width: int = 8):
+        self.width = width
+        self.by_color: Dict[str, int] = {}
+        self.occupied = 0
+        self.moving = 0
+        self.resting = 0
+
+    def bit(self, cell: Cell) -> int:
+        return 1 << (cell[0] * self.width + cell[1])
+
+    def mask(self, cells: Iterable[Cell]) -> int:
+        m = 0
+        for cell in cells:
+            m |= self.bit(cell)
+        return m
+
+    @property
+    def white(self) -> int:
+        return self.by_color.get("W", 0)
+
+    @property
+    def black(self) -> int:
+        return self.by_color.get("B", 0)
+
+    def opponents_of(self, color: str) -> int:
+        # OR of the other colours: a crowded cell can hold both sides at once
+        m = 0
+        for c, board in self.by_color.items():
+            if c != color:
+                m |= board
+        return m
+
+    def sync_cell(self, cell: Cell, pieces: Iterable):
+        """Recompute every board's bit for *cell* from the pieces standing on it."""
+        b = self.bit(cell)
+        keep = ~b
+        self.occupied &= keep
+        self.moving &= keep
+        self.resting &= keep
+        for color in self.by_color:
+            self.by_color[color] &= keep
+
+        for p in pieces:
+            self.occupied |= b
+            color = p.id[1]
+            self.by_color[color] = self.by_color.get(color, 0) | b
+            kind = state_kind(p)
+            if kind == "moving":
+                self.moving |= b
+            elif kind == "resting":
+                self.resting |= b
+
+    def clear(self):
+        self.by_color.clear()
+        self.occupied = self.moving = self.resting = 0
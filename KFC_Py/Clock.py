@@ -0,0 +1,87 @@
+"""
+Game clocks.
+`Game`, `KeyboardProducer` and `GameEventPublisher` read time through one
+of these instead of calling `time` directly, so tests and simulations can
+run on virtual time and jump straight to the next deadline.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+class Clock(ABC):
+    """
+    Interface: game time in ms, a way to wait for game time, and a wall
+    time in seconds for event timestamps and real-world intervals (e.g.
+    double-click detection).
+    """
+
+    @abstractmethod
+    def now_ms(self) -> int: ...
+
+    @abstractmethod
+    def sleep_ms(self, ms: float): ...
+
+    def wall_time(self) -> float:
+        return time.time()
+
+
+class ScaledClock(Clock):
+    """
+    Real time since *start_ns* (a ``time.monotonic_ns`` reading, default
+    now) multiplied by *factor*; sleeping waits ``ms / factor`` real ms.
+    """
+
+    def __init__(self, factor: float = 1, start_ns: int | None = None):
+        self.factor = factor
+        self.start_ns = time.monotonic_ns() if start_ns is None else start_ns
+
+    def now_ms(self) -> int:
+        return self.factor * (time.monotonic_ns() - self.start_ns) // 1_000_000
+
+    def sleep_ms(self, ms: float):
+        if ms > 0:
+            time.sleep(ms / 1000 / self.factor)
+
+
+class RealClock(ScaledClock):
+    """Unscaled real time."""
+
+    def __init__(self, start_ns: int | None = None):
+        super().__init__(1, start_ns)
+
+
+class ManualClock(Clock):
+    """
+    Virtual time that only moves when told to.
+
+    `sleep_ms` advances the clock instead of blocking, so a loop paced by
+    this clock runs as fast as the CPU allows; `advance`/`set` let a driver
+    jump directly to the next interesting moment.  Wall time is derived
+    from game time, which keeps event timestamps deterministic.
+    """
+
+    def __init__(self, start_ms: int = 0):
+        self._now_ms = start_ms
+        self._lock = threading.Lock()
+
+    def now_ms(self) -> int:
+        return self._now_ms
+
+    def sleep_ms(self, ms: float):
+        self.advance(ms)
+
+    def advance(self, ms: float):
+        if ms < 0:
+            raise ValueError("a clock cannot run backwards")
+        with self._lock:
+            self._now_ms += ms
+
+    def set(self, now_ms: float):
+        with self._lock:
+            if now_ms < self._now_ms:
+                raise ValueError("a clock cannot run backwards")
+            self._now_ms = now_ms
+
+    def wall_time(self) -> float:
+        return self._now_ms / 1000
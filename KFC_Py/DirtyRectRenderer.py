@@ -0,0 +1,196 @@
+"""
+Retained-mode board renderer.
+Keeps one persistent framebuffer and, each frame, repaints only the
+rectangles whose contents changed (a piece moved or its animation frame
+advanced, a cursor moved or changed colour).
+"""
+from __future__ import annotations
+
+import logging
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from Board import Board
+from img import Img
+
+logger = logging.getLogger(__name__)
+
+Rect = Tuple[int, int, int, int]  # x0, y0, x1, y1 (exclusive)
+
+# Above this fraction of the board being dirty a full repaint is cheaper
+FULL_REDRAW_FRACTION = 0.5
+
+# Img.draw_rect strokes are 2px wide, centred on the outline
+_CURSOR_PAD = 1
+
+
+def _overlaps(a: Rect, b: Rect) -> bool:
+    return a[0] < b[2] and b[0] < a[2] and a[1] < b[3] and b[1] < a[3]
+
+
+class DirtyRectRenderer:
+    """
+    Draws pieces and cursor outlines over *board* into a persistent frame.
+
+    `render` takes the full scene each time – the pieces, whose sprites come
+    from `Piece.sprite_at`, and ``outlines`` as ``(key, x1, y1, x2, y2, color)``,
+    in draw order – and diffs it against the previous frame by piece /
+    outline key.  The old and new bounds of every changed item are restored
+    from the board background, and every item touching a restored area is
+    drawn again, in order, so overlapping sprites stack exactly as in a full
+    redraw.
+
+    Boards whose pixels are not a NumPy array (e.g. `MockImg`) are always
+    rendered the old way: a fresh `Board.clone()` with every piece drawn by
+    `Piece.draw_on_board`.
+    """
+
+    def __init__(self, board: Board, full_redraw_fraction: float = FULL_REDRAW_FRACTION):
+        self.board = board
+        self.full_redraw_fraction = full_redraw_fraction
+        self.frame: Optional[Board] = None
+        self._prev: Dict[Hashable, tuple] = {}
+        self._needs_full = True
+        self.frames = 0
+        self.full_redraws = 0
+        self.dirty_rects = 0
+        self.items_drawn = 0
+
+    def invalidate(self):
+        """Force the next `render` to repaint everything."""
+        self._needs_full = True
+
+    # ───────────────────────── public API ─────────────────────────
+    def render(self, pieces: Sequence, now_ms: int,
+               outlines: Sequence[Tuple[Hashable, int, int, int, int, tuple]] = ()) -> Board:
+        background = self.board.img.img
+        if not isinstance(background, np.ndarray):
+            self.frames += 1
+            self.frame = self.board.clone()
+            for p in pieces:
+                p.draw_on_board(self.frame, now_ms=now_ms)
+            self._draw_items(self._items((), outlines))
+            self.full_redraws += 1
+            return self.frame
+
+        return self.render_sprites([(p, *p.sprite_at(now_ms)) for p in pieces], outlines)
+
+    def render_sprites(self, sprites: Sequence[Tuple[Hashable, Img, int, int]],
+                       outlines: Sequence[Tuple[Hashable, int, int, int, int, tuple]] = ()) -> Board:
+        """Like `render`, for a scene already resolved to ``(key, sprite, x, y)``."""
+        self.frames += 1
+        background = self.board.img.img
+        if not isinstance(background, np.ndarray):
+            self.frame = self.board.clone()
+            self._draw_items(self._items(sprites, outlines))
+            self.full_redraws += 1
+            return self.frame
+
+        items = self._items(sprites, outlines)
+
+        if (self._needs_full or self.frame is None
+                or self.frame.img.img.shape != background.shape):
+            return self._full_redraw(items)
+
+        dirty = self._diff(items)
+        if not dirty:
+            return self.frame
+
+        H, W = background.shape[:2]
+        area = sum((r[2] - r[0]) * (r[3] - r[1]) for r in dirty)
+        if area > self.full_redraw_fraction * W * H:
+            return self._full_redraw(items)
+
+        # anything overlapping a repainted area must be repainted as well
+        redraw = [False] * len(items)
+        grew = True
+        while grew:
+            grew = False
+            for i, item in enumerate(items):
+                if not redraw[i] and any(_overlaps(item[1], r) for r in dirty):
+                    redraw[i] = True
+                    dirty.append(item[1])
+                    grew = True
+
+        frame_pix = self.frame.img.img
+        for x0, y0, x1, y1 in dirty:
+            frame_pix[y0:y1, x0:x1] = background[y0:y1, x0:x1]
+        self._draw_items([item for item, again in zip(items, redraw) if again])
+        self.dirty_rects += len(dirty)
+        return self.frame
+
+    def stats(self) -> dict:
+        return {"frames": self.frames, "full_redraws": self.full_redraws,
+                "dirty_rects": self.dirty_rects, "items_drawn": self.items_drawn}
+
+    # ───────────────────────── internals ─────────────────────────
+    def _items(self, sprites, outlines) -> List[tuple]:
+        """Normalise the scene into ``(key, bounds, draw-args)`` tuples."""
+        items = []
+        H, W = self._board_size()
+        for key, img, x, y in sprites:
+            h, w = self._img_size(img)
+            items.append((key, self._clip((x, y, x + w, y + h), W, H), ("sprite", img, x, y)))
+        for key, x1, y1, x2, y2, color in outlines:
+            p = _CURSOR_PAD
+            items.append((key, self._clip((x1 - p, y1 - p, x2 + p + 1, y2 + p + 1), W, H),
+                          ("outline", x1, y1, x2, y2, color)))
+        return items
+
+    def _board_size(self) -> Tuple[int, int]:
+        pix = self.board.img.img
+        if isinstance(pix, np.ndarray):
+            return pix.shape[:2]
+        return (self.board.H_cells * self.board.cell_H_pix,
+                self.board.W_cells * self.board.cell_W_pix)
+
+    @staticmethod
+    def _img_size(img: Img) -> Tuple[int, int]:
+        pix = img.img
+        if isinstance(pix, np.ndarray):
+            return pix.shape[:2]
+        return 0, 0
+
+    @staticmethod
+    def _clip(r: Rect, W: int, H: int) -> Rect:
+        return max(r[0], 0), max(r[1], 0), min(r[2], W), min(r[3], H)
+
+    def _diff(self, items) -> List[Rect]:
+        dirty: List[Rect] = []
+        current = {}
+        for key, bounds, args in items:
+            current[key] = (bounds, args)
+            old = self._prev.get(key)
+            if old is None:
+                dirty.append(bounds)
+            elif old != (bounds, args):  # Img compares by identity
+                dirty.append(old[0])
+                dirty.append(bounds)
+        for key, (bounds, _) in self._prev.items():
+            if key not in current:
+                dirty.append(bounds)
+        self._prev = current
+        return [r for r in dirty if r[0] < r[2] and r[1] < r[3]]
+
+    def _full_redraw(self, items) -> Board:
+        if self.frame is None or self.frame.img.img.shape != self.board.img.img.shape:
+            self.frame = self.board.clone()
+        else:
+            self.frame.img.img[...] = self.board.img.img
+        self._draw_items(items)
+        self._prev = {key: (bounds, args) for key, bounds, args in items}
+        self._needs_full = False
+        self.full_redraws += 1
+        return self.frame
+
+    def _draw_items(self, items):
+        target = self.frame.img
+        for _, _, args in items:
+            if args[0] == "sprite":
+                _, img, x, y = args
+                img.draw_on(target, x, y)
+            else:
+                _, x1, y1, x2, y2, color = args
+                target.draw_rect(x1, y1, x2, y2, color)
+        self.items_drawn += len(items)
@@ -1,16 +1,17 @@
-import queue, threading, time, math, logging
+import queue, threading, time, math, logging, heapq, itertools
 from typing import List, Dict, Tuple, Optional, Set
-from collections import defaultdict
 
 from Board import Board
+from img import Img
 from Command import Command
 from Piece import Piece
+from OccupancyIndex import OccupancyIndex
 from GameEventPublisher import game_event_publisher
 from EventType import EventType
-from GameUISubscriber import GameUISubscriber
-from SoundManager import SoundManager
-
-from KeyboardInput import KeyboardProcessor, KeyboardProducer
+from Clock import Clock, ScaledClock
+from TickScheduler import TickScheduler, DEFAULT_TICK_HZ, DEFAULT_RENDER_HZ
+from DirtyRectRenderer import DirtyRectRenderer
+from RenderThread import FrameSnapshot, RenderThread
 
 # set up a module-level logger – real apps can configure handlers/levels
 logger = logging.getLogger(__name__)
@@ -20,7 +21,16 @@ class InvalidBoard(Exception): ...
 
 
 class Game:
-    def __init__(self, pieces: List[Piece], board: Board, pieces_root=None, graphics_factory=None):
+    def __init__(self, pieces: List[Piece], board: Board, pieces_root=None, graphics_factory=None,
+                 tick_hz: Optional[float] = DEFAULT_TICK_HZ,
+                 render_hz: Optional[float] = DEFAULT_RENDER_HZ,
+                 event_driven: bool = False,
+                 piece_store=None,
+                 use_bitboards: bool = False,
+                 render_thread: bool = False,
+                 event_publisher=None,
+                 sound: bool = True,
+                 clock: Optional[Clock] = None):
         self.pieces = pieces
         self.board = board
         self.pieces_root = pieces_root  # Add pieces root for creating new pieces
@@ -28,9 +38,12 @@ class Game:
         self.curr_board = None
         self.user_input_queue = queue.Queue()
         self.piece_by_id = {p.id: p for p in pieces}
-        self.pos: Dict[Tuple[int, int], List[Piece]] = defaultdict(list)
+        # cell -> pieces, updated incrementally; optionally mirrored as bitboards
+        self.pos = OccupancyIndex(pieces, use_bitboards=use_bitboards, width=board.W_cells)
         self.START_NS = time.time_ns()
-        self._time_factor = 1  
+        # all game time comes from here; the default keeps the historic
+        # anchoring at START_NS and honours `_time_factor`
+        self.clock: Clock = clock or ScaledClock(1, start_ns=self.START_NS)
         self.kp1 = None
         self.kp2 = None
         self.kb_prod_1 = None
@@ -41,18 +54,59 @@ class Game:
         self.last_cursor2 = (0, 0)
         
         # Event publisher for Pub/Sub system
-        self.event_publisher = game_event_publisher
+        self.event_publisher = event_publisher or game_event_publisher
         
-        # Sound manager for game audio
-        self.sound_manager = SoundManager()
+        # Sound manager for game audio (pygame is only imported when wanted)
+        self.sound_manager = None
+        if sound:
+            from SoundManager import SoundManager
+            self.sound_manager = SoundManager()
+
+        # Paces the game loop: fixed simulation rate, independent render rate
+        self.scheduler = TickScheduler(self.game_time_ms, self._sleep_game_ms,
+                                       tick_hz=tick_hz, render_hz=render_hz)
+
+        # Event-driven mode: only pieces whose next physics event is due (or
+        # that just received a command) are advanced on a tick.
+        self.event_driven = event_driven
+        self._wakeups: List[Tuple[int, int, Piece]] = []  # heap of (due_ms, seq, piece)
+        self._wakeup_due: Dict[Piece, int] = {}
+        self._wakeup_seq = itertools.count()
+
+        # Optional PieceStore: moving pieces are advanced in one vectorised step
+        self.piece_store = piece_store
+
+        # Repaints only what changed since the previous frame
+        self.renderer = DirtyRectRenderer(board)
+
+        # Threaded rendering: the loop publishes snapshots every tick and a
+        # render thread draws the latest one at up to render_hz frames/s.
+        self.render_thread: Optional[RenderThread] = (
+            RenderThread(self._render_snapshot, max_fps=render_hz) if render_thread else None)
+        self._snapshot_seq = itertools.count()
 
     def game_time_ms(self) -> int:
-        return self._time_factor * (time.monotonic_ns() - self.START_NS) // 1_000_000
+        return self.clock.now_ms()
+
+    def _sleep_game_ms(self, ms: float):
+        """Wait for *ms* of game time (a virtual clock just advances)."""
+        self.clock.sleep_ms(ms)
+
+    @property
+    def _time_factor(self):
+        return getattr(self.clock, "factor", 1)
+
+    @_time_factor.setter
+    def _time_factor(self, factor):
+        if not isinstance(self.clock, ScaledClock):
+            raise AttributeError(f"{type(self.clock).__name__} has no time factor")
+        self.clock.factor = factor
 
     def clone_board(self) -> Board:
         return self.board.clone()
 
     def start_user_input_thread(self):
+        from KeyboardInput import KeyboardProcessor, KeyboardProducer
 
         # player 1 key‐map
         p1_map = {
@@ -90,29 +144,79 @@ class Game:
         self.kb_prod_2.start()
 
     def _update_cell2piece_map(self):
-        self.pos.clear()
+        """Full rebuild of the occupancy index from `self.pieces`."""
+        self.pos.rebuild(self.pieces)
+
+    # ───────────────────────── event-driven wake-ups ─────────────────────────
+    def _schedule_wakeup(self, piece: Piece, now_ms: int):
+        due = piece.next_event_ms(now_ms)
+        if due is None:
+            self._wakeup_due.pop(piece, None)
+            return
+        if self._wakeup_due.get(piece) == due:
+            return
+        self._wakeup_due[piece] = due
+        heapq.heappush(self._wakeups, (due, next(self._wakeup_seq), piece))
+
+    def _unschedule_wakeup(self, piece: Piece):
+        # the heap entry becomes stale and is skipped when popped
+        self._wakeup_due.pop(piece, None)
+
+    def _schedule_all_wakeups(self, now_ms: int):
+        self._wakeups.clear()
+        self._wakeup_due.clear()
         for p in self.pieces:
-            self.pos[p.current_cell()].append(p)
+            self._schedule_wakeup(p, now_ms)
+
+    def _pop_due_pieces(self, now_ms: int) -> List[Piece]:
+        due = []
+        while self._wakeups and self._wakeups[0][0] <= now_ms:
+            t, _, p = heapq.heappop(self._wakeups)
+            if self._wakeup_due.get(p) != t:
+                continue  # stale: rescheduled, captured or replaced
+            del self._wakeup_due[p]
+            due.append(p)
+        return due
 
     def _run_game_loop(self, num_iterations=None, is_with_graphics=True):
+        self.scheduler.start()
+        # pieces may have been added/removed from outside since the last run
+        self._update_cell2piece_map()
+        if self.event_driven:
+            self._schedule_all_wakeups(self.game_time_ms())
+        threaded = is_with_graphics and self.render_thread is not None
+        if threaded:
+            self.render_thread.start()
+        try:
+            self._loop(num_iterations, is_with_graphics and not threaded, threaded)
+        finally:
+            if threaded:
+                self.render_thread.stop()
+
+    def _loop(self, num_iterations, is_with_graphics, publish_snapshots):
         it_counter = 0
         while not self._is_win():
-            now = self.game_time_ms()
-
-            for p in self.pieces:
-                p.update(now)
+            now = self.scheduler.wait_for_tick()
+            render = is_with_graphics and self.scheduler.render_due(now)
 
-            self._update_cell2piece_map()
+            changed = self._advance_and_apply_input(now)
 
-            while not self.user_input_queue.empty():
-                cmd: Command = self.user_input_queue.get()
-                self._process_input(cmd)
-
-            if is_with_graphics:
+            if render:
                 self._draw()
                 self._show()
-
-            self._resolve_collisions()
+            elif publish_snapshots:
+                if self.render_thread.error is not None:
+                    raise self.render_thread.error
+                self.render_thread.publish(self._snapshot(now))
+                frame = self.render_thread.take_frame()
+                if frame is not None:
+                    # the window is only touched from this thread
+                    self.curr_board = frame
+                    self._show()
+
+            # occupancy only changes when a piece advanced or got a command
+            if changed:
+                self._resolve_collisions()
 
             # for testing
             if num_iterations is not None:
@@ -120,8 +224,33 @@ class Game:
                 if num_iterations <= it_counter:
                     return
 
+    def _advance_and_apply_input(self, now: int) -> bool:
+        """Advance pieces to *now* and apply queued commands; True if anything changed."""
+        if self.event_driven:
+            advanced = self._pop_due_pieces(now)
+        else:
+            advanced = list(self.pieces)
+
+        if self.piece_store is not None:
+            self.piece_store.advance(now)
+        for p in advanced:
+            p.update(now)
+            self.pos.refresh(p)
+        if self.event_driven:
+            for p in advanced:
+                self._schedule_wakeup(p, now)
+
+        had_input = not self.user_input_queue.empty()
+
+        while not self.user_input_queue.empty():
+            cmd: Command = self.user_input_queue.get()
+            self._process_input(cmd)
+
+        return bool(advanced) or had_input
+
     def run(self, num_iterations=None, is_with_graphics=True):
         # יצירת UI subscriber
+        from GameUISubscriber import GameUISubscriber
         self.ui_subscriber = GameUISubscriber()
         
         # רישום ה-UI subscriber למערכת הודעות
@@ -146,16 +275,37 @@ class Game:
         self._run_game_loop(num_iterations, is_with_graphics)
 
         self._announce_win()
+        logger.info("Game loop stats: %s", self.scheduler.stats())
+        logger.info("Renderer stats: %s", self.renderer.stats())
+        if self.render_thread is not None:
+            logger.info("Render thread stats: %s", self.render_thread.stats())
         if self.kb_prod_1:
             self.kb_prod_1.stop()
             self.kb_prod_2.stop()
 
     def _draw(self):
-        self.curr_board = self.clone_board()
-        for p in self.pieces:
-            p.draw_on_board(self.curr_board, now_ms=self.game_time_ms())
-
+        now_ms = self.game_time_ms()
+        self.curr_board = self._with_ui_overlay(
+            self.renderer.render(self.pieces, now_ms, self._cursor_outlines()))
+
+    def _snapshot(self, now_ms: int) -> FrameSnapshot:
+        """Freeze the current scene (and the UI panels' data) for the render thread."""
+        sprites = tuple((p.id, *p.sprite_at(now_ms)) for p in self.pieces)
+        panels = self.ui_subscriber.panel_state() if hasattr(self, 'ui_subscriber') else None
+        return FrameSnapshot(next(self._snapshot_seq), now_ms, sprites, tuple(self._cursor_outlines()),
+                             panels)
+
+    def _render_snapshot(self, snapshot: FrameSnapshot) -> Board:
+        # runs on the render thread – reads only the snapshot and the render
+        # caches; the finished board goes back to the game loop to be shown
+        frame = self.renderer.render_sprites(snapshot.sprites, snapshot.outlines)
+        if snapshot.panels is None:
+            return frame.clone()  # the renderer draws the next frame into the same buffer
+        return self._with_ui_overlay(frame, snapshot.panels)
+
+    def _cursor_outlines(self) -> list:
         # overlay both players' cursors, but only log on change
+        outlines = []
         if self.kp1 and self.kp2:
             for player, kp, last in (
                     (1, self.kp1, 'last_cursor1'),
@@ -181,20 +331,26 @@ class Game:
                 else:
                     color = (0, 255, 0) if player == 1 else (255, 0, 0)  # Normal colors
                     
-                self.curr_board.img.draw_rect(x1, y1, x2, y2, color)
+                outlines.append((("cursor", player), x1, y1, x2, y2, color))
 
                 # only print if moved
                 prev = getattr(self, last)
                 if prev != (r, c):
                     logger.debug("Marker P%s moved to (%s, %s)", player, r, c)
                     setattr(self, last, (r, c))
-        
+        return outlines
+
+    def _with_ui_overlay(self, frame: Board, panels: Optional[tuple] = None) -> Board:
         # יצירת UI מורחבת עם טבלאות מהלכים וניקוד
-        if hasattr(self, 'ui_subscriber'):
-            # העברת תמונת הלוח הנוכחית ל-UI subscriber
-            enhanced_board_img = self.ui_subscriber.create_ui_overlay(self.curr_board.img.img)
-            # עדכון התמונה במבנה הלוח
-            self.curr_board.img.img = enhanced_board_img
+        if not hasattr(self, 'ui_subscriber'):
+            return frame
+        # העברת תמונת הלוח הנוכחית ל-UI subscriber
+        enhanced_board_img = self.ui_subscriber.create_ui_overlay(frame.img.img, panels)
+        # עדכון התמונה במבנה הלוח – on a new Board, the renderer's frame is reused
+        board = Board(self.board.cell_H_pix, self.board.cell_W_pix,
+                      self.board.W_cells, self.board.H_cells, Img())
+        board.img.img = enhanced_board_img
+        return board
 
     def _show(self):
         self.curr_board.show()
@@ -213,6 +369,9 @@ class Game:
 
         # Process the command - Piece.on_command() determines my_color internally
         mover.on_command(cmd, self.pos)
+        self.pos.refresh(mover)  # a jump lands immediately
+        if self.event_driven:
+            self._schedule_wakeup(mover, self.game_time_ms())
         
         # Publish move event if it was a move command and piece actually moved
         if cmd.type == "move" and len(cmd.params) >= 2:
@@ -225,10 +384,8 @@ class Game:
         logger.info(f"Processed command: {cmd} for piece {cmd.piece_id}")
 
     def _resolve_collisions(self):
-        self._update_cell2piece_map()
-        occupied = self.pos
-
-        for cell, plist in occupied.items():
+        for cell in self.pos.crowded_cells():
+            plist = list(self.pos[cell])
             if len(plist) < 2:
                 continue
 
@@ -285,6 +442,9 @@ class Game:
                     self.event_publisher.publish_piece_captured(p.id, winner.id, cell)
                     
                     self.pieces.remove(p)
+                    self.pos.remove(p)
+                    p.release()
+                    self._unschedule_wakeup(p)
                 else:
                     logger.debug(f"Piece {p.id} cannot be captured (state: {p.state.name})")
 
@@ -342,6 +502,8 @@ class Game:
     
     def _on_piece_moved(self, event_data):
         """Handle piece moved events and play appropriate sounds"""
+        if self.sound_manager is None:
+            return
         piece_id = event_data.piece_id
         from_cell = event_data.from_cell  
         to_cell = event_data.to_cell
@@ -382,6 +544,7 @@ class Game:
     def _handle_pawn_promotion(self, pawn_piece, cell: tuple):
         """Handle pawn promotion by creating a new piece and replacing the old one"""
         from PieceFactory import PieceFactory
+        from PhysicsFactory import PhysicsFactory
         
         player_color = pawn_piece.id[1] if len(pawn_piece.id) >= 2 else 'W'
         old_piece_id = pawn_piece.id
@@ -406,7 +569,8 @@ class Game:
             # Create new piece at the promotion position if we have pieces_root
             if self.pieces_root:
                 print(f"DEBUG: pieces_root available: {self.pieces_root}")
-                pf = PieceFactory(self.board, self.pieces_root, graphics_factory=self.graphics_factory)
+                pf = PieceFactory(self.board, self.pieces_root, graphics_factory=self.graphics_factory,
+                                  physics_factory=PhysicsFactory(self.board, self.piece_store))
                 new_piece = pf.create_piece(new_piece_type, cell)
                 new_piece.id = new_piece_id
                 
@@ -455,6 +619,7 @@ class Game:
         # Remove old piece from pieces list
         if old_piece in self.pieces:
             self.pieces.remove(old_piece)
+        self._unschedule_wakeup(old_piece)
         
         # Remove from piece_by_id mapping
         if old_piece.id in self.piece_by_id:
@@ -463,9 +628,13 @@ class Game:
         # Add new piece
         self.pieces.append(new_piece)
         self.piece_by_id[new_piece.id] = new_piece
+        if self.event_driven:
+            self._schedule_wakeup(new_piece, self.game_time_ms())
         
         # Update position mapping
-        self._update_cell2piece_map()
+        self.pos.remove(old_piece)
+        self.pos.add(new_piece)
+        old_piece.release()
     
     def _on_pawn_promoted(self, event_data):
         """Handle pawn promotion events"""
@@ -16,13 +16,18 @@ class GameEventPublisher:
     This is a helper layer over the MessageBroker for game-specific events.
     """
     
-    def __init__(self, broker=None):
+    def __init__(self, broker=None, clock=None):
         self.broker = broker or game_message_broker
+        # event timestamps come from clock.wall_time() when a Clock is given
+        self.clock = clock
+
+    def _now(self) -> float:
+        return self.clock.wall_time() if self.clock is not None else time.time()
     
     def publish_game_started(self, player1_name: str = "Player 1", player2_name: str = "Player 2"):
         """Publish game started event"""
         data = GameStartedData(player1_name, player2_name)
-        data.timestamp = time.time()
+        data.timestamp = self._now()
         
         logger.info(f"Publishing GAME_STARTED: {player1_name} vs {player2_name}")
         self.broker.publish(EventType.GAME_STARTED, data)
@@ -30,7 +35,7 @@ class GameEventPublisher:
     def publish_game_ended(self, winner: str = None, reason: str = "checkmate"):
         """Publish game ended event"""
         data = GameEndedData(winner, reason)
-        data.timestamp = time.time()
+        data.timestamp = self._now()
         
         logger.info(f"Publishing GAME_ENDED: winner={winner}, reason={reason}")
         self.broker.publish(EventType.GAME_ENDED, data)
@@ -41,7 +46,7 @@ class GameEventPublisher:
         player_color = piece_id[1] if len(piece_id) >= 2 else "?"
         
         data = PieceMovedData(piece_id, from_cell, to_cell, player_color)
-        data.timestamp = time.time()
+        data.timestamp = self._now()
         
         logger.info(f"Publishing PIECE_MOVED: {piece_id} from {from_cell} to {to_cell}")
         self.broker.publish(EventType.PIECE_MOVED, data)
@@ -49,7 +54,7 @@ class GameEventPublisher:
     def publish_piece_captured(self, captured_piece_id: str, capturing_piece_id: str, cell: tuple):
         """Publish piece captured event"""
         data = PieceCapturedData(captured_piece_id, capturing_piece_id, cell)
-        data.timestamp = time.time()
+        data.timestamp = self._now()
         
         logger.info(f"Publishing PIECE_CAPTURED: {capturing_piece_id} captures {captured_piece_id} at {cell}")
         self.broker.publish(EventType.PIECE_CAPTURED, data)
@@ -59,7 +64,7 @@ class GameEventPublisher:
         from EventType import PawnPromotedData
         
         data = PawnPromotedData(old_piece_id, new_piece_id, cell, promoted_to)
-        data.timestamp = time.time()
+        data.timestamp = self._now()
         
         logger.info(f"Publishing PAWN_PROMOTED: {old_piece_id} promoted to {promoted_to} at {cell}")
         self.broker.publish(EventType.PAWN_PROMOTED, data)
@@ -1,21 +1,38 @@
+import logging
 import pathlib
 from Board import Board
 from PieceFactory import PieceFactory
 from Game import Game
 from GraphicsFactory import GraphicsFactory
+from PhysicsFactory import PhysicsFactory
+from SpriteAtlas import SpriteAtlas
+
+logger = logging.getLogger(__name__)
 
 CELL_PX = 64
 
 
-def create_game(pieces_root: str | pathlib.Path, img_factory) -> Game:
+def create_game(pieces_root: str | pathlib.Path, img_factory, piece_store=None,
+                use_atlas: bool = False, board_csv: str | pathlib.Path | None = None,
+                game_cls: type = Game, **game_options) -> Game:
     """Build a *Game* from the on-disk asset hierarchy rooted at *pieces_root*.
 
     This reads *board.csv* located inside *pieces_root*, creates a blank board
     (or loads board.png if present), instantiates every piece via PieceFactory
     and returns a ready-to-run *Game* instance.
+
+    Pass a *PieceStore* as *piece_store* to back all piece motion with shared
+    NumPy arrays that the game loop advances in one vectorised step.
+    With *use_atlas*, sprites come from the pre-baked atlas built by
+    ``SpriteAtlas.py`` for ``CELL_PX`` if it exists (falls back to the
+    per-frame PNGs otherwise).
+    *board_csv* replaces ``pieces_root / "board.csv"`` as the starting
+    position and *game_cls* lets callers build a *Game* subclass.
+    Any other keyword (e.g. ``event_driven``, ``use_bitboards``) is passed
+    through to *Game*.
     """
     pieces_root = pathlib.Path(pieces_root)
-    board_csv = pieces_root / "board.csv"
+    board_csv = pathlib.Path(board_csv) if board_csv else pieces_root / "board.csv"
     if not board_csv.exists():
         raise FileNotFoundError(board_csv)
 
@@ -30,8 +47,12 @@ def create_game(pieces_root: str | pathlib.Path, img_factory) -> Game:
 
     board = Board(CELL_PX, CELL_PX, 8, 8, board_img)
 
-    gfx_factory = GraphicsFactory(img_factory)
-    pf = PieceFactory(board, pieces_root, graphics_factory=gfx_factory)
+    atlas = SpriteAtlas.load_if_present(pieces_root, CELL_PX) if use_atlas else None
+    if use_atlas and atlas is None:
+        logger.info("No sprite atlas for %spx in %s – loading individual sprites", CELL_PX, pieces_root)
+    gfx_factory = GraphicsFactory(img_factory, atlas=atlas)
+    pf = PieceFactory(board, pieces_root, graphics_factory=gfx_factory,
+                      physics_factory=PhysicsFactory(board, piece_store))
 
     pieces = []
     with board_csv.open() as f:
@@ -40,4 +61,4 @@ def create_game(pieces_root: str | pathlib.Path, img_factory) -> Game:
                 if code:
                     pieces.append(pf.create_piece(code, (r, c)))
 
-    return Game(pieces, board, pieces_root, gfx_factory) 
\ No newline at end of file
+    return game_cls(pieces, board, pieces_root, gfx_factory, piece_store=piece_store, **game_options)
@@ -6,6 +6,7 @@ import cv2
 import numpy as np
 import time
 import logging
+from collections import OrderedDict
 from typing import Dict, List, Any, Tuple
 
 # Import game components
@@ -15,6 +16,75 @@ from SoundManager import sound_manager
 logger = logging.getLogger(__name__)
 
 
+class TextTileCache:
+    """
+    Pre-rasterized text lines.
+    Each (text, font, scale, thickness) is rendered once by `cv2.putText`
+    into a small coverage tile (0-255); drawing it again blends the colour
+    in with that coverage, matching direct `putText` to within 1 level.
+    Tiles not drawn since the last `evict_unused` – e.g. lines scrolled out
+    of the move-list window – are dropped.
+    """
+
+    def __init__(self, max_tiles: int = 128):
+        self.max_tiles = max_tiles
+        self._tiles: "OrderedDict[tuple, Tuple[np.ndarray, int, int]]" = OrderedDict()
+        self._used: set = set()
+        self.hits = 0
+        self.misses = 0
+
+    def _render(self, text: str, font: int, scale: float, thickness: int):
+        (w, h), baseline = cv2.getTextSize(text, font, scale, thickness)
+        pad = thickness + 2
+        mask = np.zeros((h + baseline + 2 * pad, w + 2 * pad), dtype=np.uint8)
+        cv2.putText(mask, text, (pad, h + pad), font, scale, 255, thickness)
+        # crop to the drawn pixels; keep the offset of the tile's top-left
+        # corner from the text origin
+        ys, xs = np.nonzero(mask)
+        if len(ys) == 0:
+            return None, 0, 0
+        y0, y1, x0, x1 = ys.min(), ys.max() + 1, xs.min(), xs.max() + 1
+        alpha = mask[y0:y1, x0:x1, None].astype(np.uint16)
+        return alpha, x0 - pad, y0 - (h + pad)
+
+    def draw(self, canvas: np.ndarray, text: str, org: Tuple[int, int],
+             font: int, scale: float, color, thickness: int):
+        key = (text, font, scale, thickness)
+        tile = self._tiles.get(key)
+        if tile is None:
+            self.misses += 1
+            tile = self._tiles[key] = self._render(text, font, scale, thickness)
+            if len(self._tiles) > self.max_tiles:
+                self._tiles.popitem(last=False)
+        else:
+            self.hits += 1
+            self._tiles.move_to_end(key)
+        self._used.add(key)
+
+        alpha, dx, dy = tile
+        if alpha is None:
+            return
+        x0, y0 = org[0] + dx, org[1] + dy
+        H, W = canvas.shape[:2]
+        cx0, cy0 = max(x0, 0), max(y0, 0)
+        cx1, cy1 = min(x0 + alpha.shape[1], W), min(y0 + alpha.shape[0], H)
+        if cx0 >= cx1 or cy0 >= cy1:
+            return
+        a = alpha[cy0 - y0:cy1 - y0, cx0 - x0:cx1 - x0]
+        region = canvas[cy0:cy1, cx0:cx1]
+        color = np.asarray(color[:region.shape[2]], dtype=np.uint16)
+        region[...] = (region * (255 - a) + color * a + 127) // 255
+
+    def evict_unused(self):
+        """Drop every tile not drawn since the previous call."""
+        for key in [k for k in self._tiles if k not in self._used]:
+            del self._tiles[key]
+        self._used.clear()
+
+    def __len__(self) -> int:
+        return len(self._tiles)
+
+
 class GameUISubscriber:
     """
     Coordinates UI elements and creates board overlay with panels
@@ -73,6 +143,15 @@ class GameUISubscriber:
         self.font_thickness = 2                # Slightly thicker for better visibility
         self.header_font_scale = 1.0           # Larger headers
         self.header_font_thickness = 2
+
+        # Cached layers of create_ui_overlay: the static chrome (gradient,
+        # title, board border) and chrome + both player panels, re-rendered
+        # only when the move lists or scores change.
+        self._chrome: np.ndarray | None = None
+        self._panels: np.ndarray | None = None
+        self._panels_key = None
+        # Rasterized move-list lines, reused while they stay visible
+        self._line_tiles = TextTileCache()
         
         logger.info("GameUISubscriber initialized")
     
@@ -520,53 +599,72 @@ class GameUISubscriber:
             return f"{file_letter}{rank_number}"
         return "??"
     
-    def create_ui_overlay(self, board_img: np.ndarray) -> np.ndarray:
+    def panel_state(self) -> tuple:
+        """
+        Immutable copy of what the side panels show: scores, move counts and
+        the visible tail of each move list
+        """
+        return (self.white_score, self.black_score,
+                len(self.white_moves), tuple(self.white_moves[-8:]),
+                len(self.black_moves), tuple(self.black_moves[-8:]))
+
+    def create_ui_overlay(self, board_img: np.ndarray, panels: tuple | None = None) -> np.ndarray:
         """
         Create extended UI with board in center and move lists on sides
-        Returns new image with board centered and UI panels on left and right
+        Returns new image with board centered and UI panels on left and right;
+        *panels* (from `panel_state`) replaces the live scores and move lists
         """
         try:
             # Convert RGBA to RGB if needed
             if board_img.shape[2] == 4:  # RGBA
                 board_img = cv2.cvtColor(board_img, cv2.COLOR_RGBA2RGB)
             
-            # Create canvas with gradient background - full screen
-            canvas = self._create_gradient_background()
-            
-            # Add game title centered above board
-            self._draw_game_title(canvas)
+            # Start from the cached background with title, border and panels
+            canvas = self._panels_layer(panels or self.panel_state()).copy()
             
             # Resize board image to fit our board area
+            board_x = self.panel_width
+            board_y = self.title_height
+            board_area = canvas[board_y:board_y + self.board_height, board_x:board_x + self.board_width]
             if board_img.shape[:2] != (self.board_height, self.board_width):
-                board_resized = cv2.resize(board_img, (self.board_width, self.board_height))
+                cv2.resize(board_img, (self.board_width, self.board_height), dst=board_area)
             else:
-                board_resized = board_img.copy()
+                board_area[...] = board_img
             
-            # Add subtle border around subtle border around board
-            board_y_offset = self.title_height
-            self._add_board_border(canvas, self.panel_width, board_y_offset)
-            
-            # Add board
-            board_y_offset = self.title_height
-            self._add_board_border(canvas, self.panel_width, board_y_offset)
+            return canvas
             
-            # Place board in center (with title offset)
-            board_x = self.panel_width
-            board_y = board_y_offset
-            canvas[board_y:board_y + self.board_height, board_x:board_x + self.board_width] = board_resized
+        except Exception as e:
+            logger.error(f"Error creating UI overlay: {e}")
+            return board_img
+
+    def _chrome_layer(self) -> np.ndarray:
+        """Gradient background, title and board border – drawn once"""
+        if self._chrome is None:
+            canvas = self._create_gradient_background()
+            self._draw_game_title(canvas)
+            self._add_board_border(canvas, self.panel_width, self.title_height)
+            self._chrome = canvas
+        return self._chrome
+
+    def _panels_layer(self, panels: tuple) -> np.ndarray:
+        """Chrome plus both player panels, redrawn only when their content changes"""
+        if self._panels is None or panels != self._panels_key:
+            white_score, black_score, white_count, white_moves, black_count, black_moves = panels
+            canvas = self._chrome_layer().copy()
             
             # Draw left panel (Black player) with styling
-            self._draw_styled_player_panel(canvas, 0, "Black", self.black_moves, self.black_score, "black")
+            self._draw_styled_player_panel(canvas, 0, "Black", list(black_moves), black_score, "black",
+                                           black_count)
             
             # Draw right panel (White player) with styling
             right_x = self.panel_width + self.board_width
-            self._draw_styled_player_panel(canvas, right_x, "White", self.white_moves, self.white_score, "white")
+            self._draw_styled_player_panel(canvas, right_x, "White", list(white_moves), white_score, "white",
+                                           white_count)
+            self._line_tiles.evict_unused()
             
-            return canvas
-            
-        except Exception as e:
-            logger.error(f"Error creating UI overlay: {e}")
-            return board_img
+            self._panels = canvas
+            self._panels_key = panels
+        return self._panels
     
     def _draw_player_panel(self, canvas: np.ndarray, x_offset: int, player_name: str, 
                           moves: List[str], score: int, player_color: Tuple[int, int, int]):
@@ -601,8 +699,8 @@ class GameUISubscriber:
                 if len(move_display) > 18:
                     move_display = move_display[:15] + "..."
                     
-                cv2.putText(canvas, move_display, (x_offset + 10, y), 
-                           self.font, self.font_scale - 0.1, self.text_color, self.font_thickness)
+                self._line_tiles.draw(canvas, move_display, (x_offset + 10, y),
+                                      self.font, self.font_scale - 0.1, self.text_color, self.font_thickness)
                 y += 20
                 
                 # Don't exceed panel height
@@ -614,24 +712,21 @@ class GameUISubscriber:
 
     def _create_gradient_background(self) -> np.ndarray:
         """Create a beautiful gold and brown gradient background"""
-        canvas = np.zeros((self.total_height, self.total_width, 3), dtype=np.uint8)
+        # Calculate gradient factor (0 to 1) for every row at once
+        gradient_factor = np.arange(self.total_height) / self.total_height
         
         # Create warm gold to brown gradient
-        for y in range(self.total_height):
-            # Calculate gradient factor (0 to 1)
-            gradient_factor = y / self.total_height
-            
-            # Create warm gold to brown gradient
-            gold_factor = 1 - gradient_factor * 0.4
-            brown_factor = gradient_factor * 0.3
-            
-            gradient_color = (
-                int(245 * gold_factor + 139 * brown_factor),  # Blue channel - gold to brown
-                int(235 * gold_factor + 69 * brown_factor),   # Green channel
-                int(215 * gold_factor + 19 * brown_factor)    # Red channel - warm tones
-            )
-            canvas[y, :] = gradient_color
-            
+        gold_factor = 1 - gradient_factor * 0.4
+        brown_factor = gradient_factor * 0.3
+        
+        gradient_colors = np.stack([
+            245 * gold_factor + 139 * brown_factor,  # Blue channel - gold to brown
+            235 * gold_factor + 69 * brown_factor,   # Green channel
+            215 * gold_factor + 19 * brown_factor    # Red channel - warm tones
+        ], axis=1).astype(np.uint8)
+        
+        canvas = np.empty((self.total_height, self.total_width, 3), dtype=np.uint8)
+        canvas[:] = gradient_colors[:, None, :]
         return canvas
     
     def _add_board_border(self, canvas: np.ndarray, x: int, y: int):
@@ -645,7 +740,8 @@ class GameUISubscriber:
                      self.accent_color, border_thickness)
     
     def _draw_styled_player_panel(self, canvas: np.ndarray, x_offset: int, player_name: str,
-                                 moves: List[str], score: int, player_type: str):
+                                 moves: List[str], score: int, player_type: str,
+                                 move_count: int | None = None):
         """Draw clean player panel directly on background"""
         try:
             # No panel background - draw directly on gradient background
@@ -662,7 +758,7 @@ class GameUISubscriber:
             y += 30
             
             # Simple move list
-            self._draw_enhanced_move_list(canvas, x_offset, y, moves, player_type)
+            self._draw_enhanced_move_list(canvas, x_offset, y, moves, player_type, move_count)
             
         except Exception as e:
             logger.error(f"Error drawing styled player panel: {e}")
@@ -733,12 +829,14 @@ class GameUISubscriber:
                 self.accent_color, 2)
     
     def _draw_enhanced_move_list(self, canvas: np.ndarray, x_offset: int, y: int,
-                                moves: List[str], player_type: str):
-        """Draw clean and simple move list"""
+                                moves: List[str], player_type: str, move_count: int | None = None):
+        """Draw clean and simple move list; *moves* may be just the tail of *move_count* moves"""
         visible_moves = moves[-8:] if len(moves) > 8 else moves  # Show fewer moves
+        if move_count is None:
+            move_count = len(moves)
         
         for i, move in enumerate(visible_moves):
-            move_num = len(moves) - len(visible_moves) + i + 1
+            move_num = move_count - len(visible_moves) + i + 1
             
             # Simple move display - just number and move
             move_display = f"{move_num}. {move}"
@@ -751,8 +849,8 @@ class GameUISubscriber:
             text_color = self.success_color if ' x' in move else self.text_color
             
             # Draw the move text simply with smaller font
-            cv2.putText(canvas, move_display, (x_offset + 20, y),
-                       self.font, self.font_scale - 0.3, text_color, self.font_thickness)
+            self._line_tiles.draw(canvas, move_display, (x_offset + 20, y),
+                                  self.font, self.font_scale - 0.3, text_color, self.font_thickness)
             
             y += 25  # Compact spacing for more moves
             
@@ -16,12 +16,14 @@ class Graphics:
                  cell_size: tuple[int, int],
                  img_loader,
                  loop: bool = True,
-                 fps: float = 6.0):
+                 fps: float = 6.0,
+                 frames: list[Img] | None = None):
 
         # injectable image loader for tests (defaults to Img().read)
         self._img_loader = img_loader
 
-        self.frames: list[Img] = self._load_sprites(sprites_folder, cell_size)
+        # pre-loaded frames (e.g. from a sprite atlas) skip the folder scan
+        self.frames: list[Img] = frames if frames else self._load_sprites(sprites_folder, cell_size)
         self.loop, self.fps = loop, fps
         self.start_ms = 0
         self.cur_frame = 0
@@ -1,11 +1,95 @@
+import logging
+import os
 import pathlib
+import threading
+from collections import OrderedDict
 
 from Graphics import Graphics
 from img import Img
 from mock_img import MockImg
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_SPRITE_CACHE_BYTES = 64 * 1024 * 1024
+
+
+class SpriteCache:
+    """
+    Process-wide LRU cache of decoded, resized images.
+
+    Keyed by *(path, mtime, size, keep_aspect)* so an edited file on disk is
+    re-read.  Entries are evicted least-recently-used first once their pixel
+    bytes exceed *max_bytes*.  Cached `Img` objects are shared between every
+    caller and must be treated as read-only.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_SPRITE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[tuple, Img]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _nbytes(img: Img) -> int:
+        return getattr(img.img, "nbytes", 0)
+
+    def get_or_load(self, path, size, keep_aspect: bool, loader) -> Img:
+        path = str(path)
+        key = (path, os.stat(path).st_mtime_ns, tuple(size) if size else None, keep_aspect)
+        with self._lock:
+            img = self._entries.get(key)
+            if img is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return img
+            self.misses += 1
+
+        # decode outside the lock – other threads can keep hitting the cache
+        img = loader(path, size, keep_aspect)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = img
+                self.bytes_used += self._nbytes(img)
+                self._evict()
+            return self._entries[key]
+
+    def _evict(self):
+        # never evict the entry that was just inserted
+        while self.bytes_used > self.max_bytes and len(self._entries) > 1:
+            _, old = self._entries.popitem(last=False)
+            self.bytes_used -= self._nbytes(old)
+            self.evictions += 1
+
+    def set_budget(self, max_bytes: int):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes_used = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self.bytes_used,
+                "hits": self.hits, "misses": self.misses, "evictions": self.evictions}
+
+
+# Global cache shared by every ImgFactory in the process
+sprite_cache = SpriteCache()
+
 
 class ImgFactory:
+    def __init__(self, cache: SpriteCache | None = sprite_cache):
+        # pass cache=None to always read from disk
+        self._cache = cache
+
     def __call__(self, *args, **kwargs):
         # f = img_factory()
         # img = f(path, size, keep_aspect)
@@ -13,7 +97,10 @@ class ImgFactory:
         path = args[0]
         size = args[1]
         keep_aspect = kwargs.get("keep_aspect", args[2] if len(args) >= 3 else False)
-        return Img().read(path, size, keep_aspect)
+        if self._cache is None:
+            return Img().read(path, size, keep_aspect)
+        return self._cache.get_or_load(path, size, keep_aspect,
+                                       lambda p, sz, ka: Img().read(p, sz, ka))
 
 class MockImgFactory(ImgFactory):
     def __call__(self, *args, **kwargs):
@@ -25,9 +112,20 @@ class MockImgFactory(ImgFactory):
 
 class GraphicsFactory:
 
-    def __init__(self, img_factory):
+    def __init__(self, img_factory, atlas=None):
         # callable path, cell_size, keep_aspect -> Img
         self._img_factory = img_factory
+        # optional SpriteAtlas: frames for cell-sized sprites come from it
+        self._atlas = atlas
+
+    # factories over the same loader and atlas load identical graphics, so
+    # PieceFactory's template cache can share parsed piece types between them
+    def __eq__(self, other):
+        return (isinstance(other, GraphicsFactory)
+                and self._img_factory is other._img_factory and self._atlas is other._atlas)
+
+    def __hash__(self):
+        return hash((id(self._img_factory), id(self._atlas)))
 
     def load(self,
              sprites_dir: pathlib.Path,
@@ -38,5 +136,14 @@ class GraphicsFactory:
             cell_size=cell_size,
             img_loader=self._img_factory,
             loop=cfg.get("is_loop", True),
-            fps=cfg.get("frames_per_sec", 6.0)
+            fps=cfg.get("frames_per_sec", 6.0),
+            frames=self._atlas_frames(sprites_dir, cell_size)
         )
+
+    def _atlas_frames(self, sprites_dir: pathlib.Path, cell_size) -> list | None:
+        # <root>/<piece>/states/<state>/sprites
+        atlas = self._atlas
+        if atlas is None or tuple(cell_size) != (atlas.cell_px, atlas.cell_px):
+            return None
+        piece, state = sprites_dir.parent.parent.parent.name, sprites_dir.parent.name
+        return atlas.frames(piece, state) if atlas.has(piece, state) else None
@@ -1,6 +1,7 @@
 import threading, logging, time
 import keyboard  # pip install keyboard
 from Command import Command
+from Clock import RealClock
 from SoundManager import SoundManager
 
 logger = logging.getLogger(__name__)
@@ -74,9 +75,11 @@ class KeyboardProcessor:
 
 class KeyboardProducer(threading.Thread):
 
-    def __init__(self, game, queue, processor: KeyboardProcessor, player: int):
+    def __init__(self, game, queue, processor: KeyboardProcessor, player: int, clock=None):
         super().__init__(daemon=True)
         self.game = game
+        # double-clicks are timed on the game's clock (wall time for real clocks)
+        self.clock = clock or getattr(game, "clock", None) or RealClock()
         self.queue = queue
         self.proc = processor
         self.player = player
@@ -86,7 +89,7 @@ class KeyboardProducer(threading.Thread):
         self.my_color = "W" if player == 1 else "B"
         
         # Double-click detection for jump
-        self.last_select_time = 0
+        self.last_select_time = float("-inf")  # no previous click
         self.double_click_threshold = 0.5  # 500ms window for double-click
 
     def run(self):
@@ -95,10 +98,7 @@ class KeyboardProducer(threading.Thread):
         keyboard.wait()
 
     def _find_piece_at(self, cell):
-        for p in self.game.pieces:
-            if p.current_cell() == cell:
-                return p
-        return None
+        return self.game.pos.piece_at(cell)
 
     def _on_event(self, event):
         action = self.proc.process_key(event)
@@ -107,7 +107,7 @@ class KeyboardProducer(threading.Thread):
             return
 
         cell = self.proc.get_cursor()
-        current_time = time.time()
+        current_time = self.clock.wall_time()
         
         # Check for double-click (jump action)
         if current_time - self.last_select_time < self.double_click_threshold:
@@ -125,7 +125,7 @@ class KeyboardProducer(threading.Thread):
             self.queue.put(cmd)
             logger.info(f"Player{self.player} double-clicked - queued jump {cmd}")
             # Reset timer to prevent triple-click issues
-            self.last_select_time = 0
+            self.last_select_time = float("-inf")
             return
         
         # Single click logic (same as before)
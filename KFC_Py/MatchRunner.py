@@ -0,0 +1,187 @@
+"""
+Parallel batch matches.
+Shards a list of `MatchSpec`s over a `multiprocessing` pool of headless
+`SimulationEngine` workers and streams the results back as they finish,
+for bot-vs-bot runs and replay validation across all cores.
+"""
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import pathlib
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from Command import Command
+from GraphicsFactory import MockImgFactory
+from SimulationEngine import DEFAULT_MAX_MS, SimulationEngine
+
+logger = logging.getLogger(__name__)
+
+# A fixed script, or a picklable (module-level) function seed -> script
+Script = Union[Sequence[Command], Callable[[Optional[int]], Sequence[Command]]]
+
+
+@dataclass
+class MatchSpec:
+    match_id: str
+    pieces_root: str | pathlib.Path
+    commands: Script = ()
+    board_csv: str | pathlib.Path | None = None
+    seed: Optional[int] = None                  # seeds `random` / `np.random` before the match
+    until_ms: Optional[int] = None
+    step_ms: Optional[int] = None               # None = event stepping
+    max_ms: int = DEFAULT_MAX_MS
+
+
+@dataclass
+class MatchResult:
+    match_id: str
+    seed: Optional[int]
+    winner: Optional[str] = None
+    end_ms: int = 0
+    steps: int = 0
+    commands_applied: int = 0
+    events: int = 0
+    pieces: Dict[str, Tuple[int, int]] = field(default_factory=dict)
+    wall_s: float = 0.0
+    worker: int = 0                             # pid of the process that ran it
+    error: Optional[str] = None                 # repr of the exception if the match failed
+
+
+@dataclass
+class RunStats:
+    matches: int = 0
+    failed: int = 0
+    steps: int = 0
+    wall_s: float = 0.0
+
+    @property
+    def matches_per_s(self) -> float:
+        return self.matches / self.wall_s if self.wall_s else 0.0
+
+    @property
+    def ticks_per_s(self) -> float:
+        return self.steps / self.wall_s if self.wall_s else 0.0
+
+    def __str__(self) -> str:
+        return (f"{self.matches} matches ({self.failed} failed) in {self.wall_s:.2f}s – "
+                f"{self.matches_per_s:.1f} matches/s, {self.ticks_per_s:.0f} ticks/s")
+
+
+# ───────────────────────── worker side ─────────────────────────
+# One image factory per process, so every engine in the worker hits the same
+# PieceFactory template cache entries.
+_img_factory: Optional[MockImgFactory] = None
+_engines: Dict[tuple, SimulationEngine] = {}
+
+
+def _engine_for(spec: MatchSpec) -> SimulationEngine:
+    global _img_factory
+    if _img_factory is None:
+        _img_factory = MockImgFactory()
+    key = (str(spec.pieces_root), str(spec.board_csv), spec.step_ms, spec.max_ms)
+    engine = _engines.get(key)
+    if engine is None:
+        engine = SimulationEngine(spec.pieces_root, board_csv=spec.board_csv,
+                                  step_ms=spec.step_ms, max_ms=spec.max_ms,
+                                  img_factory=_img_factory)
+        _engines[key] = engine
+    return engine
+
+
+def _warm_worker(pieces_roots: Sequence[str]):
+    """Pool initializer: parse every piece template once, before the first match."""
+    for root in pieces_roots:
+        try:
+            _engine_for(MatchSpec("warm-up", root)).new_game()
+        except Exception:
+            # a raising initializer makes the pool respawn workers forever;
+            # the matches themselves will report the problem
+            logger.exception("Could not preload pieces from %s", root)
+
+
+def run_match(spec: MatchSpec) -> MatchResult:
+    """Play one match in this process; failures are reported, not raised."""
+    started = time.perf_counter()
+    result = MatchResult(spec.match_id, spec.seed, worker=multiprocessing.current_process().pid)
+    try:
+        if spec.seed is not None:
+            random.seed(spec.seed)
+            np.random.seed(spec.seed % 2**32)
+        commands = spec.commands(spec.seed) if callable(spec.commands) else spec.commands
+        sim = _engine_for(spec).run(commands, until_ms=spec.until_ms)
+        result.winner = sim.winner
+        result.end_ms = sim.end_ms
+        result.steps = sim.steps
+        result.commands_applied = sim.commands_applied
+        result.events = len(sim.events)
+        result.pieces = sim.pieces
+    except Exception as e:
+        logger.exception("Match %s failed", spec.match_id)
+        result.error = repr(e)
+    result.wall_s = time.perf_counter() - started
+    return result
+
+
+# ───────────────────────── driver side ─────────────────────────
+class MatchRunner:
+    """
+    Runs `MatchSpec`s on *processes* workers (default: one per core).
+
+    Each worker loads the piece assets of every ``pieces_root`` in the batch
+    once, in its initializer, and keeps them for all its matches.
+    `imap` yields results in completion order as soon as each match ends and
+    keeps the batch totals in `stats`; ``processes=0`` runs everything in the
+    calling process (handy for debugging and tests).
+
+    Workers are spawned rather than forked by default: a fork taken while
+    another thread holds a lock (logging, a render or keyboard thread) can
+    leave the child deadlocked.
+    """
+
+    def __init__(self, processes: Optional[int] = None, chunksize: int = 1,
+                 start_method: Optional[str] = "spawn"):
+        if processes is not None and processes < 0:
+            raise ValueError("processes must be >= 0 (or None for one per core)")
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1")
+        self.processes = processes
+        self.chunksize = chunksize
+        self.start_method = start_method
+        self.stats = RunStats()
+
+    def imap(self, specs: Iterable[MatchSpec]) -> Iterator[MatchResult]:
+        specs = list(specs)
+        roots = sorted({str(s.pieces_root) for s in specs})
+        self.stats = stats = RunStats()
+        started = time.perf_counter()
+
+        def account(result: MatchResult) -> MatchResult:
+            stats.matches += 1
+            stats.failed += result.error is not None
+            stats.steps += result.steps
+            stats.wall_s = time.perf_counter() - started
+            return result
+
+        if self.processes == 0:
+            _warm_worker(roots)
+            for spec in specs:
+                yield account(run_match(spec))
+        else:
+            ctx = multiprocessing.get_context(self.start_method)
+            with ctx.Pool(self.processes, initializer=_warm_worker, initargs=(roots,)) as pool:
+                for result in pool.imap_unordered(run_match, specs, chunksize=self.chunksize):
+                    yield account(result)
+        logger.info("%s", stats)
+
+    def run(self, specs: Iterable[MatchSpec]) -> Tuple[List[MatchResult], RunStats]:
+        """Run the whole batch; results come back in *specs* order (match ids should be unique)."""
+        specs = list(specs)
+        order = {s.match_id: i for i, s in enumerate(specs)}
+        results = sorted(self.imap(specs), key=lambda r: order.get(r.match_id, len(order)))
+        return results, self.stats
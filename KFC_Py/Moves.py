@@ -1,12 +1,14 @@
 # Moves.py
 from __future__ import annotations
 import pathlib
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 import logging
 
 _CAPTURE = 1  # tag flag
 _NON_CAPTURE = 0
 
+Cell = Tuple[int, int]
+
 
 class Moves:
     """
@@ -16,6 +18,8 @@ class Moves:
         dr,dc:capture       # capture move only (e.g. pawn diagonal)
     """
 
+    _table_cache: Dict[tuple, Dict[Cell, Dict[Cell, Tuple[str, Tuple[Cell, ...]]]]] = {}
+
     def __init__(self, moves_file: pathlib.Path, dims: Tuple[int, int]):
         """Load moves from a text file.
 
@@ -48,6 +52,12 @@ class Moves:
 
                 self.moves[(dr, dc)] = tag
 
+        # tables only depend on the move set and board size – share them
+        key = (frozenset(self.moves.items()), tuple(dims))
+        if key not in Moves._table_cache:
+            Moves._table_cache[key] = self._build_table()
+        self._table = Moves._table_cache[key]
+
     def _load_moves(self, fp: pathlib.Path) -> List[Tuple[int, int, int]]:
         moves: List[Tuple[int, int, int]] = []
         with open(fp, encoding="utf-8") as f:
@@ -76,83 +86,111 @@ class Moves:
 
         return dr, dc, tag
 
-    def is_dst_cell_valid(self, dr, dc, dst_pieces = None, my_color = None, dst_has_piece: bool | None = None):
-        if dst_has_piece is not None and dst_pieces is None:
-            # synthesise minimal placeholder list when a piece is present
-            Dummy = type("Dummy", (), {"id": "DX"})
-            dst_pieces = [Dummy()] if dst_has_piece else None
-            # tests don't care about colour; default if missing
-            my_color   = my_color or "W"
+    def _build_table(self) -> Dict[Cell, Dict[Cell, Tuple[str, Tuple[Cell, ...]]]]:
+        """Precompute, for every source cell, the in-bounds destinations with
+        their move tag, the intermediate cells ("ray") the move passes and
+        the same ray as a bitboard mask."""
+        rows, cols = self.dims
+        table: Dict[Cell, Dict[Cell, Tuple[str, Tuple[Cell, ...]]]] = {}
+        for r in range(rows):
+            for c in range(cols):
+                dsts = {}
+                for (dr, dc), tag in self.moves.items():
+                    dst = (r + dr, c + dc)
+                    if 0 <= dst[0] < rows and 0 <= dst[1] < cols:
+                        ray = self._ray((r, c), dr, dc)
+                        ray_mask = 0
+                        for rr, cc in ray:
+                            ray_mask |= 1 << (rr * cols + cc)
+                        dsts[dst] = (tag, ray, ray_mask)
+                table[(r, c)] = dsts
+        return table
 
-        # unknown relative move
-        if (dr, dc) not in self.moves:
-            return False
+    @staticmethod
+    def _ray(src_cell: Cell, dr: int, dc: int) -> Tuple[Cell, ...]:
+        """Cells strictly between src and src + (dr, dc)."""
+        steps = max(abs(dr), abs(dc))
+        if steps == 0:
+            return ()
+        step_r = dr / steps
+        step_c = dc / steps
+        return tuple((src_cell[0] + int(i * step_r), src_cell[1] + int(i * step_c))
+                     for i in range(1, steps))
 
-        move_tag = self.moves[(dr, dc)]
+    @staticmethod
+    def _tag_allows(move_tag: str, dst_pieces, my_color) -> bool:
         if move_tag == "":  # No tag = can both capture/non-capture
             # For pieces without specific tags, allow move to empty square
             # or capture only if there are opponent pieces (not same color)
             if dst_pieces is None:
                 return True  # Empty square - allowed
             # Check if there are any opponent pieces at destination
-            return len([p for p in dst_pieces if p.id[1] != my_color]) > 0
+            return any(p.id[1] != my_color for p in dst_pieces)
 
         if move_tag == "capture":
-            return dst_pieces is not None and len([p for p in dst_pieces if p.id[1] != my_color]) > 0
+            return dst_pieces is not None and any(p.id[1] != my_color for p in dst_pieces)
 
         if move_tag == "non_capture":
             return dst_pieces is None
 
         return False  # Invalid tag
 
+    def is_dst_cell_valid(self, dr, dc, dst_pieces = None, my_color = None, dst_has_piece: bool | None = None):
+        if dst_has_piece is not None and dst_pieces is None:
+            # synthesise minimal placeholder list when a piece is present
+            Dummy = type("Dummy", (), {"id": "DX"})
+            dst_pieces = [Dummy()] if dst_has_piece else None
+            # tests don't care about colour; default if missing
+            my_color   = my_color or "W"
+
+        # unknown relative move
+        if (dr, dc) not in self.moves:
+            return False
+
+        return self._tag_allows(self.moves[(dr, dc)], dst_pieces, my_color)
+
+    @staticmethod
+    def _tag_allows_bits(move_tag: str, dst_occupied: int, dst_capturable: int) -> bool:
+        """`_tag_allows` for bitboards: *dst_* are the destination bit or 0."""
+        if move_tag == "":
+            return not dst_occupied or bool(dst_capturable)
+        if move_tag == "capture":
+            return bool(dst_capturable)
+        if move_tag == "non_capture":
+            return not dst_occupied
+        return False
+
     def is_valid(self, src_cell, dst_cell, cell2piece, is_need_clear_path, my_color):
-        # Check board boundaries
-        if not (0 <= dst_cell[0] < self.dims[0] and 0 <= dst_cell[1] < self.dims[1]):
-            logging.debug(f"Move out of bounds: {dst_cell}")
+        # One lookup covers board bounds and the piece's move set
+        src_cell, dst_cell = tuple(src_cell), tuple(dst_cell)
+        entry = self._table.get(src_cell, {}).get(dst_cell)
+        if entry is None:
+            logging.debug("Move not in table: %s → %s", src_cell, dst_cell)
             return False
 
-        dr, dc = dst_cell[0] - src_cell[0], dst_cell[1] - src_cell[1]
-        if not self.is_dst_cell_valid(dr, dc, cell2piece.get(dst_cell), my_color):
-            logging.debug(f"Invalid destination: {src_cell} → {dst_cell}")
+        move_tag, ray, ray_mask = entry
+        bits = getattr(cell2piece, "bitboards", None)
+        if bits is not None:
+            dst_bit = bits.bit(dst_cell)
+            dst_ok = self._tag_allows_bits(move_tag, bits.occupied & dst_bit,
+                                           bits.opponents_of(my_color) & dst_bit)
+            path_blocked = bool(bits.occupied & ray_mask)
+        else:
+            dst_ok = self._tag_allows(move_tag, cell2piece.get(dst_cell), my_color)
+            path_blocked = any(cell in cell2piece for cell in ray)
+
+        if not dst_ok:
+            logging.debug("Invalid destination: %s → %s", src_cell, dst_cell)
             return False
 
-        logging.debug(f"Checking path: {src_cell} → {dst_cell}, need_clear_path={is_need_clear_path}")
-        
         # Only check path if piece needs clear path (not for knights)
-        if is_need_clear_path and not self._path_is_clear(src_cell, dst_cell, cell2piece, my_color):
-            logging.debug(f"Path not clear: {src_cell} → {dst_cell}")
+        if is_need_clear_path and path_blocked:
+            logging.debug("Path not clear: %s → %s", src_cell, dst_cell)
             return False
 
-        logging.debug(f"Move is valid: {src_cell} → {dst_cell}")
         return True
 
-    def _path_is_clear(self, src_cell, dst_cell, cell2piece_all, my_color):
+    def _path_is_clear(self, src_cell, dst_cell, cell2piece, my_color):
         """Check if there are any pieces blocking the path between src and dst."""
-        dr = dst_cell[0] - src_cell[0]
-        dc = dst_cell[1] - src_cell[1]
-        
-        # Check all pieces in the path, not just same color pieces
-        cell2piece = cell2piece_all
-
-        # Don't check the destination cell - we want to allow captures
-        # if dst_cell in cell2piece:
-        #     print(f"Path not clear at destination {dst_cell}")
-        #     return False
-
-        # Get unit vector for movement direction
-        steps = max(abs(dr), abs(dc))
-        if steps == 0:
-            return True
-            
-        step_r = dr / steps
-        step_c = dc / steps
-
-        # Check each cell along the path (excluding src and dst)
-        for i in range(1, steps):
-            r = src_cell[0] + int(i * step_r)
-            c = src_cell[1] + int(i * step_c)
-            if (r, c) in cell2piece:
-                print(f"Path not clear at {(r,c)}")
-                return False
-
-        return True
+        ray = self._ray(src_cell, dst_cell[0] - src_cell[0], dst_cell[1] - src_cell[1])
+        return not any(cell in cell2piece for cell in ray)
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from Bitboard import Bitboards, state_kind
+from Piece import Piece
+
+Cell = Tuple[int, int]
+
+
+class OccupancyIndex:
+    """
+    Incrementally maintained *cell → pieces* map.
+
+    Instead of rebuilding the whole map every loop iteration, callers tell the
+    index when a piece may have changed cell (`refresh`), was captured
+    (`remove`) or was created (`add`).  Reads are plain dict lookups and the
+    index can be passed anywhere a ``cell2piece`` dict was used before
+    (`get`, ``in``, ``[]`` and `items` behave the same way).
+
+    With *use_bitboards* the index also keeps a `Bitboards` view in sync,
+    which `Moves.is_valid` then uses instead of the dict lookups.
+    """
+
+    def __init__(self, pieces: Iterable[Piece] = (), use_bitboards: bool = False, width: int = 8):
+        self._by_cell: Dict[Cell, List[Piece]] = {}
+        self._cell_of: Dict[Piece, Cell] = {}
+        self._crowded: Set[Cell] = set()  # cells holding 2+ pieces
+        self.bitboards: Optional[Bitboards] = Bitboards(width) if use_bitboards else None
+        self._kind_of: Dict[Piece, str] = {}
+        for p in pieces:
+            self.add(p)
+
+    # ───────────────────────── dict-compatible reads ─────────────────────────
+    def get(self, cell: Cell, default=None) -> Optional[List[Piece]]:
+        return self._by_cell.get(cell, default)
+
+    def __getitem__(self, cell: Cell) -> List[Piece]:
+        # like the defaultdict it replaces, but without inserting empty cells
+        return self._by_cell.get(cell, [])
+
+    def __contains__(self, cell) -> bool:
+        return cell in self._by_cell
+
+    def __iter__(self) -> Iterator[Cell]:
+        return iter(self._by_cell)
+
+    def __len__(self) -> int:
+        return len(self._by_cell)
+
+    def items(self):
+        return self._by_cell.items()
+
+    def keys(self):
+        return self._by_cell.keys()
+
+    def values(self):
+        return self._by_cell.values()
+
+    # ───────────────────────── lookups ─────────────────────────
+    def piece_at(self, cell: Cell) -> Optional[Piece]:
+        """Return a piece standing on *cell*, or None if it is empty."""
+        plist = self._by_cell.get(cell)
+        return next(iter(plist), None) if plist else None
+
+    def cell_of(self, piece: Piece) -> Optional[Cell]:
+        return self._cell_of.get(piece)
+
+    def crowded_cells(self) -> List[Cell]:
+        """Cells currently shared by more than one piece (collision candidates)."""
+        return list(self._crowded)
+
+    # ───────────────────────── updates ─────────────────────────
+    def add(self, piece: Piece, cell: Optional[Cell] = None):
+        if piece in self._cell_of:
+            self.remove(piece)
+        cell = piece.current_cell() if cell is None else cell
+        self._cell_of[piece] = cell
+        plist = self._by_cell.setdefault(cell, [])
+        plist.append(piece)
+        if len(plist) > 1:
+            self._crowded.add(cell)
+        if self.bitboards is not None:
+            self._kind_of[piece] = state_kind(piece)
+            self.bitboards.sync_cell(cell, plist)
+
+    def remove(self, piece: Piece):
+        cell = self._cell_of.pop(piece, None)
+        if cell is None:
+            return
+        plist = self._by_cell[cell]
+        plist.remove(piece)
+        if len(plist) < 2:
+            self._crowded.discard(cell)
+        if not plist:
+            del self._by_cell[cell]
+        if self.bitboards is not None:
+            self._kind_of.pop(piece, None)
+            self.bitboards.sync_cell(cell, plist)
+
+    def refresh(self, piece: Piece) -> bool:
+        """Re-index *piece* if its cell changed; return True if it moved."""
+        cell = piece.current_cell()
+        if self._cell_of.get(piece) == cell:
+            if self.bitboards is not None:
+                kind = state_kind(piece)
+                if self._kind_of.get(piece) != kind:
+                    self._kind_of[piece] = kind
+                    self.bitboards.sync_cell(cell, self._by_cell[cell])
+            return False
+        self.add(piece, cell)
+        return True
+
+    def rebuild(self, pieces: Iterable[Piece]):
+        self.clear()
+        for p in pieces:
+            self.add(p)
+
+    def clear(self):
+        self._by_cell.clear()
+        self._cell_of.clear()
+        self._crowded.clear()
+        self._kind_of.clear()
+        if self.bitboards is not None:
+            self.bitboards.clear()
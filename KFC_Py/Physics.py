@@ -1,13 +1,16 @@
 from __future__ import annotations
 
-from typing import Tuple, Optional
+from typing import Tuple, Optional, TYPE_CHECKING
 from abc import ABC, abstractmethod
-import math, logging
+import bisect, math, logging
 
 from Command import Command
 from Board import Board
 import numpy as np
 
+if TYPE_CHECKING:
+    from PieceStore import PieceStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -48,9 +51,29 @@ class BasePhysics(ABC):  # Interface/base class
         """Return current board cell `(row, col)` derived from position."""
         return self.board.m_to_cell(self._curr_pos_m)
 
+    def position_at(self, t_ms: int) -> Tuple[float, float]:
+        """Position in metres at game time *t_ms*, without mutating state."""
+        return self._curr_pos_m
+
+    def cell_at(self, t_ms: int) -> Tuple[int, int]:
+        """Board cell `(row, col)` at game time *t_ms*, without mutating state."""
+        return self.board.m_to_cell(self.position_at(t_ms))
+
     def get_start_ms(self) -> int:
         return self._start_ms
 
+    def next_event_ms(self, now_ms: int) -> Optional[int]:
+        """Earliest game time at which `update()` changes the current cell or
+        emits a command, or None if it never will on its own.
+
+        The returned time may be <= *now_ms* when that event is overdue.
+        """
+        return None
+
+    def release(self):
+        """Free any shared resources held for this physics (e.g. on capture)."""
+        pass
+
     def can_be_captured(self) -> bool: return True
 
     def can_capture(self) -> bool:     return True
@@ -80,13 +103,16 @@ class IdlePhysics(BasePhysics):
 
 class MovePhysics(BasePhysics):
 
-    def __init__(self, board: Board, param: float = 1.0):
+    def __init__(self, board: Board, param: float = 1.0, store: Optional["PieceStore"] = None):
         super().__init__(board, param)
         self._speed_m_s = param
         if self._speed_m_s == 0:
             raise ValueError("_speed_m_s is 0")
         if self._speed_m_s < 0:
             self._speed_m_s = abs(self._speed_m_s)
+        # optional struct-of-arrays backing; the slot is claimed on first reset
+        self._store = store
+        self._slot: Optional[int] = None
 
     def reset(self, cmd: Command):
         self._start_cell = cmd.params[0]
@@ -95,21 +121,56 @@ class MovePhysics(BasePhysics):
         self._start_ms = cmd.timestamp
         start_pos = np.array(self.board.cell_to_m(self._start_cell))
         end_pos = np.array(self.board.cell_to_m(self._end_cell))
+        self._start_pos_m = start_pos
         self._movement_vector = end_pos - start_pos
         self._movement_vector_length = math.hypot(*self._movement_vector)
         self._movement_vector = self._movement_vector / self._movement_vector_length
         self._duration_s = self._movement_vector_length / self._speed_m_s
 
+        # The cell changes whenever a coordinate crosses a half-cell boundary:
+        # after (j - 0.5) / n of the path for an n-cell delta on that axis.
+        # Wake 1 ms past each crossing since round() keeps exact halves.
+        dr = abs(self._end_cell[0] - self._start_cell[0])
+        dc = abs(self._end_cell[1] - self._start_cell[1])
+        fractions = {(j - 0.5) / n for n in (dr, dc) if n for j in range(1, n + 1)}
+        fractions.add(1.0)
+        duration_ms = self._duration_s * 1000
+        self._event_ms = sorted(math.floor(self._start_ms + f * duration_ms) + 1 for f in fractions)
+
+        if self._store is not None:
+            if self._slot is None:
+                self._slot = self._store.allocate()
+            self._store.start_move(self._slot, start_pos, end_pos, self._start_ms, self._speed_m_s)
+
     def update(self, now_ms: int):
-        seconds_passed = (now_ms - self._start_ms) / 1000
-        self._curr_pos_m = np.array(
-            self.board.cell_to_m(self._start_cell)) + self._movement_vector * seconds_passed * self._speed_m_s
+        if self._store is not None:
+            self._curr_pos_m = self._store.position(self._slot, now_ms)
+            if self._store.is_finished(self._slot, now_ms):
+                self._store.stop(self._slot)
+                return Command(now_ms, None, "done", [self._end_cell])
+            return None
+
+        self._curr_pos_m = self.position_at(now_ms)
 
-        if seconds_passed >= self._duration_s:
+        if (now_ms - self._start_ms) / 1000 >= self._duration_s:
             return Command(now_ms, None, "done", [self._end_cell])
 
         return None
 
+    def position_at(self, t_ms: int) -> Tuple[float, float]:
+        # straight line at constant speed, clamped to the start/end cells
+        seconds = min(max((t_ms - self._start_ms) / 1000, 0.0), self._duration_s)
+        return self._start_pos_m + self._movement_vector * seconds * self._speed_m_s
+
+    def release(self):
+        if self._store is not None and self._slot is not None:
+            self._store.release(self._slot)
+            self._slot = None
+
+    def next_event_ms(self, now_ms: int) -> Optional[int]:
+        i = bisect.bisect_right(self._event_ms, now_ms)
+        return self._event_ms[i] if i < len(self._event_ms) else self._event_ms[-1]
+
     def get_pos_m(self):
         return self._curr_pos_m
 
@@ -134,6 +195,9 @@ class StaticTemporaryPhysics(BasePhysics):
 
         return None
 
+    def next_event_ms(self, now_ms: int) -> Optional[int]:
+        return math.ceil(self._start_ms + self.duration_s * 1000)
+
 
 class JumpPhysics(StaticTemporaryPhysics):
     def reset(self, cmd: Command):
@@ -5,8 +5,9 @@ from Physics import IdlePhysics, MovePhysics, JumpPhysics, RestPhysics, BasePhys
 class PhysicsFactory:
     """Instantiate the correct *Physics* subclass for a given state."""
 
-    def __init__(self, board: Board):
+    def __init__(self, board: Board, piece_store=None):
         self.board = board
+        self.piece_store = piece_store  # optional PieceStore backing MovePhysics
 
     def create(self, start_cell, state_name: str, cfg) -> BasePhysics:
         speed = cfg.get("speed_m_per_sec", 0.0)
@@ -25,5 +26,8 @@ class PhysicsFactory:
             duration_ms = cfg.get("duration_ms", 10000)  # Changed from 3000 to 10000
             return cls(self.board, duration_ms / 1000)  # duration in seconds
 
+        if cls is MovePhysics and self.piece_store is not None:
+            return cls(self.board, speed, store=self.piece_store)
+
         # For other physics classes param is speed/duration
         return cls(self.board, speed)
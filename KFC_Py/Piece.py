@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from Board import Board
 from Command import Command
-from typing import Callable, Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 
 class Piece:
@@ -22,12 +22,34 @@ class Piece:
     def update(self, now_ms: int):
         self.state = self.state.update(now_ms)
 
+    def next_event_ms(self, now_ms: int) -> Optional[int]:
+        """Game time at which this piece next needs `update()`; None if idle."""
+        return self.state.next_event_ms(now_ms)
+
+    def release(self):
+        """Free shared resources held by any of this piece's states (on capture or promotion)."""
+        seen, todo = set(), [self.state]
+        while todo:
+            state = todo.pop()
+            if id(state) in seen:
+                continue
+            seen.add(id(state))
+            state.physics.release()
+            todo.extend(state.transitions.values())
+
     def is_movement_blocker(self) -> bool:
         return self.state.physics.is_movement_blocker()
 
+    def sprite_at(self, now_ms: int):
+        """Return *(sprite, x_px, y_px)* for drawing this piece at *now_ms*."""
+        # query physics/animation at the frame time rather than the last tick
+        physics = self.state.physics
+        x, y = physics.board.m_to_pix(physics.position_at(now_ms))
+        self.state.graphics.update(now_ms)
+        return self.state.graphics.get_img(), x, y
+
     def draw_on_board(self, board, now_ms: int):
-        x, y = self.state.physics.get_pos_pix()
-        sprite = self.state.graphics.get_img()
+        sprite, x, y = self.sprite_at(now_ms)
         sprite.draw_on(board.img, x, y)  # <-- paste the piece
 
     # ────────────────────────────────────────────────────────────────────
@@ -1,11 +1,14 @@
 # PieceFactory.py
 from __future__ import annotations
 import csv, json, pathlib
+from collections import OrderedDict
+from dataclasses import dataclass
 from plistlib import InvalidFileException
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from Board import Board
 from Command import Command
+from Graphics import Graphics
 from GraphicsFactory import GraphicsFactory
 from Moves import Moves
 from PhysicsFactory import PhysicsFactory
@@ -13,7 +16,28 @@ from Piece import Piece
 from State import State
 
 
+@dataclass
+class _StateTemplate:
+    """Immutable, shareable parts of one state of a piece type."""
+    name: str
+    moves: Optional[Moves]
+    graphics: Graphics      # prototype – each piece gets a shallow copy
+    physics_cfg: dict
+
+
+@dataclass
+class _PieceTemplate:
+    states: Dict[str, _StateTemplate]
+    transitions: Dict[str, Dict[str, str]]  # from_state -> event -> to_state
+
+
 class PieceFactory:
+    # parsed piece types, shared by every factory in the process; least
+    # recently used first, bounded so that discarded graphics factories (part
+    # of the key) and their sprites are eventually released
+    TEMPLATE_CACHE_SIZE = 64
+    _template_cache: "OrderedDict[tuple, _PieceTemplate]" = OrderedDict()
+
     def __init__(self,
                  board: Board,
                  pieces_root,
@@ -42,12 +66,12 @@ class PieceFactory:
         return _global_trans
 
     # ──────────────────────────────────────────────────────────────
-    def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
+    def _parse_template(self, piece_dir: pathlib.Path) -> _PieceTemplate:
+        """Read everything a piece type needs from disk (done once per type)."""
         board_size = (self.board.W_cells, self.board.H_cells)
         cell_px = (self.board.cell_W_pix, self.board.cell_H_pix)
-        _global_trans = self._load_master_csv(piece_dir / "states")
 
-        states: Dict[str, State] = {}
+        states: Dict[str, _StateTemplate] = {}
 
         # There is no longer a piece-wide fall-back. Each state must provide its own
         # `moves.txt`; if it does not, the state will have *no* legal moves.
@@ -64,16 +88,48 @@ class PieceFactory:
             moves = Moves(moves_path, board_size) if moves_path.exists() else None
             graphics = self.graphics_factory.load(state_dir / "sprites",
                                                   cfg.get("graphics", {}), cell_px)
-            physics_cfg = cfg.get("physics", {})
+            states[name] = _StateTemplate(name, moves, graphics, cfg.get("physics", {}))
+
+        return _PieceTemplate(states, self._load_master_csv(piece_dir / "states"))
+
+    def _get_template(self, piece_dir: pathlib.Path) -> _PieceTemplate:
+        key = (piece_dir.resolve(),
+               (self.board.W_cells, self.board.H_cells),
+               (self.board.cell_W_pix, self.board.cell_H_pix),
+               self.graphics_factory)
+        cache = PieceFactory._template_cache
+        tmpl = cache.get(key)
+        if tmpl is None:
+            tmpl = self._parse_template(piece_dir)
+            cache[key] = tmpl
+            while len(cache) > self.TEMPLATE_CACHE_SIZE:
+                cache.popitem(last=False)
+        else:
+            cache.move_to_end(key)
+        return tmpl
+
+    @classmethod
+    def clear_template_cache(cls):
+        """Forget parsed piece types (e.g. after assets changed on disk)."""
+        cls._template_cache.clear()
+
+    def _build_state_machine(self, piece_dir: pathlib.Path) -> State:
+        tmpl = self._get_template(piece_dir)
+
+        # Moves and sprite frames are shared with every piece of this type;
+        # only physics and the animation clock are per-piece.
+        states: Dict[str, State] = {}
+        for name, st_tmpl in tmpl.states.items():
+            physics_cfg = st_tmpl.physics_cfg
             physics = self.physics_factory.create((0, 0), name, physics_cfg)
             physics.do_i_need_clear_path = physics_cfg.get("need_clear_path", True)  # Read from physics config
 
-            st = State(moves, graphics, physics)
+            st = State(st_tmpl.moves, st_tmpl.graphics.copy(), physics)
             st.name = name
             states[name] = st
 
         # apply master CSV overrides
-        for frm, ev_map in _global_trans.items():
+        for frm, ev_map in tmpl.transitions.items():
             src = states.get(frm)
             if not src:
                 continue
@@ -0,0 +1,108 @@
+"""
+Struct-of-arrays storage for piece motion.
+Keeps every moving piece's kinematics in contiguous NumPy arrays so all of
+them can be advanced with one vectorised step per tick.
+"""
+from typing import Tuple
+import logging
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class PieceStore:
+    """
+    Rows ("slots") hold the motion of one `MovePhysics` each.
+
+    `MovePhysics` objects created with a store write their start position,
+    velocity, start time and duration into a slot on `reset()` and read their
+    current position back from it in `update()`, so the per-piece objects are
+    thin views over these arrays.  `advance(now_ms)` moves every active slot
+    in a single NumPy expression.
+    """
+
+    STATE_FREE = 0
+    STATE_STATIC = 1
+    STATE_MOVING = 2
+
+    def __init__(self, capacity: int = 32):
+        capacity = max(1, capacity)
+        self.pos_m = np.zeros((capacity, 2))
+        self.start_pos_m = np.zeros((capacity, 2))
+        self.velocity_m_s = np.zeros((capacity, 2))   # unit direction * speed
+        self.speed_m_s = np.zeros(capacity)
+        self.start_ms = np.zeros(capacity)             # float: scaled game time overflows int64
+        self.duration_ms = np.zeros(capacity)
+        self.state_code = np.zeros(capacity, dtype=np.uint8)
+        self._free = list(range(capacity - 1, -1, -1))
+        self.now_ms = None  # time of the last vectorised advance
+
+    @property
+    def capacity(self) -> int:
+        return len(self.state_code)
+
+    def __len__(self) -> int:
+        return self.capacity - len(self._free)
+
+    # ───────────────────────── slot management ─────────────────────────
+    def allocate(self) -> int:
+        if not self._free:
+            self._grow()
+        slot = self._free.pop()
+        self.state_code[slot] = self.STATE_STATIC
+        return slot
+
+    def release(self, slot: int):
+        if self.state_code[slot] == self.STATE_FREE:
+            return
+        self.state_code[slot] = self.STATE_FREE
+        self._free.append(slot)
+
+    def _grow(self):
+        old = self.capacity
+        new = old * 2
+        for name in ("pos_m", "start_pos_m", "velocity_m_s", "speed_m_s",
+                     "start_ms", "duration_ms", "state_code"):
+            arr = getattr(self, name)
+            grown = np.zeros((new,) + arr.shape[1:], dtype=arr.dtype)
+            grown[:old] = arr
+            setattr(self, name, grown)
+        self._free.extend(range(new - 1, old - 1, -1))
+        logger.debug("PieceStore grown to %s slots", new)
+
+    # ───────────────────────── writes ─────────────────────────
+    def start_move(self, slot: int, start_pos_m, end_pos_m, start_ms: int, speed_m_s: float):
+        start = np.asarray(start_pos_m, dtype=float)
+        delta = np.asarray(end_pos_m, dtype=float) - start
+        length = float(np.hypot(*delta))
+        self.start_pos_m[slot] = start
+        self.pos_m[slot] = start
+        self.velocity_m_s[slot] = delta / length * speed_m_s if length else 0.0
+        self.speed_m_s[slot] = speed_m_s
+        self.start_ms[slot] = start_ms
+        self.duration_ms[slot] = length / speed_m_s * 1000
+        self.state_code[slot] = self.STATE_MOVING
+
+    def stop(self, slot: int):
+        self.state_code[slot] = self.STATE_STATIC
+
+    # ───────────────────────── simulation ─────────────────────────
+    def advance(self, now_ms: int) -> np.ndarray:
+        """Advance every moving slot to *now_ms*; return the slots that arrived."""
+        moving = self.state_code == self.STATE_MOVING
+        elapsed_ms = now_ms - self.start_ms
+        t = (np.clip(elapsed_ms, 0, self.duration_ms) / 1000)[moving, None]
+        self.pos_m[moving] = self.start_pos_m[moving] + self.velocity_m_s[moving] * t
+        self.now_ms = now_ms
+        return np.flatnonzero(moving & (elapsed_ms >= self.duration_ms))
+
+    def position(self, slot: int, now_ms: int) -> Tuple[float, float]:
+        """Position of *slot* at *now_ms*, reusing the last `advance()` if current."""
+        if self.now_ms != now_ms and self.state_code[slot] == self.STATE_MOVING:
+            t = min(max(now_ms - self.start_ms[slot], 0), self.duration_ms[slot]) / 1000
+            self.pos_m[slot] = self.start_pos_m[slot] + self.velocity_m_s[slot] * t
+        return self.pos_m[slot]
+
+    def is_finished(self, slot: int, now_ms: int) -> bool:
+        return now_ms - self.start_ms[slot] >= self.duration_ms[slot]
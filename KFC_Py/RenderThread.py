@@ -0,0 +1,134 @@
+"""
+Rendering off the simulation thread.
+The game loop publishes an immutable `FrameSnapshot` each tick; a
+`RenderThread` draws the most recent one at a capped frame rate, so a slow
+window never delays collisions or input handling.  Finished frames are
+handed back to the game loop, which alone talks to the window (OpenCV's
+HighGUI calls are not thread-safe).
+"""
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from img import Img
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class FrameSnapshot:
+    """Everything needed to draw one frame, captured on the simulation thread."""
+    seq: int
+    now_ms: int
+    sprites: Tuple[Tuple[Hashable, Img, int, int], ...]           # (key, sprite, x, y)
+    outlines: Tuple[Tuple[Hashable, int, int, int, int, tuple], ...] = ()
+    panels: Optional[Hashable] = None   # copy of the side panels' scores and move lists
+
+
+class RenderThread:
+    """
+    Draws published snapshots on a background thread.
+
+    `publish` only swaps a reference under a lock, never blocks on drawing.
+    If a snapshot is replaced before the thread picked it up it is counted
+    as dropped.  Frames are spaced at least ``1 / max_fps`` seconds apart
+    (``None`` = as fast as snapshots arrive).
+
+    Whatever *render_fn* returns (unless ``None``) is kept as the latest
+    finished frame until the simulation thread collects it with `take_frame`.
+
+    An exception raised by *render_fn* (e.g. ``KeyboardInterrupt`` when ESC
+    is pressed in the window) stops the thread and is kept in `error` for the
+    simulation loop to re-raise.
+    """
+
+    def __init__(self, render_fn: Callable[[FrameSnapshot], Any],
+                 max_fps: Optional[float] = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        if max_fps is not None and max_fps <= 0:
+            raise ValueError("max_fps must be positive (or None for uncapped)")
+        self._render_fn = render_fn
+        self.min_interval_s = 1.0 / max_fps if max_fps else 0.0
+        self._clock = clock
+        self._cond = threading.Condition()
+        self._latest: Optional[FrameSnapshot] = None
+        self._frame: Any = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self.error: Optional[BaseException] = None
+
+        # counters
+        self.published = 0
+        self.rendered = 0
+        self.dropped = 0
+
+    # ───────────────────────── simulation side ─────────────────────────
+    def publish(self, snapshot: FrameSnapshot):
+        with self._cond:
+            if self._latest is not None:
+                self.dropped += 1
+            self._latest = snapshot
+            self.published += 1
+            self._cond.notify()
+
+    def take_frame(self) -> Any:
+        """The latest finished frame, or ``None`` if none came since the last call."""
+        with self._cond:
+            frame, self._frame = self._frame, None
+            return frame
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self.error = None
+        self._latest = self._frame = None
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="render", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {"published": self.published, "rendered": self.rendered, "dropped": self.dropped}
+
+    # ───────────────────────── render side ─────────────────────────
+    def _take(self) -> Optional[FrameSnapshot]:
+        with self._cond:
+            while self._running and self._latest is None:
+                self._cond.wait()
+            snapshot, self._latest = self._latest, None
+            return snapshot if self._running else None
+
+    def _run(self):
+        last = None
+        while True:
+            if last is not None and self.min_interval_s:
+                wait = last + self.min_interval_s - self._clock()
+                if wait > 0:
+                    time.sleep(wait)
+            snapshot = self._take()
+            if snapshot is None:
+                return
+            last = self._clock()
+            try:
+                frame = self._render_fn(snapshot)
+            except BaseException as e:  # noqa: B902 – handed to the simulation thread
+                logger.debug("Render thread stopped by %r", e)
+                self.error = e
+                with self._cond:
+                    self._running = False
+                return
+            if frame is not None:
+                with self._cond:
+                    self._frame = frame
+            self.rendered += 1
@@ -0,0 +1,140 @@
+"""
+Pre-baked sprite atlas.
+Packs every ``pieces/<piece>/states/<state>/sprites/*.png`` frame, resized to
+one cell size, into a single image plus a JSON index so a game can start
+with one file open instead of hundreds.
+
+Build it once per cell size:
+
+    python SpriteAtlas.py ../pieces --cell-px 64
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import math
+import pathlib
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from img import Img
+
+logger = logging.getLogger(__name__)
+
+Rect = Tuple[int, int, int, int]  # x, y, w, h
+
+
+def atlas_paths(pieces_root: pathlib.Path, cell_px: int) -> Tuple[pathlib.Path, pathlib.Path]:
+    """Return the (pixels, index) file paths of the atlas for *cell_px*."""
+    pieces_root = pathlib.Path(pieces_root)
+    return (pieces_root / f"atlas_{cell_px}.npy",
+            pieces_root / f"atlas_{cell_px}.json")
+
+
+def build_atlas(pieces_root: str | pathlib.Path, cell_px: int) -> Tuple[pathlib.Path, pathlib.Path]:
+    """
+    Pack all piece sprites under *pieces_root* into an atlas for *cell_px*.
+
+    Frames are resized exactly like `Img.read` does (``INTER_AREA``, no
+    aspect keeping) and laid out row-major on a square-ish grid of cells.
+    The pixels are written as a raw ``.npy`` array so `SpriteAtlas.load`
+    can memory-map them; the ``.json`` index maps piece → state → [rect].
+    """
+    pieces_root = pathlib.Path(pieces_root)
+    frames: List[np.ndarray] = []
+    index: Dict[str, Dict[str, List[Rect]]] = {}
+
+    sprite_dirs = sorted(pieces_root.glob("*/states/*/sprites"))
+    for sprites_dir in sprite_dirs:
+        piece = sprites_dir.parent.parent.parent.name
+        state = sprites_dir.parent.name
+        for png in sorted(sprites_dir.glob("*.png")):
+            pix = cv2.imread(str(png), cv2.IMREAD_UNCHANGED)
+            if pix is None:
+                raise FileNotFoundError(f"Cannot load image: {png}")
+            frames.append(cv2.resize(pix, (cell_px, cell_px), interpolation=cv2.INTER_AREA))
+            index.setdefault(piece, {}).setdefault(state, []).append(len(frames) - 1)
+
+    if not frames:
+        raise ValueError(f"No sprites found under {pieces_root}")
+
+    # one channel layout for the whole sheet: promote to BGRA if any frame has alpha
+    channels = max(f.shape[2] if f.ndim == 3 else 1 for f in frames)
+    cols = math.ceil(math.sqrt(len(frames)))
+    rows = math.ceil(len(frames) / cols)
+    sheet = np.zeros((rows * cell_px, cols * cell_px, channels), dtype=np.uint8)
+    rects: List[Rect] = []
+    for i, f in enumerate(frames):
+        if f.ndim == 2:
+            f = cv2.cvtColor(f, cv2.COLOR_GRAY2BGR)
+        if f.shape[2] == 3 and channels == 4:
+            f = cv2.cvtColor(f, cv2.COLOR_BGR2BGRA)
+        x, y = (i % cols) * cell_px, (i // cols) * cell_px
+        sheet[y:y + cell_px, x:x + cell_px] = f
+        rects.append((x, y, cell_px, cell_px))
+
+    pix_path, idx_path = atlas_paths(pieces_root, cell_px)
+    np.save(pix_path, sheet)
+    idx_path.write_text(json.dumps({
+        "cell_px": cell_px,
+        "frames": {piece: {state: [rects[i] for i in ids] for state, ids in states.items()}
+                   for piece, states in index.items()},
+    }, indent=1))
+    logger.info("Packed %s sprites into %s (%sx%s)", len(frames), pix_path, sheet.shape[1], sheet.shape[0])
+    return pix_path, idx_path
+
+
+class SpriteAtlas:
+    """Frames of a pre-baked atlas, served as `Img` views into one array."""
+
+    def __init__(self, pixels: np.ndarray, frames: Dict[str, Dict[str, List[Rect]]], cell_px: int):
+        self.pixels = pixels
+        self.cell_px = cell_px
+        self._rects = frames
+        self._imgs: Dict[Tuple[str, str], List[Img]] = {}
+
+    @classmethod
+    def load(cls, pieces_root: str | pathlib.Path, cell_px: int) -> "SpriteAtlas":
+        """Memory-map the atlas for *cell_px*; raise FileNotFoundError if it was never built."""
+        pix_path, idx_path = atlas_paths(pieces_root, cell_px)
+        if not pix_path.exists() or not idx_path.exists():
+            raise FileNotFoundError(pix_path)
+        index = json.loads(idx_path.read_text())
+        pixels = np.load(pix_path, mmap_mode="r")
+        return cls(pixels, index["frames"], index["cell_px"])
+
+    @classmethod
+    def load_if_present(cls, pieces_root: str | pathlib.Path, cell_px: int) -> Optional["SpriteAtlas"]:
+        try:
+            return cls.load(pieces_root, cell_px)
+        except FileNotFoundError:
+            return None
+
+    def has(self, piece: str, state: str) -> bool:
+        return state in self._rects.get(piece, {})
+
+    def frames(self, piece: str, state: str) -> List[Img]:
+        """Return the animation frames of *piece* in *state* (shared, read-only)."""
+        key = (piece, state)
+        imgs = self._imgs.get(key)
+        if imgs is None:
+            imgs = []
+            for x, y, w, h in self._rects[piece][state]:
+                img = Img()
+                img.img = self.pixels[y:y + h, x:x + w]
+                img._prepare_blit()
+                imgs.append(img)
+            self._imgs[key] = imgs
+        return imgs
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Pack piece sprites into an atlas")
+    parser.add_argument("pieces_root", type=pathlib.Path)
+    parser.add_argument("--cell-px", type=int, default=64)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    build_atlas(args.pieces_root, args.cell_px)
@@ -74,6 +74,9 @@ class State:
         self.graphics.update(now_ms)
         return self
 
+    def next_event_ms(self, now_ms: int) -> Optional[int]:
+        return self.physics.next_event_ms(now_ms)
+
     def can_be_captured(self) -> bool:
         return self.physics.can_be_captured()
 
@@ -90,7 +90,25 @@ def run_new_comprehensive_tests() -> List[Tuple[str, bool, str, str]]:
         "test_ui_system.py", 
         "test_sound_system.py",
         "test_smart_cursor_and_advanced.py",
-        "test_complete_integration.py"
+        "test_complete_integration.py",
+        "test_tick_scheduler.py",
+        "test_event_driven_sim.py",
+        "test_occupancy_index.py",
+        "test_piece_store.py",
+        "test_bitboard.py",
+        "test_sprite_cache.py",
+        "test_sprite_atlas.py",
+        "test_dirty_rect_renderer.py",
+        "test_render_thread.py",
+        "test_simulation_engine.py",
+        "test_clock.py",
+        "test_match_runner.py",
+        "test_server_match.py",
+        "test_state_delta.py",
+        "test_client_outbox.py",
+        "test_server_rooms.py",
+        "test_server_shards.py",
+        "test_wire_codec.py"
     ]
     
     results = []
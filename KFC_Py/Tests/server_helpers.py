@@ -0,0 +1,47 @@
+"""
+Helpers shared by the server tests: the pieces directory, fake websockets
+and client message builders.
+"""
+import asyncio, json, pathlib
+
+from shared_types import ClientMessage
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+class FakeSocket:
+    """Records sent frames as-is; while `gate` is clear every send blocks (a stuck client)."""
+
+    def __init__(self, blocked=False):
+        self.sent = []
+        self.gate = asyncio.Event()
+        if not blocked:
+            self.gate.set()
+        self.close_code = None
+
+    async def send(self, message):
+        await self.gate.wait()
+        self.sent.append(self.decode(message))
+
+    def decode(self, message):
+        return message
+
+    async def close(self, code=1000):
+        self.close_code = code
+
+
+class JsonSocket(FakeSocket):
+    """A `FakeSocket` that records every frame parsed from JSON."""
+
+    def decode(self, message):
+        return json.loads(message)
+
+
+def move_data(piece_id, src, dst):
+    """The data of a MOVE message for *piece_id* from *src* to *dst*."""
+    return {"piece_id": piece_id, "type": "move", "params": [list(src), list(dst)]}
+
+
+def client_text(msg_type, data=None):
+    """A client message of *msg_type* as the JSON text a websocket carries."""
+    return json.dumps(ClientMessage(msg_type, "p", data).to_dict())
@@ -0,0 +1,93 @@
+import pathlib, random, time
+
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from Physics import IdlePhysics
+from State import State
+from Piece import Piece
+from Moves import Moves
+from OccupancyIndex import OccupancyIndex
+from GraphicsFactory import MockImgFactory
+from GameFactory import create_game
+from mock_img import MockImg
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def _piece(pid, cell, state_name="idle"):
+    board = Board(1, 1, 8, 8, MockImg())
+    st = State(None, None, IdlePhysics(board))
+    st.name = state_name
+    st.physics.reset(Command(0, pid, "idle", [cell]))
+    return Piece(pid, st)
+
+
+def test_bitboards_track_colour_and_state():
+    idx = OccupancyIndex([_piece("PW_a", (6, 0)), _piece("PB_b", (1, 0), "move"),
+                          _piece("RB_c", (0, 0), "long_rest")], use_bitboards=True)
+    bb = idx.bitboards
+    assert bb.white == bb.bit((6, 0))
+    assert bb.black == bb.bit((1, 0)) | bb.bit((0, 0))
+    assert bb.moving == bb.bit((1, 0))
+    assert bb.resting == bb.bit((0, 0))
+
+    pb = idx.piece_at((1, 0))
+    idx.remove(pb)
+    assert bb.black == bb.bit((0, 0)) and bb.moving == 0
+
+
+def test_bitboard_validation_matches_dict_path():
+    rng = random.Random(7)
+    all_cells = [(r, c) for r in range(8) for c in range(8)]
+    movesets = {code: Moves(PIECES_ROOT / code / "states" / "idle" / "moves.txt", (8, 8))
+                for code in ("QW", "NW", "PW", "PB", "KW")}
+
+    for _ in range(20):
+        cells = rng.sample(all_cells, 16)
+        pieces = [_piece(f"P{'W' if i % 2 else 'B'}_{i}", cell) for i, cell in enumerate(cells)]
+        plain = OccupancyIndex(pieces)
+        bits = OccupancyIndex(pieces, use_bitboards=True)
+
+        for moves in movesets.values():
+            for src in cells[:4]:
+                for dst in all_cells:
+                    for color in ("W", "B"):
+                        for clear in (True, False):
+                            assert (moves.is_valid(src, dst, plain, clear, color)
+                                    == moves.is_valid(src, dst, bits, clear, color)), (src, dst, color)
+
+
+def test_crowded_cell_matches_dict_path():
+    # mid-collision a cell can hold both colours; either side may capture there
+    pieces = [_piece("PW_a", (4, 4)), _piece("PB_b", (4, 4)), _piece("QW_q", (4, 0)),
+              _piece("QB_q", (0, 4))]
+    plain = OccupancyIndex(pieces)
+    bits = OccupancyIndex(pieces, use_bitboards=True)
+    queen = Moves(PIECES_ROOT / "QW" / "states" / "idle" / "moves.txt", (8, 8))
+    for src, color in (((4, 0), "W"), ((0, 4), "B")):
+        assert queen.is_valid(src, (4, 4), plain, True, color)
+        assert queen.is_valid(src, (4, 4), bits, True, color)
+
+
+def test_game_runs_with_bitboards():
+    clock = ManualClock()
+    game = create_game(PIECES_ROOT, MockImgFactory(), use_bitboards=True, clock=clock)
+    assert game.pos.bitboards is not None
+    game._update_cell2piece_map()
+    rook = game.pos[(7, 0)][0]
+
+    # blocked by own pawn
+    game.user_input_queue.put(Command(clock.now_ms(), rook.id, "move", [(7, 0), (5, 0)]))
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    clock.advance(60_000)
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    assert rook.current_cell() == (7, 0)
+
+    knight = game.pos[(7, 1)][0]
+    game.user_input_queue.put(Command(clock.now_ms(), knight.id, "move", [(7, 1), (5, 2)]))
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    clock.advance(60_000)
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    assert knight.current_cell() == (5, 2)
+    assert game.pos.bitboards.white & game.pos.bitboards.bit((5, 2))
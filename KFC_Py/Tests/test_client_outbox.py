@@ -0,0 +1,143 @@
+import asyncio, json
+
+import pytest
+
+from client_outbox import ClientOutbox
+from server import ChessServer
+from shared_types import ClientMessage
+from state_delta import StateDeltaDecoder
+
+from .server_helpers import PIECES_ROOT, FakeSocket
+
+
+def test_messages_arrive_in_order():
+    async def scenario():
+        ws = FakeSocket()
+        outbox = ClientOutbox(ws)
+        outbox.start()
+        for i in range(5):
+            outbox.send(str(i))
+        await outbox.drain()
+        return ws, outbox
+    ws, outbox = asyncio.run(scenario())
+    assert ws.sent == ["0", "1", "2", "3", "4"]
+    assert outbox.sent == 5 and outbox.dropped == 0
+
+
+def test_slow_client_does_not_block_fast_one():
+    async def scenario():
+        fast, slow = FakeSocket(), FakeSocket(blocked=True)
+        outboxes = [ClientOutbox(fast), ClientOutbox(slow)]
+        for o in outboxes:
+            o.start()
+            o.send_update("u1", lambda: "K")
+        await asyncio.wait_for(outboxes[0].drain(), 1.0)
+        return fast, slow
+    fast, slow = asyncio.run(scenario())
+    assert fast.sent == ["u1"]
+    assert slow.sent == []
+
+
+def test_laggard_updates_are_coalesced_into_a_keyframe():
+    async def scenario():
+        ws = FakeSocket(blocked=True)
+        outbox = ClientOutbox(ws, max_queue=4, max_backlog=8)
+        outbox.start()
+        await asyncio.sleep(0)
+        outbox.send("reply")
+        for i in range(6):
+            outbox.send_update(f"u{i}", lambda: "KEY")
+        ws.gate.set()
+        await outbox.drain()
+        return ws, outbox
+    ws, outbox = asyncio.run(scenario())
+    # replies survive, stale updates collapse into one keyframe
+    assert ws.sent[0] == "reply"
+    assert "KEY" in ws.sent
+    assert ws.sent[-1] == "u5"
+    assert outbox.coalesced == 1 and outbox.dropped == 4
+
+
+def test_laggard_updates_are_just_dropped_without_a_keyframe():
+    async def scenario():
+        ws = FakeSocket(blocked=True)
+        outbox = ClientOutbox(ws, max_queue=4, max_backlog=8)
+        outbox.start()
+        await asyncio.sleep(0)
+        for i in range(6):
+            outbox.send_update(f"u{i}", lambda: None)
+        ws.gate.set()
+        await outbox.drain()
+        return ws, outbox
+    ws, outbox = asyncio.run(scenario())
+    assert ws.sent == ["u5"]
+    assert outbox.dropped == 5 and not outbox.closed
+
+
+def test_backlog_over_threshold_disconnects():
+    closed = []
+
+    async def scenario():
+        ws = FakeSocket(blocked=True)
+        outbox = ClientOutbox(ws, on_close=closed.append, max_queue=2, max_backlog=3)
+        outbox.start()
+        for i in range(5):
+            outbox.send(f"reply{i}")   # not droppable
+        await asyncio.sleep(0)
+        return ws, outbox
+    ws, outbox = asyncio.run(scenario())
+    assert outbox.closed and closed == [outbox]
+    assert ws.close_code == 1013
+
+
+def test_send_timeout_disconnects():
+    async def scenario():
+        ws = FakeSocket(blocked=True)
+        outbox = ClientOutbox(ws, send_timeout_s=0.01)
+        outbox.start()
+        outbox.send("x")
+        await asyncio.sleep(0.1)
+        return ws, outbox
+    ws, outbox = asyncio.run(scenario())
+    assert outbox.closed and ws.close_code == 1013
+
+
+def test_normal_close_uses_code_1000():
+    async def scenario():
+        ws = FakeSocket()
+        outbox = ClientOutbox(ws)
+        outbox.start()
+        outbox.close()
+        await asyncio.sleep(0)
+        return ws
+    assert asyncio.run(scenario()).close_code == 1000
+
+
+def test_invalid_limits():
+    with pytest.raises(ValueError):
+        ClientOutbox(FakeSocket(), max_queue=8, max_backlog=4)
+
+
+def test_stuck_client_is_dropped_and_others_stay_in_sync():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+
+    async def scenario():
+        good, stuck = FakeSocket(), FakeSocket(blocked=True)
+        server.connect("good", good)
+        server.connect("stuck", stuck).send_timeout_s = 0.05
+        server.handle_message(ClientMessage("move", "p", {
+            "piece_id": "PW_(6, 4)", "type": "move", "params": [[6, 4], [4, 4]]}), "good")
+        for t in range(50, 3_000, 50):
+            if server.tick(t):
+                await asyncio.sleep(0.005)
+        await asyncio.sleep(0.06)
+        await server.clients["good"].drain()
+        return good
+
+    good = asyncio.run(scenario())
+    decoder = StateDeltaDecoder()
+    for text in good.sent:
+        assert decoder.apply(json.loads(text)) is not None
+    assert decoder.state.pieces["PW_(6, 4)"]["position"] == [4, 4]
+    assert list(server.clients) == ["good"]
+    assert list(server.rooms["default"].members) == ["good"]
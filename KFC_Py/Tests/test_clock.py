@@ -0,0 +1,124 @@
+import pathlib, queue, time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from Clock import Clock, ManualClock, RealClock, ScaledClock
+from Command import Command
+from GameEventPublisher import GameEventPublisher
+from GameFactory import create_game
+from GraphicsFactory import MockImgFactory
+from KeyboardInput import KeyboardProcessor, KeyboardProducer
+from MessageBroker import MessageBroker
+from EventType import EventType
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+# ---------------------------------------------------------------------------
+#                          CLOCKS
+# ---------------------------------------------------------------------------
+
+
+def test_scaled_clock_scales_elapsed_time():
+    with patch("time.monotonic_ns", return_value=1_000_000_000):
+        clock = ScaledClock(factor=3)
+    with patch("time.monotonic_ns", return_value=1_500_000_000):
+        assert clock.now_ms() == 1500
+    assert RealClock().factor == 1
+
+
+def test_clock_is_abstract():
+    class NoSleep(Clock):
+        def now_ms(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        Clock()
+    with pytest.raises(TypeError):
+        NoSleep()
+
+
+def test_manual_clock_only_moves_when_told():
+    clock = ManualClock(start_ms=10)
+    assert clock.now_ms() == 10
+    clock.advance(5)
+    clock.sleep_ms(20)
+    assert clock.now_ms() == 35
+    clock.set(100)
+    assert clock.now_ms() == 100
+    assert clock.wall_time() == pytest.approx(0.1)
+    with pytest.raises(ValueError):
+        clock.set(99)
+    with pytest.raises(ValueError):
+        clock.advance(-1)
+
+
+# ---------------------------------------------------------------------------
+#                          GAME / INPUT / EVENTS
+# ---------------------------------------------------------------------------
+
+
+def test_game_default_clock_keeps_time_factor():
+    game = create_game(PIECES_ROOT, MockImgFactory())
+    assert isinstance(game.clock, ScaledClock)
+    game._time_factor = 7
+    assert game.clock.factor == 7
+
+
+def test_manual_clock_game_has_no_time_factor():
+    game = create_game(PIECES_ROOT, MockImgFactory(), clock=ManualClock())
+    assert game._time_factor == 1
+    with pytest.raises(AttributeError):
+        game._time_factor = 2
+
+
+def test_manual_clock_jumps_to_move_completion():
+    clock = ManualClock()
+    game = create_game(PIECES_ROOT, MockImgFactory(), clock=clock)
+    game._update_cell2piece_map()
+    pw = game.pos[(6, 0)][0]
+
+    started = time.perf_counter()
+    game.user_input_queue.put(Command(0, pw.id, "move", [(6, 0), (4, 0)]))
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    clock.advance(60_000)
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+
+    assert pw.current_cell() == (4, 0)
+    assert time.perf_counter() - started < 1.0
+
+
+def test_keyboard_double_click_uses_game_clock():
+    clock = ManualClock(start_ms=5_000)
+    game = Mock(clock=clock)
+    game.game_time_ms.side_effect = clock.now_ms
+    piece = Mock(id="QW_(0, 0)")
+    piece.current_cell.return_value = (0, 0)
+    game.pos.piece_at.return_value = piece
+
+    proc = KeyboardProcessor(8, 8, {"enter": "select"})
+    q = queue.Queue()
+    producer = KeyboardProducer(game, q, proc, player=1)
+    enter = Mock(event_type="down")
+    enter.name = "enter"
+
+    producer._on_event(enter)          # select
+    clock.advance(200)
+    producer._on_event(enter)          # second press 200 ms later → jump
+    cmd = q.get_nowait()
+    assert cmd.type == "jump" and cmd.timestamp == 5_200
+
+    producer._on_event(enter)          # select again
+    clock.advance(600)
+    producer._on_event(enter)          # too slow for a double-click
+    assert all(cmd.type != "jump" for cmd in q.queue)
+
+
+def test_publisher_timestamps_come_from_clock():
+    clock = ManualClock(start_ms=2_500)
+    broker = MessageBroker()
+    seen = []
+    broker.subscribe(EventType.GAME_ENDED, lambda _t, data: seen.append(data.timestamp))
+    GameEventPublisher(broker, clock=clock).publish_game_ended("W", "test")
+    assert seen == [2.5]
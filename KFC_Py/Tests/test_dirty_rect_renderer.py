@@ -0,0 +1,101 @@
+import numpy as np
+
+from Board import Board
+from DirtyRectRenderer import DirtyRectRenderer
+from img import Img
+from mock_img import MockImg
+
+
+def _img(h, w, value, alpha=None):
+    img = Img()
+    img.img = np.full((h, w, 3 if alpha is None else 4), value, dtype=np.uint8)
+    if alpha is not None:
+        img.img[..., 3] = alpha
+    return img
+
+
+class FakePiece:
+    def __init__(self, sprite, x, y):
+        self.sprite, self.x, self.y = sprite, x, y
+
+    def sprite_at(self, now_ms):
+        return self.sprite, self.x, self.y
+
+
+def _board():
+    bg = Img()
+    bg.img = np.random.default_rng(1).integers(0, 256, (64, 64, 4), dtype=np.uint8)
+    return Board(16, 16, 4, 4, bg)
+
+
+def _full(board, pieces, outlines):
+    # what cloning the board and drawing everything produces
+    frame = board.clone()
+    for p in pieces:
+        p.sprite.draw_on(frame.img, p.x, p.y)
+    for _, x1, y1, x2, y2, color in outlines:
+        frame.img.draw_rect(x1, y1, x2, y2, color)
+    return frame.img.img
+
+
+def test_incremental_frames_match_full_redraw():
+    board = _board()
+    r = DirtyRectRenderer(board)
+    a = FakePiece(_img(16, 16, 200), 0, 0)
+    b = FakePiece(_img(16, 16, 90, alpha=128), 16, 0)
+    c = FakePiece(_img(16, 16, 30), 32, 32)
+    pieces = [a, b, c]
+    cursor = [(("cursor", 1), 0, 48, 15, 63, (0, 255, 0))]
+
+    frames = []
+    frames.append(list(pieces))
+    a.x = 8                                   # slides under the translucent b
+    frames.append(list(pieces))
+    b.sprite = _img(16, 16, 10, alpha=60)     # animation frame advances
+    frames.append(list(pieces))
+    pieces.remove(c)                          # captured
+    frames.append(list(pieces))
+
+    for scene in frames:
+        out = r.render(scene, 0, cursor).img.img
+        assert np.array_equal(out, _full(board, scene, cursor))
+
+    cursor = [(("cursor", 1), 16, 48, 31, 63, (0, 0, 255))]
+    out = r.render(pieces, 0, cursor).img.img
+    assert np.array_equal(out, _full(board, pieces, cursor))
+    assert r.full_redraws == 1
+
+
+def test_idle_frame_draws_nothing():
+    board = _board()
+    r = DirtyRectRenderer(board)
+    pieces = [FakePiece(_img(16, 16, 200), 0, 0)]
+    first = r.render(pieces, 0)
+    drawn = r.items_drawn
+    assert r.render(pieces, 1) is first
+    assert r.items_drawn == drawn
+
+
+def test_large_change_falls_back_to_full_redraw():
+    board = _board()
+    r = DirtyRectRenderer(board, full_redraw_fraction=0.1)
+    pieces = [FakePiece(_img(16, 16, 200), 16 * i, 0) for i in range(4)]
+    r.render(pieces, 0)
+    for p in pieces:
+        p.y = 32
+    out = r.render(pieces, 0).img.img
+    assert r.full_redraws == 2
+    assert np.array_equal(out, _full(board, pieces, []))
+
+
+def test_mock_board_uses_clone_and_draw_on_board():
+    board = Board(16, 16, 4, 4, MockImg())
+    calls = []
+
+    class P:
+        def draw_on_board(self, b, now_ms):
+            calls.append(now_ms)
+
+    r = DirtyRectRenderer(board)
+    r.render([P(), P()], 7)
+    assert calls == [7, 7]
@@ -0,0 +1,94 @@
+import pathlib
+
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from Physics import IdlePhysics, MovePhysics, RestPhysics
+from GraphicsFactory import MockImgFactory
+from GameFactory import create_game
+from mock_img import MockImg
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def _board():
+    return Board(1, 1, 8, 8, MockImg())
+
+
+# ---------------------------------------------------------------------------
+#                          PHYSICS DEADLINES
+# ---------------------------------------------------------------------------
+
+
+def test_idle_has_no_deadline():
+    phys = IdlePhysics(_board())
+    phys.reset(Command(0, "P", "idle", [(3, 3)]))
+    assert phys.next_event_ms(0) is None
+
+
+def test_rest_deadline_is_end_of_duration():
+    phys = RestPhysics(_board(), param=1.5)
+    phys.reset(Command(200, "P", "long_rest", [(3, 3)]))
+    assert phys.next_event_ms(0) == 1700
+    assert phys.next_event_ms(5000) == 1700     # overdue deadline is still reported
+
+
+def test_move_deadlines_follow_cell_changes():
+    phys = MovePhysics(_board(), param=1.0)      # 1 cell per second
+    phys.reset(Command(0, "P", "move", [(0, 0), (0, 3)]))
+
+    # cell changes just past 0.5, 1.5, 2.5 cells, arrival at 3 cells
+    assert phys.next_event_ms(0) == 501
+    assert phys.next_event_ms(501) == 1501
+    assert phys.next_event_ms(2600) == 3001
+    assert phys.next_event_ms(9999) == 3001
+
+    phys.update(500)
+    assert phys.get_curr_cell() == (0, 0)
+    phys.update(501)
+    assert phys.get_curr_cell() == (0, 1)
+    assert phys.update(3001).type == "done"
+
+
+# ---------------------------------------------------------------------------
+#                          GAME LOOP
+# ---------------------------------------------------------------------------
+
+
+def _event_game():
+    game = create_game(PIECES_ROOT, MockImgFactory(), clock=ManualClock())
+    game.event_driven = True
+    return game
+
+
+def test_idle_pieces_are_not_advanced():
+    game = _event_game()
+    calls = []
+    for p in game.pieces:
+        p.update = lambda now, p=p: calls.append(p.id)
+
+    game._run_game_loop(num_iterations=20, is_with_graphics=False)
+    assert calls == []
+
+
+def test_event_driven_move_and_capture():
+    game = _event_game()
+    game._update_cell2piece_map()
+    pw = game.pos[(6, 0)][0]
+    pb = game.pos[(1, 1)][0]
+
+    game.user_input_queue.put(Command(game.game_time_ms(), pw.id, "move", [(6, 0), (4, 0)]))
+    game.user_input_queue.put(Command(game.game_time_ms(), pb.id, "move", [(1, 1), (3, 1)]))
+    game.clock.advance(100_000)
+    game._run_game_loop(num_iterations=100, is_with_graphics=False)
+    assert pw.current_cell() == (4, 0)
+    assert pb.current_cell() == (3, 1)
+
+    game.clock.advance(100_000)
+    game._run_game_loop(num_iterations=100, is_with_graphics=False)
+    game.user_input_queue.put(Command(game.game_time_ms(), pw.id, "move", [(4, 0), (3, 1)]))
+    game.clock.advance(100_000)
+    game._run_game_loop(num_iterations=100, is_with_graphics=False)
+    assert pw.current_cell() == (3, 1)
+    assert pb not in game.pieces
+    assert pb not in game._wakeup_due
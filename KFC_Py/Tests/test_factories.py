@@ -73,4 +73,49 @@ def test_piece_factory_generates_all_pieces():
             if i >= board.W_cells:
                 i = 0
                 j += 1
-    assert len(piece_ids) == num_pieces_created
\ No newline at end of file
+    assert len(piece_ids) == num_pieces_created
+
+def test_piece_factory_shares_parsed_templates():
+    PieceFactory.clear_template_cache()
+    loads = []
+
+    class CountingImgFactory(MockImgFactory):
+        def __call__(self, *args, **kwargs):
+            loads.append(args[0])
+            return super().__call__(*args, **kwargs)
+
+    board = _board()
+    gfx_factory = GraphicsFactory(CountingImgFactory())
+    p_factory = PieceFactory(board, pieces_root=PIECES_DIR, graphics_factory=gfx_factory)
+
+    a = p_factory.create_piece("PW", (6, 0))
+    loads_for_first = len(loads)
+    b = p_factory.create_piece("PW", (6, 1))
+    assert len(loads) == loads_for_first          # no sprite re-read for the 2nd pawn
+
+    # a new factory for the same board/graphics reuses the cache too (promotion path)
+    PieceFactory(board, pieces_root=PIECES_DIR, graphics_factory=gfx_factory).create_piece("PW", (6, 2))
+    assert len(loads) == loads_for_first
+
+    # immutable parts are shared, mutable per-piece state is not
+    assert a.state.moves is b.state.moves
+    assert a.state.graphics.frames is b.state.graphics.frames
+    assert a.state.graphics is not b.state.graphics
+    assert a.state.physics is not b.state.physics
+    assert a.state.transitions["move"] is not b.state.transitions["move"]
+    assert a.current_cell() == (6, 0) and b.current_cell() == (6, 1)
+
+
+def test_template_cache_is_bounded(monkeypatch):
+    PieceFactory.clear_template_cache()
+    monkeypatch.setattr(PieceFactory, "TEMPLATE_CACHE_SIZE", 2)
+    board = _board()
+    first = PieceFactory(board, PIECES_DIR, graphics_factory=GraphicsFactory(MockImgFactory()))
+    first.create_piece("PW", (6, 0))
+    for _ in range(3):  # e.g. one game per graphics factory
+        PieceFactory(board, PIECES_DIR, graphics_factory=GraphicsFactory(MockImgFactory())) \
+            .create_piece("PW", (6, 0))
+
+    assert len(PieceFactory._template_cache) == 2
+    assert all(key[-1] is not first.graphics_factory for key in PieceFactory._template_cache)
+    PieceFactory.clear_template_cache()
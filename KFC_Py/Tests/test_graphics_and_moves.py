@@ -123,3 +123,22 @@ def test_moves_board_bounds():
         assert not mv.is_valid((7, 4), (8, 4), {}, True, "X")
         assert not mv.is_valid((4, 0), (4, -1), {}, True, "X")
         assert not mv.is_valid((4, 7), (4, 8), {}, True, "X")
+
+
+def test_move_table_matches_path_walk():
+    """Table lookups agree with walking the path cell by cell."""
+    mv = Moves(PIECES_ROOT / "QW" / "states" / "idle" / "moves.txt", dims=(8, 8))
+    blocker = SimpleNamespace(id="PB")
+    occupied = {(3, 3): [blocker], (5, 1): [blocker]}
+
+    for src in [(0, 0), (3, 0), (7, 7), (5, 5)]:
+        for (dr, dc), tag in mv.moves.items():
+            dst = (src[0] + dr, src[1] + dc)
+            in_bounds = 0 <= dst[0] < 8 and 0 <= dst[1] < 8
+            expected = (in_bounds
+                        and mv.is_dst_cell_valid(dr, dc, occupied.get(dst), "W")
+                        and mv._path_is_clear(src, dst, occupied, "W"))
+            assert mv.is_valid(src, dst, occupied, True, "W") == expected
+
+    assert not mv.is_valid((0, 0), (4, 4), occupied, True, "W")   # blocked at (3, 3)
+    assert mv.is_valid((0, 0), (3, 3), occupied, True, "W")       # capture the blocker
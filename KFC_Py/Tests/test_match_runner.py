@@ -0,0 +1,74 @@
+import pathlib
+
+import pytest
+
+from Command import Command
+from MatchRunner import MatchRunner, MatchSpec, run_match
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+ROOK_VS_KING = "RW,,,,KB,,,\n" + ",,,,,,,\n" * 6 + ",,,,KW,,,\n"
+
+
+def opening_script(seed):
+    # module level so it pickles into the workers
+    col = seed % 8
+    return [Command(0, f"PW_(6, {col})", "move", [(6, col), (4, col)])]
+
+
+def _specs(tmp_path, n):
+    csv = tmp_path / "board.csv"
+    csv.write_text(ROOK_VS_KING)
+    specs = []
+    for i in range(n):
+        if i % 2:
+            specs.append(MatchSpec(f"m{i}", PIECES_ROOT, commands=opening_script, seed=i))
+        else:
+            specs.append(MatchSpec(f"m{i}", PIECES_ROOT, board_csv=csv,
+                                   commands=[Command(0, "RW_(0, 0)", "move", [(0, 0), (0, 4)])]))
+    return specs
+
+
+def test_run_match_reports_failures_instead_of_raising():
+    result = run_match(MatchSpec("bad", PIECES_ROOT / "missing"))
+    assert result.error is not None
+    assert result.steps == 0
+
+
+def test_in_process_batch(tmp_path):
+    runner = MatchRunner(processes=0)
+    results, stats = runner.run(_specs(tmp_path, 4))
+
+    assert [r.match_id for r in results] == ["m0", "m1", "m2", "m3"]
+    assert all(r.error is None for r in results)
+    assert results[0].winner == "W"
+    assert results[1].pieces["PW_(6, 1)"] == (4, 1)
+    assert results[3].pieces["PW_(6, 3)"] == (4, 3)
+    assert stats.matches == 4 and stats.failed == 0
+    assert stats.steps == sum(r.steps for r in results)
+    assert stats.matches_per_s > 0 and stats.ticks_per_s > 0
+
+
+def test_pool_batch_matches_in_process_results(tmp_path):
+    specs = _specs(tmp_path, 6)
+    local, _ = MatchRunner(processes=0).run(specs)
+
+    streamed = list(MatchRunner(processes=2, chunksize=2).imap(specs))
+    assert sorted(r.match_id for r in streamed) == [s.match_id for s in specs]
+
+    pooled = {r.match_id: r for r in streamed}
+    for r in local:
+        assert (pooled[r.match_id].winner, pooled[r.match_id].pieces, pooled[r.match_id].steps) == \
+               (r.winner, r.pieces, r.steps)
+
+
+def test_bad_spec_does_not_break_the_pool(tmp_path):
+    specs = _specs(tmp_path, 2) + [MatchSpec("bad", PIECES_ROOT / "missing")]
+    results, stats = MatchRunner(processes=2).run(specs)
+    assert [r.error is None for r in results] == [True, True, False]
+    assert stats.failed == 1
+
+
+def test_invalid_pool_size():
+    with pytest.raises(ValueError):
+        MatchRunner(processes=-1)
@@ -39,6 +39,39 @@ def test_img_draw_and_rectangle():
     dst.draw_rect(0, 0, 3, 3, (255, 0, 0))
 
 
+def _reference_blend(src, dst):
+    # the per-channel float blend draw_on used before premultiplication
+    mask = src[..., 3] / 255.0
+    out = dst.copy()
+    for c in range(3):
+        out[..., c] = (1 - mask) * dst[..., c] + mask * src[..., c]
+    return out
+
+
+def test_img_premultiplied_blend_matches_float_blend():
+    rng = np.random.default_rng(0)
+    src, dst = Img(), Img()
+    src.img = rng.integers(0, 256, (8, 8, 4), dtype=np.uint8)
+    dst.img = rng.integers(0, 256, (8, 8, 4), dtype=np.uint8)
+    before = src.img
+    expected = _reference_blend(src.img, dst.img)
+
+    src.draw_on(dst, 0, 0)
+    diff = np.abs(dst.img.astype(int) - expected.astype(int))
+    assert diff.max() <= 1
+    assert src.img is before                     # the sprite is not converted in place
+    assert np.array_equal(dst.img[..., 3], expected[..., 3])
+
+
+def test_img_opaque_sprite_is_copied():
+    src, dst = Img(), _blank_img(4, 4)
+    src.img = np.full((2, 2, 3), 200, dtype=np.uint8)
+    assert src.opaque
+    src.draw_on(dst, 1, 1)
+    assert (dst.img[1:3, 1:3, :3] == 200).all()
+    assert src.img.shape == (2, 2, 3)
+
+
 # ---------------------------------------------------------------------------
 #                                   MOVES
 # ---------------------------------------------------------------------------
@@ -0,0 +1,72 @@
+import pathlib, time
+
+from Board import Board
+from Command import Command
+from Physics import IdlePhysics
+from State import State
+from Piece import Piece
+from OccupancyIndex import OccupancyIndex
+from Moves import Moves
+from GraphicsFactory import MockImgFactory
+from GameFactory import create_game
+from mock_img import MockImg
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def _piece(pid, cell):
+    board = Board(1, 1, 8, 8, MockImg())
+    st = State(None, None, IdlePhysics(board))
+    st.physics.reset(Command(0, pid, "idle", [cell]))
+    return Piece(pid, st)
+
+
+def test_lookup_and_dict_compatibility():
+    a, b = _piece("RW_a", (0, 0)), _piece("RB_b", (3, 3))
+    idx = OccupancyIndex([a, b])
+
+    assert idx.piece_at((0, 0)) is a
+    assert idx.piece_at((5, 5)) is None
+    assert idx.get((5, 5)) is None
+    assert (3, 3) in idx and (5, 5) not in idx
+    assert idx[(5, 5)] == [] and (5, 5) not in idx   # no empty cells inserted
+    assert idx.cell_of(b) == (3, 3)
+
+
+def test_refresh_moves_piece_and_tracks_crowded_cells():
+    a, b = _piece("RW_a", (0, 0)), _piece("RB_b", (0, 3))
+    idx = OccupancyIndex([a, b])
+    assert idx.crowded_cells() == []
+
+    a.state.physics.reset(Command(0, a.id, "idle", [(0, 3)]))
+    assert idx.refresh(a) is True
+    assert idx.refresh(a) is False
+    assert (0, 0) not in idx
+    assert idx.crowded_cells() == [(0, 3)]
+
+    idx.remove(b)
+    assert idx.crowded_cells() == []
+    assert idx[(0, 3)] == [a]
+
+
+def test_moves_is_valid_accepts_index():
+    moves_file = PIECES_ROOT / "RW" / "states" / "idle" / "moves.txt"
+    moves = Moves(moves_file, (8, 8))
+    idx = OccupancyIndex([_piece("PW_x", (0, 2)), _piece("PB_y", (0, 5))])
+
+    assert not moves.is_valid((0, 0), (0, 4), idx, True, "W")   # blocked at (0, 2)
+    assert moves.is_valid((0, 3), (0, 5), idx, True, "W")       # capture
+    assert not moves.is_valid((0, 3), (0, 2), idx, True, "W")   # own piece
+
+
+def test_game_index_matches_full_rebuild():
+    game = create_game(PIECES_ROOT, MockImgFactory())
+    game._time_factor = 1_000_000_000
+    pw = game.pos[(6, 4)][0]
+    game.user_input_queue.put(Command(game.game_time_ms(), pw.id, "move", [(6, 4), (4, 4)]))
+    time.sleep(0.1)
+    game._run_game_loop(num_iterations=50, is_with_graphics=False)
+
+    expected = OccupancyIndex(game.pieces)
+    assert dict(game.pos.items()) == dict(expected.items())
+    assert game.pos.piece_at((4, 4)) is pw
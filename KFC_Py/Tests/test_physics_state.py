@@ -125,4 +125,32 @@ def test_state_transitions_via_internal_done():
 
     # Advance time until JumpPhysics finishes → state machine auto-returns to idle
     piece.update(20)
-    assert piece.state is idle 
\ No newline at end of file
+    assert piece.state is idle 
+
+# ---------------------------------------------------------------------------
+#                          ANALYTIC POSITION QUERIES
+# ---------------------------------------------------------------------------
+
+
+def test_move_physics_position_at_is_analytic_and_pure():
+    board = _board()
+    phys = MovePhysics(board, param=1.0)
+    phys.reset(Command(1000, "P", "move", [(0, 0), (0, 4)]))
+    before = phys.get_pos_m()
+
+    assert np.allclose(phys.position_at(3000), (2.0, 0.0))
+    assert phys.cell_at(3000) == (0, 2)
+    assert phys.cell_at(0) == (0, 0)          # before the move started
+    assert phys.cell_at(99_999) == (0, 4)     # clamped at the destination
+    assert phys.get_pos_m() is before         # queries never mutate
+
+
+def test_static_physics_position_at():
+    board = _board()
+    idle = IdlePhysics(board)
+    idle.reset(Command(0, "P", "idle", [(5, 6)]))
+    assert idle.cell_at(123_456) == (5, 6)
+
+    jump = JumpPhysics(board, param=1.0)
+    jump.reset(Command(0, "P", "jump", [(1, 1), (2, 2)]))
+    assert jump.cell_at(10) == (2, 2)
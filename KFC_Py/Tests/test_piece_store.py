@@ -0,0 +1,91 @@
+import pathlib
+
+import numpy as np
+
+from Board import Board
+from Clock import ManualClock
+from Command import Command
+from Physics import MovePhysics
+from PieceStore import PieceStore
+from GraphicsFactory import MockImgFactory
+from GameFactory import create_game
+from mock_img import MockImg
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def _board():
+    return Board(1, 1, 8, 8, MockImg())
+
+
+def test_vectorised_advance_matches_scalar_physics():
+    board = _board()
+    store = PieceStore(capacity=2)   # forces a grow
+    moves = [[(0, 0), (0, 4)], [(7, 7), (3, 3)], [(2, 1), (4, 2)]]
+
+    backed = [MovePhysics(board, 2.0, store=store) for _ in moves]
+    plain = [MovePhysics(board, 2.0) for _ in moves]
+    for a, b, params in zip(backed, plain, moves):
+        a.reset(Command(100, "P", "move", params))
+        b.reset(Command(100, "P", "move", params))
+    assert len(store) == 3 and store.capacity == 4
+
+    for now in (100, 600, 1100, 1700):
+        store.advance(now)
+        for a, b in zip(backed, plain):
+            done_a, done_b = a.update(now), b.update(now)
+            assert np.allclose(a.get_pos_m(), b.get_pos_m())
+            assert (done_a is None) == (done_b is None)
+
+
+def test_advance_reports_arrivals_and_skips_static_slots():
+    store = PieceStore()
+    s1, s2 = store.allocate(), store.allocate()
+    store.start_move(s1, (0, 0), (1, 0), 0, 1.0)   # 1 s
+    store.start_move(s2, (0, 0), (3, 0), 0, 1.0)   # 3 s
+
+    assert list(store.advance(1000)) == [s1]
+    store.stop(s1)
+    assert list(store.advance(3000)) == [s2]
+    assert np.allclose(store.pos_m[s1], (1, 0))   # static slot untouched
+
+
+def test_release_recycles_slot():
+    store = PieceStore(capacity=1)
+    phys = MovePhysics(_board(), 1.0, store=store)
+    phys.reset(Command(0, "P", "move", [(0, 0), (0, 1)]))
+    assert len(store) == 1
+    phys.release()
+    assert len(store) == 0
+    assert store.state_code[0] == PieceStore.STATE_FREE
+
+
+def test_game_with_store_moves_pieces():
+    store, clock = PieceStore(), ManualClock()
+    game = create_game(PIECES_ROOT, MockImgFactory(), piece_store=store, clock=clock)
+    game._update_cell2piece_map()
+    rook_path_pawn = game.pos[(6, 0)][0]
+    game.user_input_queue.put(Command(0, rook_path_pawn.id, "move", [(6, 0), (4, 0)]))
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    clock.advance(60_000)
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+
+    assert rook_path_pawn.current_cell() == (4, 0)
+    assert store.now_ms is not None
+
+
+def test_replaced_piece_frees_its_slot():
+    # the slot belongs to the move state's physics, not the rest state the
+    # piece is in once it has arrived
+    store, clock = PieceStore(), ManualClock()
+    game = create_game(PIECES_ROOT, MockImgFactory(), piece_store=store, clock=clock)
+    game._update_cell2piece_map()
+    pawn = game.pos[(6, 0)][0]
+    game.user_input_queue.put(Command(0, pawn.id, "move", [(6, 0), (5, 0)]))
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    clock.advance(60_000)
+    game._run_game_loop(num_iterations=1, is_with_graphics=False)
+    assert pawn.current_cell() == (5, 0) and len(store) == 1
+
+    game._replace_piece(pawn, game.pos[(7, 0)][0])
+    assert len(store) == 0
@@ -0,0 +1,134 @@
+import pathlib, threading, time
+
+import pytest
+
+from GameFactory import create_game
+from GraphicsFactory import MockImgFactory
+from RenderThread import FrameSnapshot, RenderThread
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+def _snap(seq):
+    return FrameSnapshot(seq, seq, ())
+
+
+def _wait_for(cond, timeout=2.0):
+    end = time.monotonic() + timeout
+    while not cond() and time.monotonic() < end:
+        time.sleep(0.005)
+    return cond()
+
+
+def test_latest_snapshot_wins_and_stale_ones_are_dropped():
+    gate = threading.Event()
+    seen = []
+
+    def slow_render(snap):
+        seen.append(snap.seq)
+        gate.wait(1.0)
+
+    rt = RenderThread(slow_render, max_fps=None)
+    rt.start()
+    rt.publish(_snap(0))
+    assert _wait_for(lambda: seen == [0])     # thread is busy drawing frame 0
+    for seq in range(1, 6):
+        rt.publish(_snap(seq))
+    gate.set()
+    assert _wait_for(lambda: rt.rendered == 2)
+    rt.stop()
+
+    assert seen == [0, 5]
+    assert rt.stats() == {"published": 6, "rendered": 2, "dropped": 4}
+
+
+def test_frame_rate_is_capped():
+    stamps = []
+    rt = RenderThread(lambda snap: stamps.append(time.monotonic()), max_fps=20)
+    rt.start()
+    end = time.monotonic() + 0.3
+    seq = 0
+    while time.monotonic() < end:
+        rt.publish(_snap(seq))
+        seq += 1
+        time.sleep(0.002)
+    rt.stop()
+
+    gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+    assert len(stamps) >= 2
+    assert min(gaps) >= 0.045
+    assert rt.dropped > 0
+
+
+def test_render_error_is_kept_for_the_simulation_thread():
+    def boom(snap):
+        raise KeyboardInterrupt("ESC")
+
+    rt = RenderThread(boom, max_fps=None)
+    rt.start()
+    rt.publish(_snap(0))
+    assert _wait_for(lambda: rt.error is not None)
+    rt.stop()
+    assert isinstance(rt.error, KeyboardInterrupt)
+
+
+def test_finished_frames_go_back_to_the_caller():
+    rt = RenderThread(lambda snap: f"frame {snap.seq}", max_fps=None)
+    rt.start()
+    rt.publish(_snap(3))
+    assert _wait_for(lambda: rt.rendered == 1)
+    rt.stop()
+    assert rt.take_frame() == "frame 3"
+    assert rt.take_frame() is None
+
+
+def test_restart_clears_the_previous_error():
+    calls = []
+
+    def first_fails(snap):
+        calls.append(snap.seq)
+        if len(calls) == 1:
+            raise KeyboardInterrupt("ESC")
+
+    rt = RenderThread(first_fails, max_fps=None)
+    rt.start()
+    rt.publish(_snap(0))
+    assert _wait_for(lambda: rt.error is not None)
+    rt.stop()
+    rt.start()
+    assert rt.error is None
+    rt.publish(_snap(1))
+    assert _wait_for(lambda: rt.rendered == 1)
+    rt.stop()
+    assert calls == [0, 1] and rt.error is None
+
+
+def test_invalid_fps_rejected():
+    with pytest.raises(ValueError):
+        RenderThread(lambda s: None, max_fps=0)
+
+
+def test_game_publishes_snapshots_to_render_thread():
+    # real-time ticks at 200 Hz so the render thread gets to draw
+    game = create_game(PIECES_ROOT, MockImgFactory(), render_thread=True,
+                       tick_hz=200, render_hz=None)
+    game._run_game_loop(num_iterations=20, is_with_graphics=True)
+
+    rt = game.render_thread
+    assert rt.published == 20
+    assert rt.rendered >= 1
+    assert rt.rendered + rt.dropped <= rt.published
+    assert game.curr_board is not None
+
+
+def test_snapshot_carries_a_copy_of_the_ui_panels():
+    from GameUISubscriber import GameUISubscriber
+    game = create_game(PIECES_ROOT, MockImgFactory(), render_thread=True)
+    game.ui_subscriber = GameUISubscriber()
+    game.ui_subscriber.white_moves.append("pw e2 -> e4")
+
+    snap = game._snapshot(0)
+    game.ui_subscriber.white_moves.append("pw d2 -> d4")
+    game.ui_subscriber.white_score = 9
+
+    assert snap.panels == (0, 0, 1, ("pw e2 -> e4",), 0, ())
@@ -0,0 +1,148 @@
+import asyncio
+
+import pytest
+
+from shared_types import ClientMessage, MESSAGE_TYPES
+from server_match import ServerMatch, ILLEGAL_MOVE, NOT_YOUR_PIECE, UNKNOWN_PIECE, GAME_OVER
+from server import ChessServer
+
+from .server_helpers import PIECES_ROOT, JsonSocket, move_data
+
+ROOK_VS_KING = "RW,,,,KB,,,\n" + ",,,,,,,\n" * 6 + ",,,,KW,,,\n"
+
+
+def _run_until_idle(match, start_ms, step_ms=100, limit_ms=20_000):
+    t = start_ms
+    while t < start_ms + limit_ms and not match.game_ended:
+        t += step_ms
+        match.tick(t)
+    return t
+
+
+# ---------------------------------------------------------------------------
+#                          SERVER MATCH
+# ---------------------------------------------------------------------------
+
+
+def test_accepted_move_is_applied_on_ticks():
+    match = ServerMatch(PIECES_ROOT)
+    ok, _, code = match.submit("W", move_data("PW_(6, 4)", (6, 4), (4, 4)))
+    assert ok and code is None
+
+    _run_until_idle(match, 0, limit_ms=3_000)
+    state = match.state()
+    assert state.pieces["PW_(6, 4)"]["position"] == (4, 4)
+    assert state.pos_to_piece["4,4"] == "PW_(6, 4)"
+    assert "6,4" not in state.pos_to_piece
+    assert state.game_time_ms >= 3_000
+
+
+def test_rejects_illegal_foreign_and_unknown_commands():
+    match = ServerMatch(PIECES_ROOT)
+    assert match.submit("W", move_data("PW_(6, 4)", (6, 4), (3, 4)))[2] == ILLEGAL_MOVE
+    assert match.submit("W", move_data("RW_(7, 0)", (7, 0), (5, 0)))[2] == ILLEGAL_MOVE  # blocked by pawn
+    assert match.submit("B", move_data("PW_(6, 4)", (6, 4), (4, 4)))[2] == NOT_YOUR_PIECE
+    assert match.submit("W", move_data("QW_(9, 9)", (9, 9), (4, 4)))[2] == UNKNOWN_PIECE
+    assert match.pending == [] and match.game.user_input_queue.empty()
+
+
+def test_client_source_cell_is_ignored():
+    match = ServerMatch(PIECES_ROOT)
+    ok, _, _ = match.submit("W", move_data("PW_(6, 4)", (0, 0), (5, 4)))
+    assert ok
+    assert match.pending[0].params == [(6, 4), (5, 4)]
+
+
+def test_busy_piece_cannot_take_another_command():
+    match = ServerMatch(PIECES_ROOT)
+    assert match.submit("W", move_data("PW_(6, 4)", (6, 4), (5, 4)))[0]
+    match.tick(10)
+    assert match.game.piece_by_id["PW_(6, 4)"].state.name == "move"
+    assert match.submit("W", move_data("PW_(6, 4)", (6, 4), (4, 4)))[2] == ILLEGAL_MOVE
+
+
+def test_batch_is_applied_in_timestamp_order():
+    match = ServerMatch(PIECES_ROOT)
+    assert match.submit("W", move_data("PW_(6, 4)", (6, 4), (5, 4)), received_ms=30)[0]
+    assert match.submit("B", move_data("PB_(1, 3)", (1, 3), (2, 3)), received_ms=10)[0]
+    assert match.submit("W", move_data("PW_(6, 4)", (6, 4), (4, 4)), received_ms=40)[2] == ILLEGAL_MOVE
+    assert [c.piece_id for c in match.pending] == ["PB_(1, 3)", "PW_(6, 4)"]
+
+    assert match.tick(50)
+    assert match.pending == [] and match.last_batch == 2
+    assert match.last_move["piece_id"] == "PW_(6, 4)" and match.current_player == "B"
+    # each move starts when it arrived, not at the tick boundary
+    assert match.game.piece_by_id["PB_(1, 3)"].state.physics.get_start_ms() == 10
+    assert match.game.piece_by_id["PW_(6, 4)"].state.physics.get_start_ms() == 30
+
+
+def test_king_capture_ends_match(tmp_path):
+    csv = tmp_path / "board.csv"
+    csv.write_text(ROOK_VS_KING)
+    match = ServerMatch(PIECES_ROOT, board_csv=csv)
+    assert match.submit("W", move_data("RW_(0, 0)", (0, 0), (0, 4)))[0]
+    _run_until_idle(match, 0)
+
+    state = match.state()
+    assert state.game_ended and state.winner == "W"
+    assert "KB_(0, 4)" not in state.pieces
+    assert match.submit("W", move_data("RW_(0, 0)", (0, 4), (1, 4)))[2] == GAME_OVER
+    assert match.tick(10 ** 6) is False
+
+
+# ---------------------------------------------------------------------------
+#                          CHESS SERVER
+# ---------------------------------------------------------------------------
+
+
+def test_server_seats_players_and_broadcasts_on_tick():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+    white, black, viewer = JsonSocket(), JsonSocket(), JsonSocket()
+
+    async def scenario():
+        for cid, ws in (("w", white), ("b", black), ("v", viewer)):
+            server.connect(cid, ws)
+        assert server.rooms["default"].seats == {"w": "W", "b": "B"}
+
+        move = ClientMessage(MESSAGE_TYPES["MOVE"], "user1", move_data("PB_(1, 3)", (1, 3), (2, 3)))
+        resp, broadcast = server.handle_message(move, "v")
+        assert not resp.success and not broadcast
+        resp, _ = server.handle_message(move, "w")
+        assert resp.error_code == NOT_YOUR_PIECE
+        resp, broadcast = server.handle_message(move, "b")
+        assert resp.success and not broadcast
+
+        assert server.tick(50) == 1
+        for outbox in server.clients.values():
+            await outbox.drain()
+    asyncio.run(scenario())
+
+    for ws in (white, black, viewer):
+        assert ws.sent[0]["type"] == MESSAGE_TYPES["GAME_UPDATE"]
+        assert ws.sent[-1]["type"] == MESSAGE_TYPES["GAME_DELTA"]
+        assert ws.sent[-1]["changed"]["PB_(1, 3)"]["state"] == "move"
+    assert server.tick(50) == 0  # nothing new to send
+
+
+def test_burst_of_moves_costs_one_update_per_tick():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+    sockets = {cid: JsonSocket() for cid in ("w", "b", "v")}
+
+    async def scenario():
+        for cid, ws in sockets.items():
+            server.connect(cid, ws)
+        for col in range(4):
+            assert server.handle_message(ClientMessage(
+                MESSAGE_TYPES["MOVE"], "p", move_data(f"PW_(6, {col})", (6, col), (5, col))), "w")[0].success
+            assert server.handle_message(ClientMessage(
+                MESSAGE_TYPES["MOVE"], "p", move_data(f"PB_(1, {col})", (1, col), (2, col))), "b")[0].success
+        assert server.tick(50) == 1
+        for outbox in server.clients.values():
+            await outbox.drain()
+    asyncio.run(scenario())
+
+    for ws in sockets.values():
+        assert [m["type"] for m in ws.sent] == [MESSAGE_TYPES["GAME_UPDATE"], MESSAGE_TYPES["GAME_DELTA"]]
+        assert len(ws.sent[-1]["changed"]) == 8
+    metrics = server.metrics()["default"]
+    assert metrics["updates"] == 1 and metrics["max_batch"] == 8
@@ -0,0 +1,117 @@
+import asyncio, json
+
+from shared_types import ClientMessage, MESSAGE_TYPES
+from server import ChessServer
+from server_room import DEFAULT_ROOM
+
+from .server_helpers import PIECES_ROOT, JsonSocket, move_data
+
+
+def _join(match_id):
+    return ClientMessage(MESSAGE_TYPES["JOIN"], "p", {"match_id": match_id})
+
+
+def _move(piece_id, src, dst):
+    return ClientMessage(MESSAGE_TYPES["MOVE"], "p", move_data(piece_id, src, dst))
+
+
+def _run(server, scenario):
+    async def wrapper():
+        result = scenario()
+        for outbox in list(server.clients.values()):
+            await outbox.drain()
+        return result
+    return asyncio.run(wrapper())
+
+
+def test_rooms_are_independent():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+    sockets = {cid: JsonSocket() for cid in ("a1", "a2", "b1", "b2")}
+
+    def scenario():
+        for cid, ws in sockets.items():
+            server.connect(cid, ws)
+        for cid in ("a1", "a2"):
+            server.handle_message(_join("A"), cid)
+        for cid in ("b1", "b2"):
+            server.handle_message(_join("B"), cid)
+        assert DEFAULT_ROOM not in server.rooms  # emptied and closed
+        assert server.rooms["A"].seats == {"a1": "W", "a2": "B"}
+        assert server.rooms["B"].seats == {"b1": "W", "b2": "B"}
+
+        assert server.handle_message(_move("PW_(6, 4)", (6, 4), (4, 4)), "a1")[0].success
+        assert server.tick(50) == 1
+    _run(server, scenario)
+
+    assert server.rooms["A"].game_state.pieces["PW_(6, 4)"]["state"] == "move"
+    assert server.rooms["B"].game_state.pieces["PW_(6, 4)"]["state"] == "idle"
+    # the update only reached room A
+    assert sockets["a2"].sent[-1]["type"] == MESSAGE_TYPES["GAME_DELTA"]
+    assert sockets["b2"].sent[-1]["type"] == MESSAGE_TYPES["GAME_UPDATE"]
+
+
+def test_join_sends_the_rooms_keyframe_and_moves_the_seat():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+    ws = JsonSocket()
+
+    def scenario():
+        server.connect("c", ws)
+        server.handle_message(_join("X"), "c")
+        resp, _ = server.handle_message(_join("X"), "c")  # re-joining keeps the seat
+        assert resp.message == "Seated as W in X"
+        server.connect("s1", JsonSocket(), match_id="X")
+        server.connect("s2", JsonSocket(), match_id="X")
+        assert server.handle_message(_move("PB_(1, 0)", (1, 0), (2, 0)), "s2")[0].error_code == "NOT_A_PLAYER"
+    _run(server, scenario)
+
+    keyframes = [m for m in ws.sent if m["type"] == MESSAGE_TYPES["GAME_UPDATE"]]
+    assert len(keyframes) == 2  # default room, then X
+    assert server.rooms["X"].metrics()["rejected"] == 1
+
+
+def test_room_closes_when_last_client_leaves():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+
+    def scenario():
+        outbox = server.connect("c", JsonSocket(), match_id="solo")
+        assert "solo" in server.rooms
+        outbox.close()
+    _run(server, scenario)
+    assert server.rooms == {} and server.clients == {}
+
+
+def test_many_rooms_on_one_loop():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+
+    def scenario():
+        for i in range(40):
+            server.connect(f"w{i}", JsonSocket(), match_id=f"m{i}")
+            server.connect(f"b{i}", JsonSocket(), match_id=f"m{i}")
+            server.handle_message(_move("PW_(6, 0)", (6, 0), (5, 0)), f"w{i}")
+        changed = server.tick(50)
+        for t in range(100, 3_000, 50):
+            server.tick(t)
+        return changed
+    assert _run(server, scenario) == 40
+
+    metrics = server.metrics()
+    assert len(metrics) == 40
+    for m in metrics.values():
+        assert m["clients"] == 2 and m["players"] == 2
+        assert m["accepted"] == 1 and m["updates"] >= 1
+        assert m["bytes_out"] > 0
+    assert all(r.game_state.pieces["PW_(6, 0)"]["position"] == (5, 0) for r in server.rooms.values())
+
+
+def test_resync_outside_a_room_is_answered_no_room():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+    ws = JsonSocket()
+
+    def scenario():
+        server.connect("c", ws)
+        server._leave("c")
+        server.handle_text("c", json.dumps(ClientMessage(MESSAGE_TYPES["RESYNC"], "p").to_dict()))
+    _run(server, scenario)
+
+    assert ws.sent[-1]["error_code"] == "NO_ROOM"
+    assert ws.sent[-1]["message"] == "Not in a room"
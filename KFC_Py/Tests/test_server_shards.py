@@ -0,0 +1,243 @@
+import asyncio, json, time
+
+import pytest
+
+from shared_types import ClientMessage, MESSAGE_TYPES
+from server_shards import HashRing, LocalShard, ProcessShard, ShardFront
+from state_delta import StateDeltaDecoder
+from wire_codec import CODEC_BINARY, CODEC_JSON, WireDecoder, encode_client_message
+
+from .server_helpers import PIECES_ROOT, FakeSocket, JsonSocket, client_text, move_data
+
+
+def _move(piece_id, src, dst):
+    return client_text(MESSAGE_TYPES["MOVE"], move_data(piece_id, src, dst))
+
+
+def _matches_on_distinct_shards(front, count):
+    """Match ids that hash to *count* different shards."""
+    picked = {}
+    for i in range(1000):
+        picked.setdefault(front.ring.node_for(f"m{i}"), f"m{i}")
+        if len(picked) == count:
+            return list(picked.values())
+    raise AssertionError("ring does not spread keys")
+
+
+# ---------------------------------------------------------------------------
+#                          HASH RING
+# ---------------------------------------------------------------------------
+
+
+def test_ring_is_stable_and_balanced():
+    ring = HashRing([f"shard-{i}" for i in range(4)])
+    keys = [f"match-{i}" for i in range(4000)]
+    owners = {k: ring.node_for(k) for k in keys}
+    assert owners == {k: HashRing([f"shard-{i}" for i in range(4)]).node_for(k) for k in keys}
+    counts = {n: list(owners.values()).count(n) for n in set(owners.values())}
+    assert len(counts) == 4 and min(counts.values()) > 500
+
+
+def test_adding_a_node_only_moves_its_keys():
+    ring = HashRing(["a", "b", "c"])
+    keys = [f"match-{i}" for i in range(3000)]
+    before = {k: ring.node_for(k) for k in keys}
+    ring.add("d")
+    moved = [k for k in keys if ring.node_for(k) != before[k]]
+    assert all(ring.node_for(k) == "d" for k in moved)
+    assert 0 < len(moved) < len(keys) / 2
+    ring.remove("d")
+    assert {k: ring.node_for(k) for k in keys} == before
+
+
+def test_empty_ring():
+    with pytest.raises(LookupError):
+        HashRing().node_for("x")
+
+
+# ---------------------------------------------------------------------------
+#                          FRONT OVER LOCAL SHARDS
+# ---------------------------------------------------------------------------
+
+
+def _local_front(n=3):
+    return ShardFront([LocalShard(f"shard-{i}", PIECES_ROOT, clock=lambda: 0.0) for i in range(n)])
+
+
+def _run(front, scenario):
+    async def wrapper():
+        front.start()
+        result = scenario()
+        for outbox in list(front.clients.values()):
+            await outbox.drain()
+        return result
+    return asyncio.run(wrapper())
+
+
+def test_rooms_live_on_their_shard():
+    front = _local_front()
+    a, b = _matches_on_distinct_shards(front, 2)
+    sockets = {cid: JsonSocket() for cid in ("a1", "a2", "b1")}
+
+    def scenario():
+        front.connect("a1", sockets["a1"], match_id=a)
+        front.connect("a2", sockets["a2"], match_id=a)
+        front.connect("b1", sockets["b1"], match_id=b)
+        front.handle_text("a1", _move("PW_(6, 4)", (6, 4), (4, 4)))
+        for shard in front.shards.values():
+            shard.tick(50)
+    _run(front, scenario)
+
+    shard_a, shard_b = front.shard_for(a), front.shard_for(b)
+    assert set(shard_a.worker.server.rooms) == {a}
+    assert set(shard_b.worker.server.rooms) == {b}
+    assert sockets["a1"].sent[1]["success"]
+    for cid in ("a1", "a2"):
+        assert sockets[cid].sent[-1]["type"] == MESSAGE_TYPES["GAME_DELTA"]
+    assert [m["type"] for m in sockets["b1"].sent] == [MESSAGE_TYPES["GAME_UPDATE"]]
+    assert front.metrics()[shard_a.name]["clients"] == 2
+
+
+def test_join_moves_the_connection_to_the_new_shard():
+    front = _local_front()
+    target = next(m for m in _matches_on_distinct_shards(front, 3)
+                  if front.shard_for(m) is not front.shard_for("default"))
+    ws = JsonSocket()
+
+    def scenario():
+        front.connect("c", ws)
+        front.handle_text("c", client_text(MESSAGE_TYPES["JOIN"], {"match_id": target}))
+    _run(front, scenario)
+
+    assert "default" not in front.shard_for("default").worker.server.rooms
+    assert front.shard_for(target).worker.server.rooms[target].seats == {"c": "W"}
+    assert ws.sent[-1]["message"] == f"Seated as W in {target}"
+    keyframes = [m for m in ws.sent if m.get("type") == MESSAGE_TYPES["GAME_UPDATE"]]
+    assert len(keyframes) == 2
+
+
+def test_negotiated_codec_follows_the_connection():
+    front = _local_front()
+    target = next(m for m in _matches_on_distinct_shards(front, 3)
+                  if front.shard_for(m) is not front.shard_for("default"))
+    ws = FakeSocket()
+
+    def scenario():
+        front.connect("c", ws)
+        front.handle_text("c", client_text(MESSAGE_TYPES["HELLO"], {"codecs": [CODEC_BINARY]}))
+        front.handle_text("c", encode_client_message(
+            ClientMessage(MESSAGE_TYPES["JOIN"], "p", {"match_id": target})))
+    _run(front, scenario)
+
+    wire = WireDecoder()
+    assert isinstance(ws.sent[0], str) and isinstance(ws.sent[1], str)  # keyframe, hello reply
+    assert wire.decode(ws.sent[-1])["message"] == f"Seated as W in {target}"
+    assert wire.decode(ws.sent[-2])["game_state"]["pieces"]  # the new room's keyframe
+
+
+def test_disconnect_reaches_the_shard():
+    front = _local_front()
+
+    def scenario():
+        front.connect("c", JsonSocket(), match_id="solo").close()
+    _run(front, scenario)
+    assert front.clients == {} and front.client_shard == {}
+    assert all(not s.worker.server.rooms for s in front.shards.values())
+
+
+def test_broadcast_crosses_the_pipe_once_per_room():
+    front = _local_front(1)
+    shard = front.shards["shard-0"]
+    emitted = []
+
+    def scenario():
+        for i in range(5):
+            front.connect(f"c{i}", JsonSocket(), match_id="big")
+        front.handle_text("c0", _move("PW_(6, 0)", (6, 0), (5, 0)))
+        shard.attach(lambda msg: (emitted.append(msg), front._on_shard_message(msg)))
+        shard.tick(50)
+    _run(front, scenario)
+    assert len(emitted) == 1 and emitted[0][1] == "shard-0" and len(emitted[0][2]) == 5
+    assert front.delivered >= 5
+
+
+def test_deliveries_from_a_left_shard_are_dropped():
+    front = _local_front()
+    a, b = _matches_on_distinct_shards(front, 2)
+    old, ws = front.shard_for(a), JsonSocket()
+
+    def scenario():
+        front.connect("c", ws, match_id=a)
+        front.handle_text("c", client_text(MESSAGE_TYPES["JOIN"], {"match_id": b}))
+        # an update the old shard emitted before it saw the disconnect
+        front._on_shard_message(("deliver", old.name, ["c"], json.dumps({"stale": True}), True))
+    _run(front, scenario)
+
+    assert not any(m.get("stale") for m in ws.sent)
+    assert ws.sent[-1]["message"] == f"Seated as W in {b}"
+
+
+# ---------------------------------------------------------------------------
+#                          WORKER PROCESSES
+# ---------------------------------------------------------------------------
+
+
+async def _wait_for(predicate, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for the shards"
+        await asyncio.sleep(0.01)
+
+
+def test_worker_processes_play_a_move():
+    front = ShardFront.spawn(2, PIECES_ROOT)
+    a, b = _matches_on_distinct_shards(front, 2)
+    sockets = {cid: JsonSocket() for cid in ("a", "b")}
+
+    async def scenario():
+        front.start()
+        front.connect("a", sockets["a"], match_id=a)
+        front.connect("b", sockets["b"], match_id=b)
+        await _wait_for(lambda: all(ws.sent for ws in sockets.values()))
+        front.handle_text("a", _move("PW_(6, 4)", (6, 4), (5, 4)))
+        decoder = StateDeltaDecoder()
+        decoder.apply(sockets["a"].sent[0])
+
+        def moved():
+            for m in sockets["a"].sent[1:]:
+                if m.get("type") in (MESSAGE_TYPES["GAME_DELTA"], MESSAGE_TYPES["GAME_UPDATE"]):
+                    decoder.apply(m)
+            del sockets["a"].sent[1:]
+            return decoder.state.pieces["PW_(6, 4)"]["position"] == [5, 4]
+        await _wait_for(moved)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        front.stop()
+    assert all(not s.process.is_alive() for s in front.shards.values())
+    assert sockets["b"].sent[0]["game_state"]["pieces"]["PW_(6, 4)"]["position"] == [6, 4]
+
+
+def test_flooding_a_worker_never_blocks_the_front():
+    # both directions fill their socket buffers at once: the front keeps
+    # queueing commands while the worker is busy writing large replies
+    shard = ProcessShard("shard-0", PIECES_ROOT)
+    got = []
+    get_state = client_text(MESSAGE_TYPES["GET_STATE"], None)
+
+    async def scenario():
+        shard.attach(got.append)
+        shard.send(("connect", "c", "m", CODEC_JSON))
+        started = time.monotonic()
+        for _ in range(3_000):
+            shard.send(("message", "c", get_state))
+        assert time.monotonic() - started < 5.0  # buffered, not blocked
+        await _wait_for(lambda: len(got) >= 3_001, timeout=60.0)
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        shard.stop()
+    assert all(msg[0] == "deliver" for msg in got)
+    assert not shard.process.is_alive()
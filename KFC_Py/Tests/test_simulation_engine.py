@@ -0,0 +1,73 @@
+import pathlib, subprocess, sys
+
+import pytest
+
+from Command import Command
+from EventType import EventType
+from SimulationEngine import SimulationEngine
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+ROOK_VS_KING = "RW,,,,KB,,,\n" + ",,,,,,,\n" * 6 + ",,,,KW,,,\n"
+
+
+@pytest.fixture
+def rook_board(tmp_path):
+    csv = tmp_path / "board.csv"
+    csv.write_text(ROOK_VS_KING)
+    return csv
+
+
+def test_scripted_opening_moves():
+    engine = SimulationEngine(PIECES_ROOT)
+    result = engine.run([
+        Command(150, "PB_(1, 3)", "move", [(1, 3), (3, 3)]),
+        Command(100, "PW_(6, 4)", "move", [(6, 4), (4, 4)]),
+    ])
+    assert result.winner is None
+    assert result.commands_applied == 2
+    assert result.pieces["PW_(6, 4)"] == (4, 4)
+    assert result.pieces["PB_(1, 3)"] == (3, 3)
+    moved = [(e["piece_id"], e["t_ms"]) for e in result.events if e["type"] == EventType.PIECE_MOVED]
+    assert moved == [("PW_(6, 4)", 100), ("PB_(1, 3)", 150)]
+
+
+def test_king_capture_ends_match(rook_board):
+    engine = SimulationEngine(PIECES_ROOT, board_csv=rook_board)
+    result = engine.run([Command(0, "RW_(0, 0)", "move", [(0, 0), (0, 4)])])
+
+    assert result.winner == "W"
+    assert "KB_(0, 4)" not in result.pieces
+    assert [e["type"] for e in result.events][-2:] == [EventType.PIECE_CAPTURED, EventType.GAME_ENDED]
+    assert result.steps < 10                # idle time is skipped, not ticked through
+
+
+def test_fixed_steps_reach_the_same_outcome(rook_board):
+    script = [Command(0, "RW_(0, 0)", "move", [(0, 0), (0, 4)])]
+    jumped = SimulationEngine(PIECES_ROOT, board_csv=rook_board).run(script)
+    stepped = SimulationEngine(PIECES_ROOT, board_csv=rook_board, step_ms=16).run(script)
+    assert stepped.winner == jumped.winner
+    assert stepped.pieces == jumped.pieces
+    assert abs(stepped.end_ms - jumped.end_ms) <= 16
+
+
+def test_time_limit(rook_board):
+    engine = SimulationEngine(PIECES_ROOT, board_csv=rook_board)
+    result = engine.run([Command(0, "RW_(0, 0)", "move", [(0, 0), (0, 4)])], until_ms=500)
+    assert result.winner is None
+    assert result.end_ms <= 500
+
+
+def test_runs_are_independent_and_repeatable():
+    engine = SimulationEngine(PIECES_ROOT)
+    script = [Command(0, "NW_(7, 1)", "move", [(7, 1), (5, 2)])]
+    assert engine.run(script) == engine.run(script)
+
+
+def test_engine_does_not_load_sound_or_keyboard():
+    code = ("import sys; import SimulationEngine; "
+            "SimulationEngine.SimulationEngine(%r).run([]); "
+            "print('pygame' in sys.modules, 'keyboard' in sys.modules)" % str(PIECES_ROOT))
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                         cwd=pathlib.Path(__file__).parent.parent, timeout=60)
+    assert out.stdout.strip().splitlines()[-1] == "False False"
@@ -0,0 +1,58 @@
+import pathlib, shutil
+
+import numpy as np
+import pytest
+
+from GameFactory import create_game, CELL_PX
+from GraphicsFactory import ImgFactory
+from SpriteAtlas import SpriteAtlas, atlas_paths, build_atlas
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+@pytest.fixture
+def pieces_copy(tmp_path):
+    root = tmp_path / "pieces"
+    shutil.copytree(PIECES_ROOT, root, ignore=shutil.ignore_patterns("atlas_*"))
+    return root
+
+
+class CountingImgFactory(ImgFactory):
+    def __init__(self):
+        super().__init__(cache=None)
+        self.paths = []
+
+    def __call__(self, path, *args, **kwargs):
+        self.paths.append(pathlib.Path(path).name)
+        return super().__call__(path, *args, **kwargs)
+
+
+def test_atlas_frames_match_individual_sprites(pieces_copy):
+    build_atlas(pieces_copy, 32)
+    atlas = SpriteAtlas.load(pieces_copy, 32)
+
+    sprites = sorted((pieces_copy / "QW" / "states" / "move" / "sprites").glob("*.png"))
+    frames = atlas.frames("QW", "move")
+    assert len(frames) == len(sprites)
+    for png, frame in zip(sprites, frames):
+        expected = ImgFactory(None)(png, (32, 32), keep_aspect=False).img
+        assert np.array_equal(frame.img, expected)
+    assert atlas.frames("QW", "move") is frames      # views built once
+
+
+def test_missing_atlas():
+    with pytest.raises(FileNotFoundError):
+        SpriteAtlas.load(PIECES_ROOT, 7)
+    assert SpriteAtlas.load_if_present(PIECES_ROOT, 7) is None
+
+
+def test_create_game_with_atlas_opens_no_sprites(pieces_copy):
+    build_atlas(pieces_copy, CELL_PX)
+    assert all(p.exists() for p in atlas_paths(pieces_copy, CELL_PX))
+
+    factory = CountingImgFactory()
+    game = create_game(pieces_copy, factory, use_atlas=True)
+    assert factory.paths == ["board.png"]
+    assert len(game.pieces) == 32
+    frame = game.pieces[0].state.graphics.get_img()
+    assert frame.img.shape[:2] == (CELL_PX, CELL_PX)
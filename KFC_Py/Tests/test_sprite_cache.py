@@ -0,0 +1,47 @@
+import os, pathlib, shutil
+
+from GraphicsFactory import ImgFactory, SpriteCache
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+SPRITE = PIECES_ROOT / "PW" / "states" / "idle" / "sprites" / "1.png"
+
+
+def test_repeated_loads_share_one_image():
+    cache = SpriteCache()
+    f1, f2 = ImgFactory(cache), ImgFactory(cache)
+    a = f1(SPRITE, (32, 32), keep_aspect=False)
+    b = f2(SPRITE, (32, 32), keep_aspect=False)
+    assert a is b
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+    assert cache.bytes_used == a.img.nbytes
+
+    c = f1(SPRITE, (16, 16), keep_aspect=False)   # different size → new entry
+    assert c is not a
+    assert len(cache) == 2
+
+
+def test_modified_file_is_reloaded(tmp_path):
+    path = tmp_path / "s.png"
+    shutil.copy(SPRITE, path)
+    cache = SpriteCache()
+    f = ImgFactory(cache)
+    a = f(path, (8, 8))
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert f(path, (8, 8)) is not a
+
+
+def test_lru_eviction_respects_budget():
+    one = ImgFactory(None)(SPRITE, (32, 32)).img.nbytes
+    cache = SpriteCache(max_bytes=2 * one)
+    f = ImgFactory(cache)
+    a = f(SPRITE, (32, 32))
+    f(SPRITE, (32, 32), True)
+    f(SPRITE, (32, 32))                 # touch a – now most recent
+    f(SPRITE, (32, 31))                 # pushes out the keep_aspect entry
+    assert cache.evictions == 1
+    assert cache.bytes_used <= cache.max_bytes
+    assert f(SPRITE, (32, 32)) is a
+
+    cache.set_budget(0)
+    assert len(cache) == 1              # the newest entry is always kept
@@ -0,0 +1,87 @@
+import asyncio, json
+
+from shared_types import ClientMessage, MESSAGE_TYPES
+from server import ChessServer
+from server_match import ServerMatch
+from state_delta import StateDeltaDecoder, StateDeltaEncoder
+
+from .server_helpers import PIECES_ROOT, FakeSocket, move_data
+
+
+def _as_json(state):
+    # the clock alone never triggers an update
+    data = json.loads(json.dumps(state.to_dict()))
+    del data["game_time_ms"]
+    return data
+
+
+def _play(match, encoder, until_ms=4_000, step_ms=50):
+    """Yield the encoded messages of a short two-pawn opening."""
+    match.submit("W", move_data("PW_(6, 4)", (6, 4), (4, 4)))
+    match.submit("B", move_data("PB_(1, 3)", (1, 3), (3, 3)))
+    for t in range(step_ms, until_ms, step_ms):
+        if match.tick(t):
+            text = encoder.encode(match.state())
+            if text is not None:
+                yield json.loads(text)
+
+
+def test_decoder_tracks_server_state_through_deltas():
+    match, encoder, decoder = ServerMatch(PIECES_ROOT), StateDeltaEncoder(), StateDeltaDecoder()
+    decoder.apply(json.loads(encoder.encode(match.state())))
+
+    messages = list(_play(match, encoder))
+    assert messages and all(m["type"] == MESSAGE_TYPES["GAME_DELTA"] for m in messages)
+    for m in messages:
+        assert decoder.apply(m) is not None
+        assert len(m["changed"]) <= 2  # only the two pawns ever move
+
+    assert _as_json(decoder.state) == _as_json(match.state())
+    assert decoder.seq == encoder.seq == len(messages) + 1
+
+
+def test_keyframes_are_periodic():
+    match, encoder = ServerMatch(PIECES_ROOT), StateDeltaEncoder(keyframe_every=3)
+    encoder.encode(match.state())
+    types = [m["type"] for m in _play(match, encoder)]
+    assert types[:6] == ["game_delta", "game_delta", "game_update"] * 2
+
+
+def test_unchanged_state_encodes_nothing():
+    match, encoder = ServerMatch(PIECES_ROOT), StateDeltaEncoder()
+    assert encoder.encode(match.state()) is not None
+    match.tick(500)
+    assert encoder.encode(match.state()) is None
+
+
+def test_gap_requires_resync_and_keyframe_recovers():
+    match, encoder, decoder = ServerMatch(PIECES_ROOT), StateDeltaEncoder(), StateDeltaDecoder()
+    decoder.apply(json.loads(encoder.encode(match.state())))
+    messages = list(_play(match, encoder))
+    assert len(messages) >= 2
+
+    assert decoder.apply(messages[1]) is None  # messages[0] was lost
+    assert decoder.needs_resync
+
+    state = decoder.apply(json.loads(encoder.keyframe()))
+    assert not decoder.needs_resync
+    assert _as_json(state) == _as_json(match.state())
+    assert decoder.seq == encoder.seq
+
+
+def test_server_encodes_each_update_once():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+    sockets = [FakeSocket() for _ in range(3)]
+
+    async def scenario():
+        for i, ws in enumerate(sockets):
+            server.connect(str(i), ws)
+        server.handle_message(ClientMessage("move", "p", move_data("PW_(6, 4)", (6, 4), (5, 4))), "0")
+        server.tick(50)
+        for outbox in server.clients.values():
+            await outbox.drain()
+    asyncio.run(scenario())
+
+    first = sockets[0].sent[-1]
+    assert all(ws.sent[-1] is first for ws in sockets)  # one string for everyone
+    assert json.loads(first)["type"] == MESSAGE_TYPES["GAME_DELTA"]
@@ -0,0 +1,96 @@
+import pathlib
+
+import pytest
+
+from Clock import ManualClock
+from TickScheduler import TickScheduler
+from GraphicsFactory import MockImgFactory
+from GameFactory import create_game
+
+PIECES_ROOT = pathlib.Path(__file__).parent.parent.parent / "pieces"
+
+
+class FakeClock:
+    """Manual clock – sleeping simply advances time."""
+
+    def __init__(self):
+        self.t = 0.0
+        self.slept = []
+
+    def now(self):
+        return self.t
+
+    def sleep(self, ms):
+        self.slept.append(ms)
+        self.t += ms
+
+
+def test_sleeps_until_next_deadline():
+    clk = FakeClock()
+    sch = TickScheduler(clk.now, clk.sleep, tick_hz=100, render_hz=None)
+    sch.start()
+
+    assert sch.wait_for_tick() == 0       # first tick is due immediately
+    clk.t += 3                            # tick work took 3 ms
+    assert sch.wait_for_tick() == 10      # slept the remaining 7 ms
+    assert clk.slept == [7]
+    assert sch.ticks == 2
+    assert sch.overruns == 0
+
+
+def test_overrun_catches_up_without_sleeping():
+    clk = FakeClock()
+    sch = TickScheduler(clk.now, clk.sleep, tick_hz=100, render_hz=None, max_catchup_ticks=5)
+    sch.start()
+    sch.wait_for_tick()
+
+    clk.t += 25                           # a slow tick – 2 deadlines missed
+    sch.wait_for_tick()
+    sch.wait_for_tick()
+    assert clk.slept == []
+    assert sch.overruns == 1
+    assert sch.dropped_ticks == 0
+
+    # back on schedule: the next deadline is at 30 ms
+    sch.wait_for_tick()
+    assert clk.t == 30
+
+
+def test_large_overrun_drops_ticks_and_reanchors():
+    clk = FakeClock()
+    sch = TickScheduler(clk.now, clk.sleep, tick_hz=100, render_hz=None, max_catchup_ticks=2)
+    sch.start()
+    sch.wait_for_tick()
+
+    clk.t += 100                          # 9 ticks behind
+    sch.wait_for_tick()
+    assert sch.dropped_ticks == 7
+
+    sch.wait_for_tick()
+    assert clk.t == 110                   # next tick one period after re-anchor
+
+
+def test_render_rate_independent_of_tick_rate():
+    clk = FakeClock()
+    sch = TickScheduler(clk.now, clk.sleep, tick_hz=100, render_hz=25)
+    sch.start()
+
+    rendered = [sch.render_due(sch.wait_for_tick()) for _ in range(8)]
+    assert rendered == [True, False, False, False, True, False, False, False]
+    assert sch.stats()["frames_rendered"] == 2
+    assert sch.stats()["frames_skipped"] == 6
+
+
+def test_invalid_rates_rejected():
+    with pytest.raises(ValueError):
+        TickScheduler(lambda: 0, lambda ms: None, tick_hz=0)
+    with pytest.raises(ValueError):
+        TickScheduler(lambda: 0, lambda ms: None, render_hz=-1)
+
+
+def test_game_loop_counts_ticks():
+    clock = ManualClock()
+    game = create_game(PIECES_ROOT, MockImgFactory(), clock=clock)
+    game._run_game_loop(num_iterations=20, is_with_graphics=False)
+    assert game.scheduler.ticks == 20
+    assert clock.now_ms() == pytest.approx(19 * game.scheduler.tick_ms)   # paced on virtual time
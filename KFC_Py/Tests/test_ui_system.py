@@ -13,7 +13,7 @@ from typing import List, Any
 import sys
 sys.path.append(str(pathlib.Path(__file__).parent.parent))
 
-from GameUISubscriber import GameUISubscriber
+from GameUISubscriber import GameUISubscriber, TextTileCache
 from EventType import EventType, GameStartedData, GameEndedData, PieceMovedData, PieceCapturedData
 from Subscriber import Subscriber
 from SoundManager import SoundManager
@@ -274,6 +274,77 @@ class TestGameUISubscriber:
         assert isinstance(result, np.ndarray)
 
 
+class TestUIOverlayCache:
+    """Static chrome and player panels are cached between frames"""
+
+    def setup_method(self):
+        self.ui_subscriber = GameUISubscriber(board_width=512, board_height=512)
+        self.board = np.full((512, 512, 3), 77, dtype=np.uint8)
+
+    def test_panels_not_redrawn_when_nothing_changed(self):
+        with patch.object(self.ui_subscriber, '_draw_styled_player_panel',
+                          wraps=self.ui_subscriber._draw_styled_player_panel) as panel:
+            first = self.ui_subscriber.create_ui_overlay(self.board)
+            second = self.ui_subscriber.create_ui_overlay(self.board)
+            assert panel.call_count == 2          # one per player, first frame only
+        assert np.array_equal(first, second)
+        assert first is not second                # callers get their own frame
+
+    def test_move_event_refreshes_panels(self):
+        before = self.ui_subscriber.create_ui_overlay(self.board)
+        chrome = self.ui_subscriber._chrome
+        move = PieceMovedData(piece_id="PW", from_cell=(6, 4), to_cell=(4, 4), player_color="W")
+        with patch('GameUISubscriber.sound_manager'):
+            self.ui_subscriber.handle_event(EventType.PIECE_MOVED, move)
+        after = self.ui_subscriber.create_ui_overlay(self.board)
+
+        assert not np.array_equal(before, after)
+        assert self.ui_subscriber._chrome is chrome   # static layer reused
+        # the board area is the board, whatever the panels show
+        y, x = self.ui_subscriber.title_height, self.ui_subscriber.panel_width
+        assert (after[y:y + 512, x:x + 512] == 77).all()
+
+    def test_gradient_matches_per_row_formula(self):
+        canvas = self.ui_subscriber._create_gradient_background()
+        h = self.ui_subscriber.total_height
+        for y in (0, h // 2, h - 1):
+            f = y / h
+            gold, brown = 1 - f * 0.4, f * 0.3
+            expected = (int(245 * gold + 139 * brown), int(235 * gold + 69 * brown),
+                        int(215 * gold + 19 * brown))
+            assert tuple(canvas[y, 0]) == expected
+
+
+class TestTextTileCache:
+    """Move-list lines are rasterized once and reused"""
+
+    def test_tile_matches_put_text(self):
+        cache = TextTileCache()
+        font = cv2.FONT_HERSHEY_DUPLEX
+        direct = np.full((60, 300, 3), 200, dtype=np.uint8)
+        tiled = direct.copy()
+        cv2.putText(direct, "12. nb b8 -> c6 xpw", (20, 40), font, 0.5, (11, 134, 184), 2)
+        cache.draw(tiled, "12. nb b8 -> c6 xpw", (20, 40), font, 0.5, (11, 134, 184), 2)
+        assert np.abs(direct.astype(int) - tiled).max() <= 1
+
+    def test_lines_rendered_once_and_evicted_when_scrolled_out(self):
+        ui = GameUISubscriber(board_width=512, board_height=512)
+        board = np.zeros((512, 512, 3), dtype=np.uint8)
+        ui.white_moves = [f"pw a{i % 8 + 1} -> a{i % 8 + 1}" for i in range(8)]
+        ui.create_ui_overlay(board)
+        assert ui._line_tiles.misses == 8
+
+        ui.white_score = 1                      # panels redrawn, lines unchanged
+        ui.create_ui_overlay(board)
+        assert ui._line_tiles.misses == 8
+        assert ui._line_tiles.hits == 8
+
+        ui.white_moves.append("qw d1 -> h5")    # oldest line scrolls out of view
+        ui.create_ui_overlay(board)
+        assert ui._line_tiles.misses == 9
+        assert len(ui._line_tiles) == 8
+
+
 class TestUISystemIntegration:
     """Integration tests for the complete UI system"""
     
@@ -0,0 +1,155 @@
+import asyncio, json
+
+import pytest
+
+from shared_types import ClientMessage, MESSAGE_TYPES, ServerResponse
+from server import ChessServer
+from server_match import ServerMatch
+from state_delta import StateDeltaDecoder, StateDeltaEncoder
+from wire_codec import (CODEC_BINARY, CODEC_JSON, UpdateEncoder, WireDecoder, WireFormatError,
+                        decode_client_message, decode_game_state, decode_response,
+                        encode_client_message, encode_game_state, encode_response, negotiate)
+
+from .server_helpers import PIECES_ROOT, FakeSocket, move_data
+
+
+def _as_json(obj):
+    return json.loads(json.dumps(obj))
+
+
+def _play(match, encoder, until_ms=4_000, step_ms=50):
+    match.submit("W", move_data("PW_(6, 4)", (6, 4), (4, 4)))
+    match.submit("B", move_data("PB_(1, 3)", (1, 3), (3, 3)))
+    for t in range(step_ms, until_ms, step_ms):
+        if match.tick(t) and encoder.encode(match.state()) is not None:
+            yield encoder.message
+
+
+# ---------------------------------------------------------------------------
+#                          SINGLE MESSAGES
+# ---------------------------------------------------------------------------
+
+
+@pytest.mark.parametrize("data", [
+    None,
+    move_data("PW_(6, 4)", (6, 4), (4, 4)),
+    dict(move_data("NB_(0, 1)", (0, 1), (2, 2)), timestamp=1234567),
+    {"piece_id": "KW_(7, 4)", "type": "jump", "params": []},
+    {"match_id": "room-7"},
+    {"codecs": [CODEC_BINARY, CODEC_JSON]},
+])
+def test_client_message_round_trip(data):
+    msg = ClientMessage(MESSAGE_TYPES["MOVE"], "user1", data)
+    assert decode_client_message(encode_client_message(msg)) == msg
+
+
+def test_game_state_round_trip_matches_json():
+    match = ServerMatch(PIECES_ROOT)
+    match.submit("W", move_data("PW_(6, 4)", (6, 4), (4, 4)))
+    match.tick(500)
+    state = match.state()
+
+    data = encode_game_state(state)
+    assert decode_game_state(data).to_dict() == _as_json(state.to_dict())
+    assert len(data) * 4 < len(json.dumps(state.to_dict()))
+
+
+def test_response_round_trip():
+    state = ServerMatch(PIECES_ROOT).state()
+    for resp in (ServerResponse(True, "Game state", game_state=state),
+                 ServerResponse(False, "Spectators cannot move", error_code="NOT_A_PLAYER")):
+        decoded = decode_response(encode_response(resp))
+        assert _as_json(decoded.to_dict()) == _as_json(resp.to_dict())
+
+
+def test_bad_frames_are_rejected():
+    data = bytearray(encode_client_message(ClientMessage("join", "p", {"match_id": "x"})))
+    with pytest.raises(WireFormatError):
+        decode_client_message(bytes(data[:-3]))
+    data[1] = 99  # unknown version
+    with pytest.raises(WireFormatError, match="version"):
+        decode_client_message(bytes(data))
+    with pytest.raises(WireFormatError):
+        decode_game_state(encode_client_message(ClientMessage("join", "p")))
+
+
+def test_negotiate():
+    assert negotiate([CODEC_BINARY, CODEC_JSON]) == CODEC_BINARY
+    assert negotiate(["kfc-bin/99", CODEC_JSON]) == CODEC_JSON
+    assert negotiate(None) == CODEC_JSON
+
+
+# ---------------------------------------------------------------------------
+#                          UPDATE STREAMS
+# ---------------------------------------------------------------------------
+
+
+def test_binary_stream_matches_json_stream():
+    match, encoder = ServerMatch(PIECES_ROOT), StateDeltaEncoder(keyframe_every=5)
+    wire, wire_decoder = UpdateEncoder(), WireDecoder()
+    json_side, binary_side = StateDeltaDecoder(), StateDeltaDecoder()
+    json_bytes = binary_bytes = 0
+
+    encoder.encode(match.state())
+    for msg in [encoder.message] + list(_play(match, encoder)):
+        text, frame = json.dumps(msg), wire.encode(msg)
+        json_bytes += len(text)
+        binary_bytes += len(frame)
+        assert wire_decoder.decode(frame) == json.loads(text)
+        json_side.apply(json.loads(text))
+        binary_side.apply(wire_decoder.decode(frame))
+
+    assert binary_side.state == json_side.state
+    assert binary_bytes * 4 < json_bytes
+
+
+def test_late_joiners_and_gaps():
+    match, encoder, wire = ServerMatch(PIECES_ROOT), StateDeltaEncoder(), UpdateEncoder()
+    first = wire.encode(json.loads(encoder.encode(match.state())))
+    frames = [wire.encode(m) for m in _play(match, encoder)]
+
+    late = WireDecoder()
+    late.decode(wire.encode(encoder.keyframe_message()))
+    assert late.strings == wire._strings.strings
+
+    # a client that missed a frame (and the strings it introduced) resyncs
+    gap, decoder = WireDecoder(), StateDeltaDecoder()
+    decoder.apply(gap.decode(first))
+    for frame in frames[1:]:
+        assert decoder.apply(gap.decode(frame)) is None
+    assert decoder.needs_resync
+
+
+# ---------------------------------------------------------------------------
+#                          NEGOTIATION ON THE SERVER
+# ---------------------------------------------------------------------------
+
+
+def test_hello_switches_one_connection_to_binary():
+    server = ChessServer(PIECES_ROOT, clock=lambda: 0.0)
+    binary, plain = FakeSocket(), FakeSocket()
+
+    async def scenario():
+        server.connect("bin", binary)
+        server.connect("txt", plain)
+        hello = ClientMessage(MESSAGE_TYPES["HELLO"], "p", {"codecs": [CODEC_BINARY, CODEC_JSON]})
+        server.handle_text("bin", json.dumps(hello.to_dict()))
+        move = ClientMessage(MESSAGE_TYPES["MOVE"], "p", move_data("PW_(6, 4)", (6, 4), (4, 4)))
+        server.handle_text("bin", encode_client_message(move))
+        for t in range(50, 3_000, 50):
+            server.tick(t)
+        for outbox in server.clients.values():
+            await outbox.drain()
+    asyncio.run(scenario())
+
+    # the reply to hello is still JSON, then a binary keyframe starts the new stream
+    assert json.loads(binary.sent[1])["message"] == CODEC_BINARY
+    assert all(isinstance(m, bytes) for m in binary.sent[2:])
+    wire, decoder = WireDecoder(), StateDeltaDecoder()
+    assert wire.decode(binary.sent[3])["success"]  # the move's reply
+    for frame in [binary.sent[2]] + binary.sent[4:]:
+        assert decoder.apply(wire.decode(frame)) is not None
+    assert decoder.state.pieces["PW_(6, 4)"]["position"] == [4, 4]
+
+    assert all(isinstance(m, str) for m in plain.sent)
+    assert sum(map(len, binary.sent[4:])) * 3 < sum(map(len, plain.sent[1:]))
@@ -0,0 +1,114 @@
+"""
+Fixed-timestep scheduler for the game loop.
+Paces simulation ticks and rendering independently instead of spinning.
+"""
+from typing import Callable, Dict, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TICK_HZ = 60.0
+DEFAULT_RENDER_HZ = 30.0
+DEFAULT_MAX_CATCHUP_TICKS = 5
+
+
+class TickScheduler:
+    """
+    Decides *when* the game loop runs its next tick and whether a frame
+    should be rendered on that tick.
+
+    All times are in game milliseconds as returned by *now_ms*; *sleep_ms*
+    is responsible for converting a game-time delay into a real wait.
+
+    When a tick starts late the loop does not sleep until it is back on
+    schedule (catch-up).  If it falls more than *max_catchup_ticks* behind
+    the schedule is re-anchored to *now* and the skipped ticks are counted
+    as dropped rather than replayed back-to-back.
+    """
+
+    def __init__(self,
+                 now_ms: Callable[[], int],
+                 sleep_ms: Callable[[float], None],
+                 tick_hz: Optional[float] = DEFAULT_TICK_HZ,
+                 render_hz: Optional[float] = DEFAULT_RENDER_HZ,
+                 max_catchup_ticks: int = DEFAULT_MAX_CATCHUP_TICKS):
+        if tick_hz is not None and tick_hz <= 0:
+            raise ValueError("tick_hz must be positive (or None for unthrottled)")
+        if render_hz is not None and render_hz <= 0:
+            raise ValueError("render_hz must be positive (or None to render every tick)")
+
+        self._now_ms = now_ms
+        self._sleep_ms = sleep_ms
+        self.tick_ms: Optional[float] = 1000.0 / tick_hz if tick_hz else None
+        self.render_ms: Optional[float] = 1000.0 / render_hz if render_hz else None
+        self.max_catchup_ticks = max_catchup_ticks
+
+        self._next_tick_ms: Optional[float] = None
+        self._next_render_ms: Optional[float] = None
+
+        # counters
+        self.ticks = 0
+        self.overruns = 0        # ticks that started after their deadline
+        self.dropped_ticks = 0   # ticks skipped when re-anchoring the schedule
+        self.frames_rendered = 0
+        self.frames_skipped = 0
+
+    def start(self):
+        """Anchor the schedule at the current time."""
+        now = self._now_ms()
+        self._next_tick_ms = now
+        self._next_render_ms = now
+
+    def wait_for_tick(self) -> int:
+        """Block until the next tick is due and return the current game time."""
+        if self._next_tick_ms is None:
+            self.start()
+
+        now = self._now_ms()
+        if self.tick_ms is None:
+            self.ticks += 1
+            return now
+
+        delay = self._next_tick_ms - now
+        if delay > 0:
+            self._sleep_ms(delay)
+            now = self._now_ms()
+        else:
+            behind = int(-delay // self.tick_ms)
+            if behind > 0:
+                self.overruns += 1
+            if behind > self.max_catchup_ticks:
+                self.dropped_ticks += behind - self.max_catchup_ticks
+                logger.debug("Tick overrun: %s ticks behind, re-anchoring schedule", behind)
+                self._next_tick_ms = now
+
+        self._next_tick_ms += self.tick_ms
+        self.ticks += 1
+        return now
+
+    def render_due(self, now_ms: int) -> bool:
+        """Return True if a frame should be drawn on the tick at *now_ms*."""
+        if self.render_ms is None:
+            self.frames_rendered += 1
+            return True
+        if self._next_render_ms is None:
+            self._next_render_ms = now_ms
+        if now_ms < self._next_render_ms:
+            self.frames_skipped += 1
+            return False
+
+        self._next_render_ms += self.render_ms
+        if self._next_render_ms <= now_ms:
+            # more than a whole frame behind – don't try to render the backlog
+            self._next_render_ms = now_ms + self.render_ms
+        self.frames_rendered += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "ticks": self.ticks,
+            "overruns": self.overruns,
+            "dropped_ticks": self.dropped_ticks,
+            "frames_rendered": self.frames_rendered,
+            "frames_skipped": self.frames_skipped,
+        }
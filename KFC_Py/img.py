@@ -55,6 +55,7 @@ class Img:
 
             print(f"[DEBUG] Resized {path} to {self.img.shape}")
 
+        self._prepare_blit()
         return self
 
     def copy(self):
@@ -62,17 +63,43 @@ class Img:
         new_img.img = self.img.copy()
         return new_img
 
-    def draw_on(self, other_img, x, y):
+    # ───────────────────────── blitting ─────────────────────────
+    def _prepare_blit(self):
+        """
+        Convert the pixels once into the form `draw_on` blends with:
+        BGR premultiplied by alpha and the inverse alpha, both uint16 so
+        ``premul + dst * inv_alpha`` (at most 255*255) cannot overflow.
+        Sprites without alpha, or with alpha 255 everywhere, are marked
+        opaque and copied without blending.
+        """
+        pix = self.img
+        if pix.ndim == 2:
+            pix = cv2.cvtColor(pix, cv2.COLOR_GRAY2BGR)
+        self._bgr = pix[..., :3]
+        self._premul = self._inv_alpha = None
+        self._opaque = pix.shape[2] < 4 or bool((pix[..., 3] == 255).all())
+        if not self._opaque:
+            alpha = pix[..., 3:4].astype(np.uint16)
+            self._premul = self._bgr.astype(np.uint16) * alpha
+            self._inv_alpha = 255 - alpha
+        self._blit_src = self.img
+
+    @property
+    def opaque(self) -> bool:
+        if getattr(self, "_blit_src", None) is not self.img:
+            self._prepare_blit()
+        return self._opaque
+
+    def draw_on(self, other_img, x, y, blend: bool = True):
+        """
+        Paste this image onto *other_img* with its top-left corner at (x, y).
+
+        Only the BGR channels of the destination are written.  Pixels are
+        alpha-blended unless the image is opaque or *blend* is False.
+        """
         if self.img is None or other_img.img is None:
             raise ValueError("Both images must be loaded before drawing.")
 
-        # Convert to match other_img's channel count BEFORE slicing
-        if self.img.shape[2] != other_img.img.shape[2]:
-            if self.img.shape[2] == 3 and other_img.img.shape[2] == 4:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGR2BGRA)
-            elif self.img.shape[2] == 4 and other_img.img.shape[2] == 3:
-                self.img = cv2.cvtColor(self.img, cv2.COLOR_BGRA2BGR)
-
         h, w = self.img.shape[:2]
         H, W = other_img.img.shape[:2]
 
@@ -84,15 +111,14 @@ class Img:
             print(f"[WARN] Skipping draw at ({x},{y}): roi size {(h, w)} exceeds board {(H, W)}")
             return
 
-        roi = other_img.img[y:y + h, x:x + w]
+        if getattr(self, "_blit_src", None) is not self.img:
+            self._prepare_blit()
 
-        if self.img.shape[2] == 4:
-            b, g, r, a = cv2.split(self.img)
-            mask = a / 255.0
-            for c in range(3):
-                roi[..., c] = (1 - mask) * roi[..., c] + mask * self.img[..., c]
+        roi = other_img.img[y:y + h, x:x + w, :3]
+        if self._opaque or not blend:
+            roi[...] = self._bgr
         else:
-            other_img.img[y:y + h, x:x + w] = self.img
+            roi[...] = (self._premul + roi * self._inv_alpha) // 255
 
     def put_text(self, txt, x, y, font_size, color=(255, 255, 255, 255), thickness=1):
         if self.img is None:
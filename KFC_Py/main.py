@@ -12,6 +12,6 @@ if __name__ == "__main__":
     # Import test events to register handlers
     import test_events
     
-    game = create_game("../pieces", ImgFactory())
+    game = create_game("../pieces", ImgFactory(), use_atlas=True)
     game.run()
 
@@ -7,6 +7,8 @@ import asyncio
 import websockets
 import json
 from shared_types import MESSAGE_TYPES, GameState
+from state_delta import StateDeltaDecoder, resync_request
+from wire_codec import SUPPORTED_CODECS, WireDecoder
 import threading
 import queue
 import time
@@ -53,6 +55,19 @@ async def listen_to_server():
     try:
         async with websockets.connect(WS_URL) as websocket:
             print("[CLIENT] Connected to server. Waiting for updates...")
+            # עדכונים בפורמט בינארי אם השרת תומך
+            await websocket.send(json.dumps({
+                "type": MESSAGE_TYPES["HELLO"],
+                "player_id": "user1",
+                "data": {"codecs": list(SUPPORTED_CODECS)}
+            }))
+            if len(sys.argv) > 1:
+                # מעבר לחדר משחק מסוים (ברירת מחדל: החדר הכללי)
+                await websocket.send(json.dumps({
+                    "type": MESSAGE_TYPES["JOIN"],
+                    "player_id": "user1",
+                    "data": {"match_id": sys.argv[1]}
+                }))
 
             # Start a thread to listen for local user input and send to server
             def input_sender():
@@ -73,12 +88,18 @@ async def listen_to_server():
 
             threading.Thread(target=input_sender, daemon=True).start()
 
+            decoder = StateDeltaDecoder()
+            wire = WireDecoder()
             async for message in websocket:
                 try:
-                    msg_obj = json.loads(message)
-                    if msg_obj.get("type") == MESSAGE_TYPES["GAME_UPDATE"]:
-                        gs = GameState.from_dict(msg_obj["game_state"])
-                        draw_board_from_gamestate(gs)
+                    msg_obj = wire.decode(message) if isinstance(message, bytes) else json.loads(message)
+                    if msg_obj.get("type") in (MESSAGE_TYPES["GAME_UPDATE"], MESSAGE_TYPES["GAME_DELTA"]):
+                        gs = decoder.apply(msg_obj)
+                        if gs is not None:
+                            draw_board_from_gamestate(gs)
+                        elif decoder.needs_resync:
+                            # פספסנו עדכון - מבקשים מצב מלא
+                            await websocket.send(json.dumps(resync_request("user1")))
                     else:
                         print(f"[CLIENT] Received: {msg_obj}")
                 except Exception as e:
@@ -0,0 +1,144 @@
+"""
+Per-client outbound queues for the websocket server.
+Each connection gets a `ClientOutbox` with its own writer task, so a
+broadcast only appends to queues and one slow socket never holds up the
+others.  A client that falls behind has its stale state updates replaced
+by a single keyframe; one that stays stuck is disconnected.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Callable, Deque, Optional, Tuple, Union
+
+from wire_codec import CODEC_JSON
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_QUEUE = 16        # queued messages before state updates are coalesced
+DEFAULT_MAX_BACKLOG = 64      # queued messages (after coalescing) before disconnecting
+DEFAULT_SEND_TIMEOUT_S = 5.0  # a single send taking longer than this disconnects
+
+# websocket close codes
+CLOSE_NORMAL = 1000
+CLOSE_TRY_AGAIN_LATER = 1013  # the client fell too far behind
+
+Frame = Union[str, bytes]  # a text or binary websocket message
+
+
+class ClientOutbox:
+    """
+    Bounded, coalescing send queue in front of one websocket.
+
+    `send` queues a message that must arrive (a reply, a keyframe);
+    `send_update` queues a state update that later state supersedes.  When
+    more than *max_queue* messages are waiting, every queued update is
+    dropped and replaced by one keyframe from *keyframe* – the client's
+    decoder resets on it.  A *keyframe* that returns None only drops them;
+    the client then sees a gap and asks for a resync.  Replies are never dropped: more than
+    *max_backlog* waiting messages, or a send that does not finish in
+    *send_timeout_s*, closes the connection with code 1013 ("try again
+    later") and calls *on_close* with this outbox.
+    """
+
+    def __init__(self, websocket, on_close: Optional[Callable[["ClientOutbox"], None]] = None,
+                 max_queue: int = DEFAULT_MAX_QUEUE, max_backlog: int = DEFAULT_MAX_BACKLOG,
+                 send_timeout_s: float = DEFAULT_SEND_TIMEOUT_S):
+        if max_queue < 1 or max_backlog < max_queue:
+            raise ValueError("need 1 <= max_queue <= max_backlog")
+        self.websocket = websocket
+        self.on_close = on_close
+        self.max_queue = max_queue
+        self.max_backlog = max_backlog
+        self.send_timeout_s = send_timeout_s
+        self._queue: Deque[Tuple[Frame, bool]] = deque()  # (message, is_state_update)
+        self._ready = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._in_flight = False
+        self.closed = False
+        self.codec = CODEC_JSON  # wire codec negotiated for this connection
+
+        # counters
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    # ───────────────────────── producer side ─────────────────────────
+    def start(self):
+        if self._writer is None:
+            self._writer = asyncio.get_running_loop().create_task(self._write_loop())
+
+    def send(self, text: Frame):
+        """Queue a message that must be delivered."""
+        self._push(text, False, None)
+
+    def send_update(self, text: Frame, keyframe: Callable[[], Optional[Frame]]):
+        """Queue a state update; *keyframe* supplies the full state if the client lags."""
+        self._push(text, True, keyframe)
+
+    def _push(self, text: Frame, is_update: bool, keyframe: Optional[Callable[[], Optional[Frame]]]):
+        if self.closed:
+            return
+        self._queue.append((text, is_update))
+        if len(self._queue) > self.max_queue and keyframe is not None:
+            kept = deque(item for item in self._queue if not item[1])
+            self.dropped += len(self._queue) - len(kept)
+            full = keyframe()
+            if full is not None:
+                kept.append((full, True))  # superseded in turn by a later keyframe
+            self._queue = kept
+            self.coalesced += 1
+        if len(self._queue) > self.max_backlog:
+            logger.warning("Client backlog of %s messages – disconnecting", len(self._queue))
+            self.close(CLOSE_TRY_AGAIN_LATER)
+            return
+        self._ready.set()
+
+    # ───────────────────────── writer side ─────────────────────────
+    async def _write_loop(self):
+        try:
+            while not self.closed:
+                if not self._queue:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                text, _ = self._queue.popleft()
+                self._in_flight = True
+                await asyncio.wait_for(self.websocket.send(text), self.send_timeout_s)
+                self._in_flight = False
+                self.sent += 1
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            logger.warning("Client send timed out – disconnecting")
+            self.close(CLOSE_TRY_AGAIN_LATER)
+        except Exception as e:
+            logger.info("Client send failed: %r", e)
+            self.close()
+
+    def close(self, code: int = CLOSE_NORMAL):
+        """Stop sending, drop the queue and close the socket with *code* (idempotent)."""
+        if self.closed:
+            return
+        self.closed = True
+        self._queue.clear()
+        self._ready.set()
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:  # no running loop – nothing left to cancel or close with
+            loop = None
+        if loop is not None:
+            if self._writer is not None and self._writer is not asyncio.current_task():
+                self._writer.cancel()
+            close = getattr(self.websocket, "close", None)
+            if close is not None:
+                loop.create_task(close(code=code))
+        if self.on_close is not None:
+            self.on_close(self)
+
+    async def drain(self):
+        """Wait until everything queued so far has been written (for tests and shutdown)."""
+        while (self._queue or self._in_flight) and not self.closed:
+            await asyncio.sleep(0)
@@ -183,7 +183,8 @@ import json
 import sys
 import pathlib
 import logging
-from typing import Dict
+import time
+from typing import Dict, Optional
 
 # הגדרת לוגים
 logging.basicConfig(level=logging.INFO)
@@ -192,147 +193,210 @@ logger = logging.getLogger(__name__)
 # הוספת תיקיית KFC_Py לפייתון פאת'
 sys.path.append(str(pathlib.Path(__file__).parent / "KFC_Py"))
 
-from shared_types import GameState, ServerResponse, ClientMessage, MESSAGE_TYPES, PLAYERS
-from KFC_Py.Board import Board
-from KFC_Py.PieceFactory import PieceFactory
-from KFC_Py.GraphicsFactory import GraphicsFactory, ImgFactory
-from KFC_Py.img import Img
-
-
-# ---------------- אתחול מצב משחק ----------------
-def init_gamestate_from_csv():
-    pieces_dir = pathlib.Path(__file__).parent / "pieces"
-    board_img_path = pieces_dir / "board.png"
-    board_csv_path = pieces_dir / "board.csv"
-    if not board_img_path.exists() or not board_csv_path.exists():
-        print("[SERVER] board.png or board.csv not found! (משחק יתחיל ריק)")
-        return GameState(
-            pieces={},
-            pos_to_piece={},
-            current_player=PLAYERS["WHITE"],
-            game_time_ms=0,
-            white_score=0,
-            black_score=0,
-            game_ended=False,
-            winner=None,
-            last_move=None
-        )
-    board_img = Img().read(str(board_img_path))
-    board = Board(
-        cell_H_pix=100,
-        cell_W_pix=100,
-        W_cells=8,
-        H_cells=8,
-        img=board_img
-    )
-    gfx_factory = GraphicsFactory(ImgFactory())
-    pf = PieceFactory(board, pieces_dir, graphics_factory=gfx_factory)
-    pieces = {}
-    pos_to_piece = {}
-    with open(board_csv_path) as f:
-        for r, line in enumerate(f):
-            for c, code in enumerate(line.strip().split(",")):
-                if code:
-                    piece = pf.create_piece(code, (r, c))
-                    pieces[piece.id] = {
-                        "id": code,
-                        "position": (r, c),
-                        "unique_id": piece.id
-                    }
-                    pos_to_piece[f"{r},{c}"] = piece.id
-    return GameState(
-        pieces=pieces,
-        pos_to_piece=pos_to_piece,
-        current_player=PLAYERS["WHITE"],
-        game_time_ms=0,
-        white_score=0,
-        black_score=0,
-        game_ended=False,
-        winner=None,
-        last_move=None
-    )
+from shared_types import ServerResponse, ClientMessage, MESSAGE_TYPES
+from server_match import ServerMatch, PIECES_DIR
+from server_room import Room, DEFAULT_ROOM
+from client_outbox import ClientOutbox
+from wire_codec import CODEC_BINARY, decode_client_message, encode_response, negotiate
+from SimulationEngine import SimulationEngine
+
+SERVER_TICK_HZ = 30  # server simulation ticks per second
 
 
 # ---------------- מחלקת השרת ----------------
 class ChessServer:
-    def __init__(self):
-        self.clients: Dict[str, websockets.WebSocketServerProtocol] = {}
-        self.game_state = init_gamestate_from_csv()
+    """
+    Hosts any number of independent matches, each in its own `Room`, and is
+    the only place their rules run.
+
+    Connections start in the ``default`` room and move with a JOIN whose
+    data names a ``match_id`` (the room is opened on first use and closed
+    when its last client leaves).  In each room the first two connections
+    are seated as White and Black, later ones watch.  Messages are routed to
+    the sender's room; `tick_loop` advances every room on one event loop and
+    queues an update wherever a tick changed something.  Every connection
+    writes through its own `ClientOutbox`, so a broadcast never waits on a
+    socket; a ``hello`` can switch it to the binary `wire_codec` format.
+    """
+
+    def __init__(self, pieces_root: str | pathlib.Path = PIECES_DIR, tick_hz: float = SERVER_TICK_HZ,
+                 clock=time.monotonic):
+        # one engine for all rooms: piece templates are parsed once per process
+        self.engine = SimulationEngine(pieces_root)
+        self.rooms: Dict[str, Room] = {}
+        self.clients: Dict[str, ClientOutbox] = {}
+        self.client_room: Dict[str, str] = {}  # client id -> match id
+        self.tick_hz = tick_hz
+        self._clock = clock
+        self._start = clock()
         logger.info("✅ ChessServer initialized")
 
+    def now_ms(self) -> int:
+        return int((self._clock() - self._start) * 1000)
+
+    # ---------------- חדרים ----------------
+    def room(self, match_id: str) -> Room:
+        """The room for *match_id*, opened now if it does not exist yet."""
+        room = self.rooms.get(match_id)
+        if room is None:
+            room = Room(match_id, ServerMatch(engine=self.engine), started_ms=self.now_ms())
+            self.rooms[match_id] = room
+            logger.info(f"🏠 Opened room {match_id} ({len(self.rooms)} rooms)")
+        return room
+
+    def room_of(self, client_id: str) -> Optional[Room]:
+        match_id = self.client_room.get(client_id)
+        return self.rooms.get(match_id) if match_id is not None else None
+
+    def join(self, client_id: str, match_id: str) -> Optional[str]:
+        """Move a connection into *match_id*; returns its colour (None = spectator)."""
+        if self.client_room.get(client_id) == match_id:
+            return self.rooms[match_id].seats.get(client_id)
+        self._leave(client_id)
+        room = self.room(match_id)
+        self.client_room[client_id] = match_id
+        return room.add(client_id, self.clients[client_id])
+
+    def _leave(self, client_id: str):
+        room = self.room_of(client_id)
+        self.client_room.pop(client_id, None)
+        if room is None:
+            return
+        room.remove(client_id)
+        if not room.members:
+            del self.rooms[room.match_id]
+            logger.info(f"🏚 Closed room {room.match_id}")
+
+    def metrics(self) -> Dict[str, dict]:
+        return {match_id: room.metrics() for match_id, room in self.rooms.items()}
+
+    # ---------------- חיבורים ----------------
+    def connect(self, client_id: str, websocket, match_id: str = DEFAULT_ROOM) -> ClientOutbox:
+        """Register a connection (must run on the event loop) in *match_id*."""
+        outbox = ClientOutbox(websocket, on_close=lambda _: self._disconnect(client_id))
+        outbox.start()
+        return self.add_client(client_id, outbox, match_id)
+
+    def add_client(self, client_id: str, outbox, match_id: str = DEFAULT_ROOM):
+        """Register *outbox* (anything with ``send`` / ``send_update``) as a client in *match_id*."""
+        self.clients[client_id] = outbox
+        color = self.join(client_id, match_id)
+        logger.info(f"🔗 New client connected: {client_id} in {match_id} ({color or 'spectator'})")
+        return outbox
+
+    def _disconnect(self, client_id: str):
+        self._leave(client_id)
+        self.clients.pop(client_id, None)
+
     async def handle_client(self, websocket):
         """טיפול בחיבור לקוח חדש"""
         player_id = str(id(websocket))  # מזהה זמני
-        self.clients[player_id] = websocket
-        logger.info(f"🔗 New client connected: {player_id}")
-
-        # שליחת מצב פתיחה
-        await websocket.send(json.dumps({
-            "type": MESSAGE_TYPES["GAME_UPDATE"],
-            "game_state": self.game_state.to_dict()
-        }))
+        outbox = self.connect(player_id, websocket)
 
         try:
             async for message in websocket:
-                try:
-                    data = json.loads(message)
-                    client_msg = ClientMessage.from_dict(data)
-                    logger.info(f"📨 Received {client_msg.type} from {player_id}")
-
-                    resp, broadcast = self.handle_message(client_msg)
-
-                    # שליחת תשובה אישית
-                    await websocket.send(json.dumps(resp.to_dict()))
-
-                    # אם צריך לשדר לכולם
-                    if broadcast:
-                        await self.broadcast_game_update()
-
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    await websocket.send(json.dumps({
-                        "success": False,
-                        "message": f"Server error: {e}"
-                    }))
+                self.handle_text(player_id, message)
         finally:
             logger.info(f"❌ Client disconnected: {player_id}")
-            if player_id in self.clients:
-                del self.clients[player_id]
+            outbox.close()
 
-    def handle_message(self, msg: ClientMessage):
-        broadcast = False
+    def handle_text(self, client_id: str, message):
+        """Answer one raw message (JSON text or a binary frame) from *client_id* through its outbox."""
+        outbox = self.clients[client_id]
+        try:
+            if isinstance(message, bytes):
+                client_msg = decode_client_message(message)
+            else:
+                client_msg = ClientMessage.from_dict(json.loads(message))
+            logger.debug(f"📨 Received {client_msg.type} from {client_id}")
+
+            # לקוח שפספס עדכון מקבל מצב מלא
+            if client_msg.type == MESSAGE_TYPES["RESYNC"]:
+                room = self.room_of(client_id)
+                if room is not None:
+                    outbox.send(room.keyframe_for(outbox))
+                    return
+                # מחוץ לחדר: handle_message עונה NO_ROOM
+
+            # בחירת פורמט: התשובה עוד ב-JSON, מכאן והלאה בפורמט שנבחר
+            if client_msg.type == MESSAGE_TYPES["HELLO"]:
+                codec = negotiate((client_msg.data or {}).get("codecs"))
+                outbox.send(json.dumps(ServerResponse(success=True, message=codec).to_dict()))
+                outbox.codec = codec
+                room = self.room_of(client_id)
+                if room is not None:
+                    outbox.send(room.keyframe_for(outbox))
+                return
+
+            resp, _ = self.handle_message(client_msg, client_id)
+
+            # שליחת תשובה אישית
+            outbox.send(self._encode_response(outbox, resp))
+
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            outbox.send(self._encode_response(outbox, ServerResponse(success=False, message=f"Server error: {e}")))
+
+    @staticmethod
+    def _encode_response(outbox, resp: ServerResponse):
+        if outbox.codec == CODEC_BINARY:
+            return encode_response(resp)
+        return json.dumps(resp.to_dict())
+
+    def handle_message(self, msg: ClientMessage, client_id: Optional[str] = None):
+        """
+        Answer one client message in the sender's room; returns
+        ``(response, broadcast)``.  Moves are only validated and batched
+        here – the room's next tick applies them in arrival order and
+        broadcasts the state they produce once.
+        """
+        if msg.type == MESSAGE_TYPES["JOIN"] and client_id in self.clients:
+            match_id = str((msg.data or {}).get("match_id", DEFAULT_ROOM))
+            color = self.join(client_id, match_id)
+            text = f"Seated as {color}" if color else "Spectating"
+            return ServerResponse(success=True, message=f"{text} in {match_id}"), False
+
+        room = self.room_of(client_id)
+        if room is None:
+            return ServerResponse(success=False, message="Not in a room", error_code="NO_ROOM"), False
         if msg.type == MESSAGE_TYPES["GET_STATE"]:
-            return ServerResponse(success=True, message="Game state", game_state=self.game_state), False
+            return ServerResponse(success=True, message="Game state", game_state=room.game_state), False
         elif msg.type == MESSAGE_TYPES["MOVE"]:
-            prev = self.game_state.current_player
-            self.game_state.current_player = PLAYERS["BLACK"] if prev == PLAYERS["WHITE"] else PLAYERS["WHITE"]
-            self.game_state.last_move = msg.data
-            broadcast = True
-            return ServerResponse(success=True, message="Move accepted", game_state=self.game_state), broadcast
+            ok, text, code = room.submit(client_id, msg.data, self.now_ms())
+            return ServerResponse(success=ok, message=text, error_code=code), False
         else:
             return ServerResponse(success=False, message="Unknown message type", error_code="UNKNOWN_TYPE"), False
 
-    async def broadcast_game_update(self):
-        msg = {
-            "type": MESSAGE_TYPES["GAME_UPDATE"],
-            "game_state": self.game_state.to_dict()
-        }
-        dead = []
-        for pid, ws in self.clients.items():
-            try:
-                await ws.send(json.dumps(msg))
-            except:
-                dead.append(pid)
-        for pid in dead:
-            del self.clients[pid]
+    # ---------------- טיקים ----------------
+    def tick(self, now_ms: Optional[int] = None) -> int:
+        """Advance every room to server time *now_ms*; returns how many changed."""
+        now_ms = self.now_ms() if now_ms is None else now_ms
+        return sum(room.tick(now_ms) for room in list(self.rooms.values()))
+
+    async def tick_loop(self):
+        """Tick all rooms at `tick_hz` on this event loop."""
+        period = 1.0 / self.tick_hz
+        next_tick = self._clock()
+        while True:
+            self.tick()
+            next_tick += period
+            await asyncio.sleep(max(0.0, next_tick - self._clock()))
 
 
 # ---------------- main ----------------
-async def main():
+async def main(workers: int = 0):
+    if workers:
+        from server_shards import serve  # one front process, rooms sharded over workers
+        await serve(workers)
+        return
     server = ChessServer()
     print("🌐 Starting Chess Server on ws://localhost:8889")
     async with websockets.serve(server.handle_client, "localhost", 8889):
-        await asyncio.Future()  # Run forever
+        await server.tick_loop()  # Run forever
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    import argparse
+    parser = argparse.ArgumentParser(description="Kung Fu Chess server")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="shard rooms over this many worker processes (0 = single process)")
+    asyncio.run(main(parser.parse_args().workers))
@@ -0,0 +1,191 @@
+"""
+Authoritative match simulation for the websocket server.
+Each `ServerMatch` owns a headless `Game` on a `ManualClock`.  Clients only
+submit commands; the server checks them against the rules before queueing
+them, and its tick advances the game, resolves collisions and reports
+whether the state changed.
+"""
+import logging
+import pathlib
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+sys.path.append(str(pathlib.Path(__file__).parent / "KFC_Py"))
+
+from shared_types import GameState, PLAYERS
+from Command import Command
+from EventType import EventType
+from MessageBroker import MessageBroker
+from SimulationEngine import SimulationEngine
+
+logger = logging.getLogger(__name__)
+
+PIECES_DIR = pathlib.Path(__file__).parent / "pieces"
+
+# Same values the UI scores captures with
+PIECE_VALUES = {"P": 1, "N": 3, "B": 3, "R": 5, "Q": 9, "K": 0}
+
+# ServerResponse.error_code values for rejected commands
+GAME_OVER = "GAME_OVER"
+BAD_COMMAND = "BAD_COMMAND"
+UNKNOWN_PIECE = "UNKNOWN_PIECE"
+NOT_YOUR_PIECE = "NOT_YOUR_PIECE"
+ILLEGAL_MOVE = "ILLEGAL_MOVE"
+
+
+class ServerMatch:
+    """
+    One match, simulated on the server.
+
+    Game time is a `ManualClock` that only the server moves, through `tick`;
+    nothing sleeps and no threads are started, so many matches can share one
+    asyncio process.  Commands accepted by `submit` are stamped with the
+    game time they were received at and collected into a batch; the next
+    tick applies the whole batch in timestamp order, so a burst of moves
+    costs one state change and one update.  A piece takes at most one
+    command per batch.
+    """
+
+    def __init__(self, pieces_root: str | pathlib.Path = PIECES_DIR,
+                 board_csv: str | pathlib.Path | None = None,
+                 engine: Optional[SimulationEngine] = None):
+        self.engine = engine or SimulationEngine(pieces_root, board_csv=board_csv)
+        self.broker = MessageBroker()
+        self.game = self.engine.new_game(self.broker)
+        self.clock = self.game.clock
+        self.game._schedule_all_wakeups(self.clock.now_ms())
+
+        self.white_score = 0
+        self.black_score = 0
+        self.current_player = PLAYERS["WHITE"]
+        self.last_move: Optional[Dict[str, Any]] = None
+        self.winner: Optional[str] = None
+
+        # commands waiting for the next tick: (received_ms, arrival, color, command)
+        self._batch: List[Tuple[int, int, str, Command]] = []
+        self._batched_pieces: Set[str] = set()
+        self._arrivals = 0
+        self.last_batch = 0  # commands applied by the last tick
+        self.max_batch = 0
+        self.broker.subscribe(EventType.PIECE_CAPTURED, self._on_capture)
+
+    @property
+    def game_ended(self) -> bool:
+        return self.winner is not None
+
+    # ───────────────────────── input ─────────────────────────
+    def submit(self, color: str, data: Optional[Dict[str, Any]],
+               received_ms: Optional[int] = None) -> Tuple[bool, str, Optional[str]]:
+        """
+        Validate a client's ``move``/``jump`` (``{"piece_id", "type", "params"}``)
+        for the side *color* and add it to the next tick's batch.  *received_ms*
+        is the game time it arrived at (default: the last tick's).
+
+        Returns ``(accepted, message, error_code)``.
+        """
+        if self.game_ended:
+            return False, "Game is over", GAME_OVER
+        try:
+            piece_id = data["piece_id"]
+            cmd_type = data["type"]
+            params = [tuple(cell) for cell in data.get("params") or ()]
+        except (KeyError, TypeError, ValueError):
+            return False, "Malformed command", BAD_COMMAND
+        if cmd_type not in ("move", "jump"):
+            return False, f"Unsupported command {cmd_type!r}", BAD_COMMAND
+
+        piece = self.game.piece_by_id.get(piece_id)
+        if piece is None or piece not in self.game.pieces:
+            return False, f"No piece {piece_id}", UNKNOWN_PIECE
+        if self.game._side_of(piece_id) != color:
+            return False, f"{piece_id} is not yours", NOT_YOUR_PIECE
+        if piece_id in self._batched_pieces:
+            return False, f"{piece_id} already has a command this tick", ILLEGAL_MOVE
+
+        state = piece.state
+        if cmd_type not in state.transitions:
+            return False, f"{piece_id} cannot {cmd_type} while in {state.name}", ILLEGAL_MOVE
+        src = piece.current_cell()
+        if cmd_type == "move":
+            if not params:
+                return False, "Move needs a destination", BAD_COMMAND
+            dst = params[-1]
+            if state.moves is None or not state.moves.is_valid(
+                    src, dst, self.game.pos, state.physics.is_need_clear_path(), color):
+                return False, f"Illegal move {src} -> {dst}", ILLEGAL_MOVE
+            params = [src, dst]
+        else:
+            params = [src]
+
+        # never before the last tick: pieces have already been advanced to it
+        received_ms = max(received_ms or 0, self.clock.now_ms())
+        self._batch.append((received_ms, self._arrivals, color, Command(received_ms, piece_id, cmd_type, params)))
+        self._arrivals += 1
+        self._batched_pieces.add(piece_id)
+        return True, "Move accepted", None
+
+    @property
+    def pending(self) -> List[Command]:
+        """The commands batched for the next tick, in the order it will apply them."""
+        return [cmd for *_, cmd in sorted(self._batch)]
+
+    def _apply_batch(self, now_ms: int):
+        self._batch.sort()
+        for _, _, color, cmd in self._batch:
+            cmd.timestamp = min(cmd.timestamp, now_ms)
+            self.game.user_input_queue.put(cmd)
+            self.last_move = {"piece_id": cmd.piece_id, "type": cmd.type, "params": cmd.params}
+            self.current_player = PLAYERS["BLACK"] if color == PLAYERS["WHITE"] else PLAYERS["WHITE"]
+        self.last_batch = len(self._batch)
+        self.max_batch = max(self.max_batch, self.last_batch)
+        self._batch.clear()
+        self._batched_pieces.clear()
+
+    # ───────────────────────── simulation ─────────────────────────
+    def tick(self, now_ms: int) -> bool:
+        """Advance the game to *now_ms* and apply queued commands; True if anything changed."""
+        if self.game_ended:
+            return False
+        now_ms = max(now_ms, self.clock.now_ms())
+        self.clock.set(now_ms)
+        self._apply_batch(now_ms)
+        changed = self.game._advance_and_apply_input(now_ms)
+        if changed:
+            self.game._resolve_collisions()
+            if self.game._is_win():
+                self.winner = SimulationEngine._winner(self.game)
+                self.game.event_publisher.publish_game_ended(self.winner, "king captured")
+                logger.info("Match over – winner %s", self.winner)
+        return changed
+
+    def _on_capture(self, _event_type, data):
+        points = PIECE_VALUES.get(data.captured_piece_id[0], 0)
+        if data.capturing_piece_id[1] == PLAYERS["WHITE"]:
+            self.white_score += points
+        else:
+            self.black_score += points
+
+    # ───────────────────────── output ─────────────────────────
+    def state(self) -> GameState:
+        pieces = {}
+        pos_to_piece = {}
+        for p in self.game.pieces:
+            cell = p.current_cell()
+            pieces[p.id] = {
+                "id": p.id.split("_")[0],
+                "position": cell,
+                "unique_id": p.id,
+                "state": p.state.name,
+            }
+            pos_to_piece[f"{cell[0]},{cell[1]}"] = p.id
+        return GameState(
+            pieces=pieces,
+            pos_to_piece=pos_to_piece,
+            current_player=self.current_player,
+            game_time_ms=self.clock.now_ms(),
+            white_score=self.white_score,
+            black_score=self.black_score,
+            game_ended=self.game_ended,
+            winner=self.winner,
+            last_move=self.last_move,
+        )
@@ -0,0 +1,148 @@
+"""
+A match room on the websocket server.
+Bundles one `ServerMatch` with the connections watching it: seated
+players, spectators, the room's delta encoder and its counters.
+"""
+import logging
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from shared_types import GameState, PLAYERS
+from client_outbox import ClientOutbox
+from server_match import ServerMatch
+from state_delta import StateDeltaEncoder
+from wire_codec import CODEC_BINARY, UpdateEncoder
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROOM = "default"  # where connections land until they JOIN a match
+
+
+class Room:
+    """
+    One match and its audience.
+
+    *started_ms* is the server time the room was opened at; the match clock
+    counts from there, so every room starts its game at 0 ms.
+    """
+
+    def __init__(self, match_id: str, match: ServerMatch, started_ms: int = 0):
+        self.match_id = match_id
+        self.match = match
+        self.started_ms = started_ms
+        self.members: Dict[str, ClientOutbox] = {}
+        self.seats: Dict[str, str] = {}  # client id -> "W" / "B"
+        self.game_state: GameState = match.state()
+        self.encoder = StateDeltaEncoder()
+        self.encoder.encode(self.game_state)  # first keyframe
+        self.wire = UpdateEncoder()  # binary form of the same stream, for clients that negotiated it
+        self._wire_keyframe: Optional[Tuple[int, bytes]] = None
+
+        # counters
+        self.ticks = 0
+        self.changed_ticks = 0
+        self.updates = 0
+        self.bytes_out = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.tick_s = 0.0
+
+    def __len__(self):
+        return len(self.members)
+
+    # ───────────────────────── membership ─────────────────────────
+    def add(self, client_id: str, outbox: ClientOutbox) -> Optional[str]:
+        """Admit a connection, seat it if a colour is free and queue the current keyframe."""
+        self.members[client_id] = outbox
+        color = self._take_seat(client_id)
+        outbox.send(self.keyframe_for(outbox))
+        return color
+
+    def remove(self, client_id: str):
+        self.members.pop(client_id, None)
+        self.seats.pop(client_id, None)
+
+    def _take_seat(self, client_id: str) -> Optional[str]:
+        taken = set(self.seats.values())
+        for color in (PLAYERS["WHITE"], PLAYERS["BLACK"]):
+            if color not in taken:
+                self.seats[client_id] = color
+                return color
+        return None
+
+    def keyframe_for(self, outbox):
+        """The current full state in *outbox*'s wire codec."""
+        if outbox.codec == CODEC_BINARY:
+            return self._binary_keyframe()
+        return self.encoder.keyframe()
+
+    def _binary_keyframe(self) -> bytes:
+        if self._wire_keyframe is None or self._wire_keyframe[0] != self.encoder.seq:
+            self._wire_keyframe = (self.encoder.seq, self.wire.encode(self.encoder.keyframe_message()))
+        return self._wire_keyframe[1]
+
+    # ───────────────────────── play ─────────────────────────
+    def submit(self, client_id: str, data: Optional[Dict[str, Any]], server_now_ms: Optional[int] = None):
+        """
+        Validate a seated client's command and batch it for the next tick;
+        ``(accepted, message, error_code)``.  *server_now_ms* is when it arrived.
+        """
+        color = self.seats.get(client_id)
+        if color is None:
+            self.rejected += 1
+            return False, "Spectators cannot move", "NOT_A_PLAYER"
+        received_ms = None if server_now_ms is None else server_now_ms - self.started_ms
+        result = self.match.submit(color, data, received_ms)
+        if result[0]:
+            self.accepted += 1
+        else:
+            self.rejected += 1
+        return result
+
+    def tick(self, server_now_ms: int) -> bool:
+        """
+        Apply the batched commands, advance the match and, if it changed,
+        queue one update for every member – however many commands came in.
+        """
+        started = time.perf_counter()
+        self.ticks += 1
+        changed = self.match.tick(server_now_ms - self.started_ms)
+        if changed:
+            self.changed_ticks += 1
+            self.game_state = self.match.state()
+            self.broadcast()
+        self.tick_s += time.perf_counter() - started
+        return changed
+
+    def broadcast(self):
+        """Queue the change since the last update (or a keyframe), encoded once per codec."""
+        text = self.encoder.encode(self.game_state)
+        if text is None:
+            return
+        self.updates += 1
+        frame = None
+        for outbox in list(self.members.values()):
+            if outbox.codec == CODEC_BINARY:
+                if frame is None:
+                    frame = self.wire.encode(self.encoder.message)
+                outbox.send_update(frame, self._binary_keyframe)
+                self.bytes_out += len(frame)
+            else:
+                outbox.send_update(text, self.encoder.keyframe)
+                self.bytes_out += len(text)
+
+    def metrics(self) -> dict:
+        return {
+            "clients": len(self.members),
+            "players": len(self.seats),
+            "ticks": self.ticks,
+            "changed_ticks": self.changed_ticks,
+            "updates": self.updates,
+            "keyframes": self.encoder.keyframes,
+            "bytes_out": self.bytes_out,
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "max_batch": self.match.max_batch,
+            "avg_tick_ms": 1000 * self.tick_s / self.ticks if self.ticks else 0.0,
+            "game_ended": self.match.game_ended,
+        }
@@ -0,0 +1,505 @@
+"""
+Sharding the websocket server across processes.
+A `ShardFront` owns the listening socket and every connection's
+`ClientOutbox`; the rooms themselves live in N shard workers, each a
+`ChessServer` in its own process.  A match id is routed to its shard by
+consistent hashing, so adding a worker only moves the rooms that hash to it.
+
+Front and workers talk over a Unix socket pair per worker, with small
+pickled tuples (length-prefixed); neither side ever blocks on a send:
+
+    front -> worker   ("connect", client_id, match_id, codec)
+                      ("message", client_id, raw_text)
+                      ("disconnect", client_id)
+                      ("stop",)
+    worker -> front   ("deliver", shard_name, [client_id, ...], frame, is_update)
+
+A broadcast crosses the socket once per room, not once per member.  The
+front drops deliveries from a shard its client has since moved away from.
+`LocalShard` runs the same worker in-process for tests and debugging.
+"""
+import asyncio
+import bisect
+import hashlib
+import json
+import logging
+import multiprocessing
+import pathlib
+import pickle
+import queue
+import select
+import socket
+import struct
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import websockets
+
+from shared_types import MESSAGE_TYPES
+from client_outbox import ClientOutbox
+from wire_codec import CODEC_JSON, decode_client_message, negotiate
+from server import ChessServer, SERVER_TICK_HZ
+from server_match import PIECES_DIR
+from server_room import DEFAULT_ROOM
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REPLICAS = 64  # points per shard on the hash ring
+
+
+def _hash(key: str) -> int:
+    # stable across processes and runs, unlike hash()
+    return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Consistent hashing of keys onto named nodes, *replicas* points per node."""
+
+    def __init__(self, nodes: Iterable[str] = (), replicas: int = DEFAULT_REPLICAS):
+        self.replicas = replicas
+        self._points: List[int] = []
+        self._owners: Dict[int, str] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: str):
+        for i in range(self.replicas):
+            point = _hash(f"{node}#{i}")
+            if point not in self._owners:
+                bisect.insort(self._points, point)
+                self._owners[point] = node
+
+    def remove(self, node: str):
+        self._points = [p for p in self._points if self._owners[p] != node]
+        self._owners = {p: n for p, n in self._owners.items() if n != node}
+
+    def node_for(self, key: str) -> str:
+        if not self._points:
+            raise LookupError("hash ring is empty")
+        i = bisect.bisect(self._points, _hash(key)) % len(self._points)
+        return self._owners[self._points[i]]
+
+
+# ───────────────────────── worker side ─────────────────────────
+class _ShardOutbox:
+    """Worker-side stand-in for a client's outbox: queues deliveries for the front."""
+
+    def __init__(self, worker: "ShardWorker", client_id: str, codec: str = CODEC_JSON):
+        self.worker = worker
+        self.client_id = client_id
+        self.codec = codec
+
+    def send(self, text: str):
+        self.worker._pending.append((self.client_id, text, False))
+
+    def send_update(self, text: str, keyframe=None):
+        self.worker._pending.append((self.client_id, text, True))
+
+
+class ShardWorker:
+    """
+    The rooms of one shard: a `ChessServer` driven by front commands
+    instead of sockets.  Everything it sends goes to *emit* as
+    ``("deliver", name, client_ids, frame, is_update)``.
+    """
+
+    def __init__(self, name: str, emit: Callable[[tuple], None],
+                 pieces_root: str | pathlib.Path = PIECES_DIR,
+                 tick_hz: float = SERVER_TICK_HZ, clock=time.monotonic):
+        self.name = name
+        self.server = ChessServer(pieces_root, tick_hz=tick_hz, clock=clock)
+        self.emit = emit
+        self._pending: List[Tuple[str, str, bool]] = []
+
+    def handle(self, msg: tuple):
+        kind = msg[0]
+        if kind == "connect":
+            _, client_id, match_id, codec = msg
+            self.server.add_client(client_id, _ShardOutbox(self, client_id, codec), match_id)
+        elif kind == "message":
+            _, client_id, text = msg
+            if client_id in self.server.clients:
+                self.server.handle_text(client_id, text)
+        elif kind == "disconnect":
+            self.server._disconnect(msg[1])
+        else:
+            logger.warning("Unknown shard command %r", kind)
+        self.flush()
+
+    def tick(self, now_ms: Optional[int] = None) -> int:
+        changed = self.server.tick(now_ms)
+        self.flush()
+        return changed
+
+    def flush(self):
+        """Emit queued sends, one delivery per run of members receiving the same frame."""
+        groups: List[Tuple[List[str], str, bool]] = []
+        for client_id, text, is_update in self._pending:
+            if groups and groups[-1][1] is text and groups[-1][2] == is_update:
+                groups[-1][0].append(client_id)
+            else:
+                groups.append(([client_id], text, is_update))
+        self._pending.clear()
+        for client_ids, text, is_update in groups:
+            self.emit(("deliver", self.name, client_ids, text, is_update))
+
+
+# ───────────────────────── framing ─────────────────────────
+_HEADER = struct.Struct("!I")  # payload length, then a pickled message
+
+
+def _frame(msg: tuple) -> bytes:
+    data = pickle.dumps(msg, pickle.HIGHEST_PROTOCOL)
+    return _HEADER.pack(len(data)) + data
+
+
+def _take_frames(buf: bytearray) -> List[tuple]:
+    """Unpickle and remove every complete frame at the start of *buf*."""
+    msgs, pos = [], 0
+    while len(buf) - pos >= _HEADER.size:
+        (n,) = _HEADER.unpack_from(buf, pos)
+        if len(buf) - pos - _HEADER.size < n:
+            break
+        pos += _HEADER.size
+        msgs.append(pickle.loads(buf[pos:pos + n]))
+        pos += n
+    del buf[:pos]
+    return msgs
+
+
+class _WorkerChannel:
+    """
+    The worker's end of the socket.  Sends go through a queue to a sender
+    thread, so a front that is slow to read never stalls the tick loop (or
+    the reading of its commands).
+    """
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self._inbox: Deque[tuple] = deque()
+        self._buf = bytearray()
+        self._outbox: "queue.Queue[Optional[bytes]]" = queue.Queue()
+        self.closed = False
+        self._sender = threading.Thread(target=self._send_loop, name="shard-sender", daemon=True)
+        self._sender.start()
+
+    def send(self, msg: tuple):
+        if self.closed:
+            raise BrokenPipeError("front went away")
+        self._outbox.put(_frame(msg))
+
+    def _send_loop(self):
+        while True:
+            data = self._outbox.get()
+            if data is None:
+                return
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                self.closed = True
+                return
+
+    def poll(self, timeout: float) -> bool:
+        """True once a whole message is waiting; reads for at most *timeout* seconds."""
+        deadline = time.monotonic() + timeout
+        while not self._inbox:
+            ready, _, _ = select.select([self.sock], [], [], max(0.0, deadline - time.monotonic()))
+            if not ready:
+                return False
+            data = self.sock.recv(1 << 16)
+            if not data:
+                raise EOFError
+            self._buf += data
+            self._inbox.extend(_take_frames(self._buf))
+        return True
+
+    def recv(self) -> tuple:
+        while not self.poll(1.0):
+            pass
+        return self._inbox.popleft()
+
+    def close(self):
+        self._outbox.put(None)
+        self._sender.join(1.0)
+        self.sock.close()
+
+
+def _worker_main(name: str, sock: socket.socket, pieces_root, tick_hz: float):
+    """Process entry point: serve front commands and tick at *tick_hz* until told to stop."""
+    conn = _WorkerChannel(sock)
+    worker = ShardWorker(name, conn.send, pieces_root, tick_hz)
+    period = 1.0 / tick_hz
+    next_tick = time.monotonic()
+    try:
+        while True:
+            while conn.poll(max(0.0, next_tick - time.monotonic())):
+                msg = conn.recv()
+                if msg[0] == "stop":
+                    return
+                worker.handle(msg)
+                if time.monotonic() >= next_tick:
+                    break
+            worker.tick()
+            next_tick += period
+    except (EOFError, OSError, KeyboardInterrupt):
+        pass  # the front went away
+    finally:
+        conn.close()
+
+
+# ───────────────────────── shards as seen by the front ─────────────────────────
+class ProcessShard:
+    """
+    A `ShardWorker` in a child process, reached over a Unix socket pair.
+
+    The front's end never blocks: messages are buffered and written as the
+    socket accepts them, and the worker's messages are read as they arrive,
+    so a busy worker cannot stall the event loop or its other shards.
+    """
+
+    def __init__(self, name: str, pieces_root: str | pathlib.Path = PIECES_DIR,
+                 tick_hz: float = SERVER_TICK_HZ, start_method: str = "spawn"):
+        self.name = name
+        ctx = multiprocessing.get_context(start_method)
+        self._sock, child = socket.socketpair()
+        self.process = ctx.Process(target=_worker_main, args=(name, child, str(pieces_root), tick_hz),
+                                   name=name, daemon=True)
+        self.process.start()
+        child.close()
+        self._sock.setblocking(False)
+        self._out = bytearray()
+        self._in = bytearray()
+        self._writing = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._on_message: Callable[[tuple], None] = lambda msg: None
+
+    def attach(self, on_message: Callable[[tuple], None]):
+        """Feed the worker's messages to *on_message* from the running event loop."""
+        self._loop = asyncio.get_running_loop()
+        self._on_message = on_message
+        self._loop.add_reader(self._sock.fileno(), self._read)
+        self._flush()
+
+    def _read(self):
+        try:
+            data = self._sock.recv(1 << 16)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b""
+        if not data:
+            logger.error("Shard %s went away", self.name)
+            self._detach()
+            return
+        self._in += data
+        for msg in _take_frames(self._in):
+            self._on_message(msg)
+
+    def send(self, msg: tuple):
+        self._out += _frame(msg)
+        self._flush()
+
+    def _flush(self):
+        if self._loop is None or not self._out:
+            return
+        try:
+            sent = self._sock.send(self._out)
+        except (BlockingIOError, InterruptedError):
+            sent = 0
+        except OSError:
+            logger.error("Shard %s went away", self.name)
+            self._out.clear()
+            self._detach()
+            return
+        del self._out[:sent]
+        if self._out and not self._writing:
+            self._loop.add_writer(self._sock.fileno(), self._flush)
+            self._writing = True
+        elif not self._out and self._writing:
+            self._loop.remove_writer(self._sock.fileno())
+            self._writing = False
+
+    def _detach(self):
+        if self._loop is not None and self._sock.fileno() != -1:
+            self._loop.remove_reader(self._sock.fileno())
+            if self._writing:
+                self._loop.remove_writer(self._sock.fileno())
+        self._writing = False
+        self._loop = None
+
+    def stop(self, timeout: float = 5.0):
+        try:
+            self._detach()
+        except RuntimeError:
+            pass  # the event loop is already closed
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.sendall(bytes(self._out) + _frame(("stop",)))
+        except OSError:
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+        self._sock.close()
+
+
+class LocalShard:
+    """In-process stand-in for `ProcessShard`; ticks only when told to."""
+
+    def __init__(self, name: str, pieces_root: str | pathlib.Path = PIECES_DIR,
+                 tick_hz: float = SERVER_TICK_HZ, clock=time.monotonic):
+        self.name = name
+        self._on_message: Callable[[tuple], None] = lambda msg: None
+        self.worker = ShardWorker(name, lambda msg: self._on_message(msg), pieces_root, tick_hz, clock)
+
+    def attach(self, on_message: Callable[[tuple], None]):
+        self._on_message = on_message
+
+    def send(self, msg: tuple):
+        self.worker.handle(msg)
+
+    def tick(self, now_ms: Optional[int] = None) -> int:
+        return self.worker.tick(now_ms)
+
+    def stop(self):
+        pass
+
+
+# ───────────────────────── front ─────────────────────────
+def _no_keyframe():
+    # the front has no game state: a lagging client's stale updates are just
+    # dropped, and its decoder asks its shard for a resync
+    return None
+
+
+class ShardFront:
+    """
+    Accepts connections and relays them to the shard that owns their room.
+
+    A connection starts on the shard of the ``default`` room; a JOIN for a
+    match on another shard moves it there.  Each connection keeps one
+    `ClientOutbox` in the front, so slow sockets are handled here and never
+    stall a worker.
+    """
+
+    def __init__(self, shards: Sequence, replicas: int = DEFAULT_REPLICAS):
+        if not shards:
+            raise ValueError("need at least one shard")
+        self.shards = {shard.name: shard for shard in shards}
+        self.ring = HashRing(self.shards, replicas)
+        self.clients: Dict[str, ClientOutbox] = {}
+        self.client_shard: Dict[str, str] = {}  # client id -> shard name
+        self.client_codec: Dict[str, str] = {}  # client id -> negotiated wire codec
+        self.delivered = 0
+        logger.info(f"✅ ShardFront initialized with {len(self.shards)} shards")
+
+    @classmethod
+    def spawn(cls, workers: int, pieces_root: str | pathlib.Path = PIECES_DIR,
+              tick_hz: float = SERVER_TICK_HZ, start_method: str = "spawn") -> "ShardFront":
+        """A front over *workers* freshly started worker processes."""
+        return cls([ProcessShard(f"shard-{i}", pieces_root, tick_hz, start_method) for i in range(workers)])
+
+    def start(self):
+        """Start listening to the shards (must run on the event loop)."""
+        for shard in self.shards.values():
+            shard.attach(self._on_shard_message)
+
+    def stop(self):
+        for shard in self.shards.values():
+            shard.stop()
+
+    def shard_for(self, match_id: str):
+        return self.shards[self.ring.node_for(match_id)]
+
+    def metrics(self) -> Dict[str, dict]:
+        counts = {name: 0 for name in self.shards}
+        for name in self.client_shard.values():
+            counts[name] += 1
+        return {name: {"clients": n} for name, n in counts.items()}
+
+    # ───────────────────────── connections ─────────────────────────
+    def connect(self, client_id: str, websocket, match_id: str = DEFAULT_ROOM) -> ClientOutbox:
+        """Register a connection (must run on the event loop) in *match_id*."""
+        outbox = ClientOutbox(websocket, on_close=lambda _: self._disconnect(client_id))
+        self.clients[client_id] = outbox
+        outbox.start()
+        self._route(client_id, match_id)
+        return outbox
+
+    def _route(self, client_id: str, match_id: str):
+        shard = self.shard_for(match_id)
+        current = self.client_shard.get(client_id)
+        if current == shard.name:
+            return
+        if current is not None:
+            self.shards[current].send(("disconnect", client_id))
+        self.client_shard[client_id] = shard.name
+        shard.send(("connect", client_id, match_id, self.client_codec.get(client_id, CODEC_JSON)))
+
+    def _disconnect(self, client_id: str):
+        self.clients.pop(client_id, None)
+        self.client_codec.pop(client_id, None)
+        name = self.client_shard.pop(client_id, None)
+        if name is not None:
+            self.shards[name].send(("disconnect", client_id))
+
+    async def handle_client(self, websocket):
+        client_id = str(id(websocket))
+        outbox = self.connect(client_id, websocket)
+        try:
+            async for message in websocket:
+                self.handle_text(client_id, message)
+        finally:
+            logger.info(f"❌ Client disconnected: {client_id}")
+            outbox.close()
+
+    def handle_text(self, client_id: str, message):
+        """
+        Relay one raw message to the client's shard, first moving it if it
+        JOINs elsewhere; a HELLO's codec is remembered for later moves.
+        """
+        if client_id not in self.client_shard:
+            return
+        try:
+            if isinstance(message, bytes):
+                data = decode_client_message(message).to_dict()
+            else:
+                data = json.loads(message)
+        except ValueError:
+            data = None  # the shard answers with the parse error
+        if isinstance(data, dict) and data.get("type") == MESSAGE_TYPES["JOIN"]:
+            match_id = str((data.get("data") or {}).get("match_id", DEFAULT_ROOM))
+            self._route(client_id, match_id)
+        elif isinstance(data, dict) and data.get("type") == MESSAGE_TYPES["HELLO"]:
+            self.client_codec[client_id] = negotiate((data.get("data") or {}).get("codecs"))
+        self.shards[self.client_shard[client_id]].send(("message", client_id, message))
+
+    def _on_shard_message(self, msg: tuple):
+        if msg[0] != "deliver":
+            logger.warning("Unknown shard message %r", msg[0])
+            return
+        _, shard_name, client_ids, frame, is_update = msg
+        for client_id in client_ids:
+            outbox = self.clients.get(client_id)
+            if outbox is None or self.client_shard.get(client_id) != shard_name:
+                continue  # disconnected or moved while the delivery was in flight
+            if is_update:
+                outbox.send_update(frame, _no_keyframe)
+            else:
+                outbox.send(frame)
+            self.delivered += 1
+
+
+async def serve(workers: int, host: str = "localhost", port: int = 8889,
+                pieces_root: str | pathlib.Path = PIECES_DIR):
+    """Run a front on *host*:*port* over *workers* shard processes until cancelled."""
+    front = ShardFront.spawn(workers, pieces_root)
+    front.start()
+    try:
+        print(f"🌐 Starting sharded Chess Server ({workers} workers) on ws://{host}:{port}")
+        async with websockets.serve(front.handle_client, host, port):
+            await asyncio.Future()
+    finally:
+        front.stop()
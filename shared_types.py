@@ -76,7 +76,10 @@ MESSAGE_TYPES = {
     "JOIN": "join", 
     "GET_STATE": "get_state",
     "DISCONNECT": "disconnect",
-    "GAME_UPDATE": "game_update",
+    "GAME_UPDATE": "game_update",   # full state (keyframe)
+    "GAME_DELTA": "game_delta",     # changes since the previous update
+    "RESYNC": "resync",             # client lost track, asks for a keyframe
+    "HELLO": "hello",               # client offers wire codecs, server picks one
     "ERROR": "error"
 }
 
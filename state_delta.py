@@ -0,0 +1,151 @@
+"""
+Delta-encoded game state for the websocket protocol.
+The server sends a full keyframe (a regular ``game_update``) now and then
+and, in between, only the pieces and fields that changed since the
+previous message.  Every message carries a sequence number; a client that
+misses one asks for a ``resync`` and gets a fresh keyframe.
+"""
+import json
+from typing import Any, Dict, Optional
+
+from shared_types import GameState, MESSAGE_TYPES
+
+DEFAULT_KEYFRAME_EVERY = 100  # messages between unsolicited keyframes
+
+# GameState fields sent as-is in deltas (pieces/pos_to_piece are diffed)
+_SCALAR_FIELDS = ("current_player", "game_time_ms", "white_score", "black_score",
+                  "game_ended", "winner", "last_move")
+
+
+class StateDeltaEncoder:
+    """
+    Server side: turns successive `GameState`s into wire messages.
+
+    `encode` returns the JSON text of either a delta against the previous
+    call or, every *keyframe_every* messages, a keyframe; the text is meant
+    to be sent as-is to every client.  It returns None when nothing but the
+    clock changed.  `message` keeps the last message as a dict, for other
+    wire codecs.
+    """
+
+    def __init__(self, keyframe_every: int = DEFAULT_KEYFRAME_EVERY):
+        if keyframe_every < 1:
+            raise ValueError("keyframe_every must be >= 1")
+        self.keyframe_every = keyframe_every
+        self.seq = 0
+        self._since_keyframe = 0
+        self._pieces: Optional[Dict[str, Dict[str, Any]]] = None
+        self._scalars: Dict[str, Any] = {}
+        self._state: Optional[GameState] = None
+        self._keyframe_text: Optional[str] = None
+        self.message: Optional[Dict[str, Any]] = None
+        self.keyframes = 0
+        self.deltas = 0
+
+    def encode(self, state: GameState) -> Optional[str]:
+        if self._pieces is None or self._since_keyframe + 1 >= self.keyframe_every:
+            return self._encode_keyframe(state)
+
+        changed = {pid: data for pid, data in state.pieces.items() if self._pieces.get(pid) != data}
+        removed = [pid for pid in self._pieces if pid not in state.pieces]
+        fields = {name: getattr(state, name) for name in _SCALAR_FIELDS
+                  if getattr(state, name) != self._scalars.get(name)}
+        if not changed and not removed and set(fields) <= {"game_time_ms"}:
+            return None
+
+        self._remember(state)
+        self.seq += 1
+        self._since_keyframe += 1
+        self.deltas += 1
+        self.message = {
+            "type": MESSAGE_TYPES["GAME_DELTA"],
+            "seq": self.seq,
+            "base": self.seq - 1,
+            "changed": changed,
+            "removed": removed,
+            "fields": fields,
+        }
+        return json.dumps(self.message)
+
+    def keyframe(self) -> Optional[str]:
+        """The full state as of the last message (for new clients and resyncs)."""
+        if self._state is None:
+            return None
+        if self._keyframe_text is None:
+            self._keyframe_text = json.dumps(self.keyframe_message())
+        return self._keyframe_text
+
+    def keyframe_message(self) -> Optional[Dict[str, Any]]:
+        """`keyframe` as a dict."""
+        if self._state is None:
+            return None
+        return {
+            "type": MESSAGE_TYPES["GAME_UPDATE"],
+            "seq": self.seq,
+            "game_state": self._state.to_dict(),
+        }
+
+    def _encode_keyframe(self, state: GameState) -> str:
+        self._remember(state)
+        self.seq += 1
+        self._since_keyframe = 0
+        self.keyframes += 1
+        self.message = self.keyframe_message()
+        self._keyframe_text = json.dumps(self.message)
+        return self._keyframe_text
+
+    def _remember(self, state: GameState):
+        self._state = state
+        self._keyframe_text = None
+        self._pieces = state.pieces
+        self._scalars = {name: getattr(state, name) for name in _SCALAR_FIELDS}
+
+
+class StateDeltaDecoder:
+    """
+    Client side: rebuilds the `GameState` from keyframes and deltas.
+
+    `apply` returns the updated state, or None if the message could not be
+    applied – a delta whose base is not the last sequence number seen.
+    `needs_resync` then stays True until the next keyframe arrives.
+    """
+
+    def __init__(self):
+        self.seq: Optional[int] = None
+        self.state: Optional[GameState] = None
+        self.needs_resync = False
+
+    def apply(self, msg: Dict[str, Any]) -> Optional[GameState]:
+        if msg.get("type") == MESSAGE_TYPES["GAME_UPDATE"]:
+            self.state = GameState.from_dict(msg["game_state"])
+            self.seq = msg.get("seq")
+            self.needs_resync = False
+            return self.state
+
+        if self.state is None or msg.get("base") != self.seq:
+            self.needs_resync = True
+            return None
+
+        pieces = self.state.pieces
+        for pid in msg["removed"]:
+            pieces.pop(pid, None)
+        pieces.update(msg["changed"])
+        for name, value in msg["fields"].items():
+            setattr(self.state, name, value)
+        self.state.pos_to_piece = self._cells(pieces)
+        self.seq = msg["seq"]
+        return self.state
+
+    @staticmethod
+    def _cells(pieces: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+        # same construction as the server: later pieces win a shared cell
+        cells: Dict[str, str] = {}
+        for pid, data in pieces.items():
+            r, c = data["position"]
+            cells[f"{r},{c}"] = pid
+        return cells
+
+
+def resync_request(player_id: str) -> Dict[str, Any]:
+    """The `ClientMessage` dict a client sends after `needs_resync` is set."""
+    return {"type": MESSAGE_TYPES["RESYNC"], "player_id": player_id, "data": None}
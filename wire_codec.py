@@ -0,0 +1,450 @@
+"""
+Compact binary wire format for the websocket protocol.
+An alternative to the JSON messages, negotiated per connection with a
+``hello`` message.  Every frame starts with a three-byte header – magic,
+format version and message kind – and packs what JSON spells out:
+integers are varints, board cells are one byte (row and column nibbles)
+and, in a room's update stream, piece ids and other repeated strings are
+small indexes into a string table that keyframes send whole and deltas
+extend.
+
+Decoding gives the same dicts `json.loads` would, so `StateDeltaDecoder`
+and the rest of the client work unchanged on either format.
+"""
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from shared_types import ClientMessage, GameState, MESSAGE_TYPES, ServerResponse
+
+CODEC_JSON = "json"
+CODEC_BINARY = "kfc-bin/1"
+SUPPORTED_CODECS = (CODEC_BINARY, CODEC_JSON)  # in order of preference
+
+MAGIC = 0x4B  # "K"
+WIRE_VERSION = 1
+
+# message kinds
+KIND_CLIENT_MESSAGE = 1
+KIND_RESPONSE = 2
+KIND_KEYFRAME = 3
+KIND_DELTA = 4
+KIND_GAME_STATE = 5
+
+# GameState scalar fields, in wire order (deltas send a bitmask of them)
+FIELDS = ("current_player", "game_time_ms", "white_score", "black_score",
+          "game_ended", "winner", "last_move")
+
+# value tags
+_NONE, _COMMAND, _JSON = 0, 1, 2
+_COMMAND_KEYS = {"piece_id", "type", "params"}
+
+
+class WireFormatError(ValueError):
+    """A frame that cannot be decoded, or a value this version cannot encode."""
+
+
+def negotiate(offered: Iterable[str]) -> str:
+    """The codec to use for a client offering *offered* (JSON if none fits)."""
+    for codec in offered or ():
+        if codec in SUPPORTED_CODECS:
+            return codec
+    return CODEC_JSON
+
+
+# ───────────────────────── primitives ─────────────────────────
+class _Writer:
+    def __init__(self, kind: Optional[int] = None):
+        self.buf = bytearray()
+        if kind is not None:
+            self.buf += bytes((MAGIC, WIRE_VERSION, kind))
+
+    def u8(self, value: int):
+        self.buf.append(value)
+
+    def varint(self, value: int):
+        if value < 0:
+            raise WireFormatError(f"negative varint {value}")
+        while value >= 0x80:
+            self.buf.append((value & 0x7F) | 0x80)
+            value >>= 7
+        self.buf.append(value)
+
+    def sint(self, value: int):
+        self.varint(value * 2 if value >= 0 else -value * 2 - 1)  # zigzag
+
+    def str(self, value: str):
+        data = value.encode()
+        self.varint(len(data))
+        self.buf += data
+
+    def opt_str(self, value: Optional[str]):
+        if value is None:
+            self.u8(0)
+        else:
+            self.u8(1)
+            self.str(value)
+
+    def cell(self, cell):
+        r, c = cell
+        if not (0 <= r < 16 and 0 <= c < 16):
+            raise WireFormatError(f"cell {cell} does not fit wire version {WIRE_VERSION}")
+        self.buf.append(r << 4 | c)
+
+
+class _Reader:
+    def __init__(self, data: bytes, kind: Optional[int] = None):
+        self.data = memoryview(data)
+        self.pos = 0
+        if kind is not None and self.header() != kind:
+            raise WireFormatError(f"expected a frame of kind {kind}")
+
+    def header(self) -> int:
+        magic, version, kind = self.u8(), self.u8(), self.u8()
+        if magic != MAGIC:
+            raise WireFormatError("not a binary frame")
+        if version != WIRE_VERSION:
+            raise WireFormatError(f"unsupported wire version {version}")
+        return kind
+
+    def u8(self) -> int:
+        if self.pos >= len(self.data):
+            raise WireFormatError("truncated frame")
+        self.pos += 1
+        return self.data[self.pos - 1]
+
+    def varint(self) -> int:
+        value = shift = 0
+        while True:
+            byte = self.u8()
+            value |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    def sint(self) -> int:
+        value = self.varint()
+        return value >> 1 if value % 2 == 0 else -(value >> 1) - 1
+
+    def str(self) -> str:
+        n = self.varint()
+        if self.pos + n > len(self.data):
+            raise WireFormatError("truncated frame")
+        self.pos += n
+        return bytes(self.data[self.pos - n:self.pos]).decode()
+
+    def opt_str(self) -> Optional[str]:
+        return self.str() if self.u8() else None
+
+    def cell(self) -> List[int]:
+        byte = self.u8()
+        return [byte >> 4, byte & 0x0F]
+
+
+class _Strings:
+    """Append-only string table: strings go over the wire once, then as indexes."""
+
+    def __init__(self, strings: Iterable[str] = ()):
+        self.strings: List[str] = []
+        self._index: Dict[str, int] = {}
+        for s in strings:
+            self.index(s)
+
+    def __len__(self):
+        return len(self.strings)
+
+    def index(self, s: str) -> int:
+        i = self._index.get(s)
+        if i is None:
+            i = self._index[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def write(self, w: _Writer, start: int = 0):
+        w.varint(start)
+        w.varint(len(self.strings) - start)
+        for s in self.strings[start:]:
+            w.str(s)
+
+
+def _read_strings(r: _Reader, table: List[str]) -> bool:
+    """Extend *table* from a string-table section; False if it skips entries we never saw."""
+    start, count = r.varint(), r.varint()
+    new = [r.str() for _ in range(count)]
+    if start > len(table):
+        return False
+    del table[start:]
+    table.extend(new)
+    return True
+
+
+# ───────────────────────── values ─────────────────────────
+def _is_command(value) -> bool:
+    """A move-like dict (``piece_id``, ``type``, cell ``params``, maybe ``timestamp``)."""
+    if not isinstance(value, dict) or not _COMMAND_KEYS <= value.keys() <= _COMMAND_KEYS | {"timestamp"}:
+        return False
+    if not isinstance(value["piece_id"], str) or not isinstance(value["type"], str):
+        return False
+    params = value["params"]
+    if not isinstance(params, (list, tuple)) or len(params) > 255:
+        return False
+    for p in params:
+        if not (isinstance(p, (list, tuple)) and len(p) == 2
+                and all(isinstance(x, int) and 0 <= x < 16 for x in p)):
+            return False
+    return "timestamp" not in value or (isinstance(value["timestamp"], int) and value["timestamp"] >= 0)
+
+
+def _write_value(w: _Writer, value):
+    if value is None:
+        w.u8(_NONE)
+    elif _is_command(value):
+        w.u8(_COMMAND)
+        w.str(value["piece_id"])
+        w.str(value["type"])
+        w.u8(len(value["params"]))
+        for p in value["params"]:
+            w.cell(p)
+        if "timestamp" in value:
+            w.u8(1)
+            w.varint(value["timestamp"])
+        else:
+            w.u8(0)
+    else:
+        w.u8(_JSON)
+        w.str(json.dumps(value))
+
+
+def _read_value(r: _Reader):
+    tag = r.u8()
+    if tag == _NONE:
+        return None
+    if tag == _COMMAND:
+        value = {"piece_id": r.str(), "type": r.str(), "params": [r.cell() for _ in range(r.u8())]}
+        if r.u8():
+            value["timestamp"] = r.varint()
+        return value
+    if tag == _JSON:
+        return json.loads(r.str())
+    raise WireFormatError(f"unknown value tag {tag}")
+
+
+_FIELD_CODECS: Dict[str, Tuple[Callable[[_Writer, Any], None], Callable[[_Reader], Any]]] = {
+    "current_player": (_Writer.opt_str, _Reader.opt_str),
+    "game_time_ms": (_Writer.sint, _Reader.sint),
+    "white_score": (_Writer.sint, _Reader.sint),
+    "black_score": (_Writer.sint, _Reader.sint),
+    "game_ended": (lambda w, v: w.u8(1 if v else 0), lambda r: bool(r.u8())),
+    "winner": (_Writer.opt_str, _Reader.opt_str),
+    "last_move": (_write_value, _read_value),
+}
+
+
+def _write_fields(w: _Writer, fields: Dict[str, Any]):
+    mask = 0
+    for bit, name in enumerate(FIELDS):
+        if name in fields:
+            mask |= 1 << bit
+    w.u8(mask)
+    for name in FIELDS:
+        if name in fields:
+            _FIELD_CODECS[name][0](w, fields[name])
+
+
+def _read_fields(r: _Reader) -> Dict[str, Any]:
+    mask = r.u8()
+    return {name: _FIELD_CODECS[name][1](r) for bit, name in enumerate(FIELDS) if mask & (1 << bit)}
+
+
+# ───────────────────────── game state ─────────────────────────
+def _write_piece(w: _Writer, pid: str, data: Dict[str, Any], strings: _Strings):
+    if data.keys() != {"id", "position", "unique_id", "state"} or data["unique_id"] != pid:
+        raise WireFormatError(f"piece {pid} has an unexpected shape")
+    w.varint(strings.index(pid))
+    w.varint(strings.index(data["id"]))
+    w.cell(data["position"])
+    w.varint(strings.index(data["state"]))
+
+
+def _read_piece(r: _Reader, table: List[str]) -> Tuple[str, Dict[str, Any]]:
+    try:
+        pid, kind = table[r.varint()], table[r.varint()]
+        position = r.cell()
+        state = table[r.varint()]
+    except IndexError:
+        raise WireFormatError("string index out of range") from None
+    return pid, {"id": kind, "position": position, "unique_id": pid, "state": state}
+
+
+def _write_state(w: _Writer, state: Dict[str, Any], strings: _Strings):
+    """GameState as a dict; ``pos_to_piece`` is left out and rebuilt on decode."""
+    _write_fields(w, {name: state[name] for name in FIELDS})
+    w.varint(len(state["pieces"]))
+    for pid, data in state["pieces"].items():
+        _write_piece(w, pid, data, strings)
+
+
+def _read_state(r: _Reader, table: List[str]) -> Dict[str, Any]:
+    fields = _read_fields(r)
+    pieces = dict(_read_piece(r, table) for _ in range(r.varint()))
+    state = {"pieces": pieces, "pos_to_piece": _cells(pieces)}
+    state.update(fields)
+    return state
+
+
+def _cells(pieces: Dict[str, Dict[str, Any]]) -> Dict[str, str]:
+    # same construction as the server: later pieces win a shared cell
+    return {f"{d['position'][0]},{d['position'][1]}": pid for pid, d in pieces.items()}
+
+
+def _write_standalone_state(w: _Writer, state: Dict[str, Any]):
+    strings = _Strings()
+    body = _Writer()
+    _write_state(body, state, strings)
+    strings.write(w)
+    w.buf += body.buf
+
+
+def _read_standalone_state(r: _Reader) -> Dict[str, Any]:
+    table: List[str] = []
+    _read_strings(r, table)
+    return _read_state(r, table)
+
+
+def encode_game_state(state: GameState) -> bytes:
+    w = _Writer(KIND_GAME_STATE)
+    _write_standalone_state(w, state.to_dict())
+    return bytes(w.buf)
+
+
+def decode_game_state(data: bytes) -> GameState:
+    return GameState.from_dict(_read_standalone_state(_Reader(data, KIND_GAME_STATE)))
+
+
+# ───────────────────────── messages ─────────────────────────
+def encode_client_message(msg: ClientMessage) -> bytes:
+    w = _Writer(KIND_CLIENT_MESSAGE)
+    w.str(msg.type)
+    w.str(msg.player_id)
+    _write_value(w, msg.data)
+    return bytes(w.buf)
+
+
+def _read_client_message(r: _Reader) -> Dict[str, Any]:
+    return {"type": r.str(), "player_id": r.str(), "data": _read_value(r)}
+
+
+def decode_client_message(data: bytes) -> ClientMessage:
+    return ClientMessage.from_dict(_read_client_message(_Reader(data, KIND_CLIENT_MESSAGE)))
+
+
+def encode_response(resp: ServerResponse) -> bytes:
+    w = _Writer(KIND_RESPONSE)
+    w.u8(1 if resp.success else 0)
+    w.str(resp.message)
+    w.opt_str(resp.error_code)
+    if resp.game_state is None:
+        w.u8(0)
+    else:
+        w.u8(1)
+        state = resp.game_state
+        _write_standalone_state(w, state if isinstance(state, dict) else state.to_dict())
+    return bytes(w.buf)
+
+
+def _read_response(r: _Reader) -> Dict[str, Any]:
+    success, message, error_code = bool(r.u8()), r.str(), r.opt_str()
+    game_state = _read_standalone_state(r) if r.u8() else None
+    return {"success": success, "message": message, "game_state": game_state, "error_code": error_code}
+
+
+def decode_response(data: bytes) -> ServerResponse:
+    fields = _read_response(_Reader(data, KIND_RESPONSE))
+    if fields["game_state"] is not None:
+        fields["game_state"] = GameState.from_dict(fields["game_state"])
+    return ServerResponse(**fields)
+
+
+# ───────────────────────── update streams ─────────────────────────
+class UpdateEncoder:
+    """
+    Server side: binary form of one room's `StateDeltaEncoder` messages.
+
+    The string table grows with the stream; a keyframe carries all of it,
+    a delta only the strings it introduces.  Messages must be encoded in
+    stream order, but keyframes may be made at any time for late joiners.
+    """
+
+    def __init__(self):
+        self._strings = _Strings()
+
+    def encode(self, msg: Dict[str, Any]) -> bytes:
+        if msg["type"] == MESSAGE_TYPES["GAME_UPDATE"]:
+            body = _Writer()
+            _write_state(body, msg["game_state"], self._strings)
+            w = _Writer(KIND_KEYFRAME)
+            w.varint(msg["seq"])
+            self._strings.write(w)
+        elif msg["type"] == MESSAGE_TYPES["GAME_DELTA"]:
+            start = len(self._strings)
+            body = _Writer()
+            body.varint(len(msg["changed"]))
+            for pid, data in msg["changed"].items():
+                _write_piece(body, pid, data, self._strings)
+            body.varint(len(msg["removed"]))
+            for pid in msg["removed"]:
+                body.varint(self._strings.index(pid))
+            _write_fields(body, msg["fields"])
+            w = _Writer(KIND_DELTA)
+            w.varint(msg["seq"])
+            w.varint(msg["base"])
+            self._strings.write(w, start)
+        else:
+            raise WireFormatError(f"not a state update: {msg['type']!r}")
+        w.buf += body.buf
+        return bytes(w.buf)
+
+
+class WireDecoder:
+    """
+    Client side: turns binary frames back into the dicts JSON would give.
+
+    Holds the string table of the update stream.  A delta that relies on
+    strings from a message this decoder never saw comes back with
+    ``base`` None, so `StateDeltaDecoder` asks for a resync.
+    """
+
+    def __init__(self):
+        self.strings: List[str] = []
+
+    def decode(self, data: bytes) -> Dict[str, Any]:
+        r = _Reader(data)
+        kind = r.header()
+        if kind == KIND_DELTA:
+            return self._delta(r)
+        if kind == KIND_KEYFRAME:
+            seq = r.varint()
+            self.strings = []
+            _read_strings(r, self.strings)
+            return {"type": MESSAGE_TYPES["GAME_UPDATE"], "seq": seq, "game_state": _read_state(r, self.strings)}
+        if kind == KIND_RESPONSE:
+            return _read_response(r)
+        if kind == KIND_CLIENT_MESSAGE:
+            return _read_client_message(r)
+        if kind == KIND_GAME_STATE:
+            return _read_standalone_state(r)
+        raise WireFormatError(f"unknown message kind {kind}")
+
+    def _delta(self, r: _Reader) -> Dict[str, Any]:
+        seq, base = r.varint(), r.varint()
+        msg = {"type": MESSAGE_TYPES["GAME_DELTA"], "seq": seq, "base": base,
+               "changed": {}, "removed": [], "fields": {}}
+        if not _read_strings(r, self.strings):
+            msg["base"] = None
+            return msg
+        msg["changed"] = dict(_read_piece(r, self.strings) for _ in range(r.varint()))
+        try:
+            msg["removed"] = [self.strings[r.varint()] for _ in range(r.varint())]
+        except IndexError:
+            raise WireFormatError("string index out of range") from None
+        msg["fields"] = _read_fields(r)
+        return msg